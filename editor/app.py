@@ -2,7 +2,7 @@ import sys
 import os
 import subprocess
 from PySide6.QtWidgets import QApplication, QMainWindow, QDockWidget, QMenu, QMenuBar, QFileDialog, QMessageBox
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
 # Ensure correct path
 sys.path.append(os.getcwd())
@@ -13,8 +13,7 @@ from editor.hierarchy import HierarchyPanel
 from editor.inspector import InspectorPanel
 from editor.asset_browser import AssetBrowser
 from shared.scene_schema import Scene
-from shared.scene_loader import save_scene, load_scene
-from dataclasses import asdict
+from shared.scene_loader import load_scene
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -32,6 +31,11 @@ class MainWindow(QMainWindow):
         # Load empty scene on start
         self.state.load_scene(Scene.create_empty("Untitled Scene"))
 
+        # Crash-safe autosave: unsaved edits are appended to <scene>.journal
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.timeout.connect(self.state.autosave)
+        self.autosave_timer.start(5000)
+
     def setup_ui(self):
         # 1. Central Area (Tabs: Scene | Script)
         from PySide6.QtWidgets import QTabWidget
@@ -166,6 +170,7 @@ class MainWindow(QMainWindow):
             if c.isValid():
                 new_c = [c.red(), c.green(), c.blue(), 255]
                 scene.settings["background_color"] = new_c
+                self.state.mark_dirty()
                 color_btn.setStyleSheet(f"background-color: rgba({new_c[0]}, {new_c[1]}, {new_c[2]}, 255); border: 1px solid #555;")
                 self.canvas.update() # Preview immediately
                 
@@ -189,7 +194,7 @@ class MainWindow(QMainWindow):
         self.canvas.update()
         
         # Inspector refresh via selection pulse
-        self.state.select_object(self.state.selected_object_id)
+        self.state.select_objects(self.state.selected_object_ids)
 
     def new_scene(self):
         self.state.current_scene_path = None
@@ -200,18 +205,35 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getOpenFileName(
             self, "Open Scene",
             os.path.join(self.state.project_root, "scenes"),
-            "Scene Files (*.scene.json);;All Files (*)"
+            "Scene Files (*.scene.json *.scene.bin);;All Files (*)"
         )
         if path:
             try:
                 data = load_scene(path)
+                recovered = False
+                if self.state.scene_writer.has_journal(path):
+                    answer = QMessageBox.question(
+                        self, "Recover Scene",
+                        "This scene has unsaved changes from a previous session.\nRecover them?"
+                    )
+                    if answer == QMessageBox.Yes:
+                        data = self.state.scene_writer.replay_journal(path, data)
+                        recovered = True
+                    else:
+                        self.state.scene_writer.discard_journal(path)
+
                 scene = Scene(
                     metadata=data.get("metadata", {}),
                     objects=data.get("objects", []),
-                    prefabs=data.get("prefabs", {})
+                    prefabs=data.get("prefabs", {}),
+                    settings=data.get("settings", {"background_color": [20, 20, 20, 255]})
                 )
                 self.state.current_scene_path = path
                 self.state.load_scene(scene)
+                if recovered:
+                    self.state.mark_dirty() # Not on disk until the next save
+                else:
+                    self.state.restore_history(path) # Undo across restarts
                 self.setWindowTitle(f"Aspis Engine Editor - {os.path.basename(path)}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to load scene:\n{e}")
@@ -223,31 +245,50 @@ class MainWindow(QMainWindow):
             self.save_scene_as()
 
     def save_scene_as(self):
-        path, _ = QFileDialog.getSaveFileName(
+        path, selected_filter = QFileDialog.getSaveFileName(
             self, "Save Scene As",
             os.path.join(self.state.project_root, "scenes", "untitled.scene.json"),
-            "Scene Files (*.scene.json)"
+            "Scene Files (*.scene.json);;Binary Scene Files (*.scene.bin)"
         )
         if path:
-            if not path.endswith(".scene.json"):
-                path += ".scene.json"
+            # The scene writer picks the format from the extension
+            if not path.endswith(".scene.json") and not path.endswith(".scene.bin"):
+                path += ".scene.bin" if "scene.bin" in selected_filter else ".scene.json"
             self._do_save(path)
 
     def _do_save(self, path):
+        """Starts a background save. Returns a Future, or None if the save could not start."""
         try:
-            scene = self.state.current_scene
-            if scene:
-                data = asdict(scene)
-                save_scene(data, path)
+            future = self.state.save(path, self._on_save_finished) # Called back on the UI thread
+            if future:
                 self.state.current_scene_path = path
-                self.setWindowTitle(f"Aspis Engine Editor - {os.path.basename(path)}")
+                self.setWindowTitle(f"Aspis Engine Editor - {os.path.basename(path)} (saving...)")
+            return future
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save scene:\n{e}")
+            return None
+
+    def _on_save_finished(self, path, error):
+        if error:
+            QMessageBox.critical(self, "Error", f"Failed to save scene:\n{error}")
+            return
+        if path == self.state.current_scene_path:
+            self.setWindowTitle(f"Aspis Engine Editor - {os.path.basename(path)}")
+
+    def closeEvent(self, event):
+        # Let queued writes reach the disk before the process exits
+        self.autosave_timer.stop()
+        self.state.scene_writer.shutdown()
+        super().closeEvent(event)
 
     def run_game(self):
         # Auto-save if possible
         if self.state.current_scene_path:
-            self._do_save(self.state.current_scene_path)
+            if self.state.is_modified():
+                # The runtime reads the file, so wait for this write (serialisation is incremental)
+                future = self._do_save(self.state.current_scene_path)
+                if future is None or future.result():
+                    return
             
             # Launch runtime
             cmd = [sys.executable, "runtime/game_loop.py", self.state.current_scene_path]
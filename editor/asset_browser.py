@@ -30,7 +30,7 @@ class AssetBrowser(QWidget):
         self.model = QFileSystemModel()
         self.model.setRootPath(project_root)
         self.model.setFilter(QDir.AllEntries | QDir.NoDotAndDotDot)
-        self.model.setNameFilters(["*.png", "*.jpg", "*.jpeg", "*.scene.json", "*.py", "*.prefab"])
+        self.model.setNameFilters(["*.png", "*.jpg", "*.jpeg", "*.scene.json", "*.scene.bin", "*.py", "*.prefab"])
         self.model.setNameFilterDisables(False)
         
         self.list_view = QListView()
@@ -1,10 +1,63 @@
 from PySide6.QtWidgets import QWidget
-from PySide6.QtGui import QPainter, QColor, QPen, QBrush, QFont, QPixmap, QCursor, QPolygonF
-from PySide6.QtCore import Qt, QRectF, QPointF
+from PySide6.QtGui import QPainter, QColor, QPen, QBrush, QFont, QPixmap, QCursor, QPolygonF, QPicture, QTransform
+from PySide6.QtCore import Qt, QRectF, QPointF, QRect, QTimer
 from editor.editor_state import EditorState
-from editor.undo_redo import ChangeComponentCommand
+from editor.undo_redo import ChangeComponentCommand, CreateObjectCommand, CompoundCommand
+from editor.spatial_index import QuadTree
+from shared.atlas import load_index, find_region
 import os
 import math
+import time
+
+# Screen-space slack around an object's bounds: selection handles, pen widths, camera label
+HANDLE_MARGIN = 40
+CAMERA_MARGIN = 110
+
+# Level of detail, in on-screen pixels (largest side of the object)
+DETAIL_PIXELS = 16 # Below: objects become flat-colour rects; outlines, labels and collider gizmos are hidden
+CLUSTER_PIXELS = 6 # Below: objects are merged into CLUSTER_PIXELS-sized cells of their average colour
+GRID_MIN_PIXELS = 12 # Grid spacing doubles until lines are at least this far apart
+
+# Rendered scene tiles, reused while panning (see SceneCanvas.draw_tiles)
+TILE_PIXELS = 128
+TILE_PAD = 4 # Pixels drawn outside an item's bounds (antialiased pens)
+MAX_TILES = 600
+TILE_BUDGET = 0.008 # Seconds of tile rendering per paint; the rest follows in later paints
+
+def get_layer(obj):
+    # Background (-100), Sprite (0), Text (100)
+    bg = obj.get("components", {}).get("Background")
+    if bg: return bg.get("layer", -100)
+    sr = obj.get("components", {}).get("SpriteRenderer")
+    if sr: return sr.get("layer", 0)
+    return 0
+
+def _centered(cx, cy, w, h):
+    w, h = abs(w), abs(h)
+    return QRectF(cx - w/2, cy - h/2, w, h)
+
+class DisplayItem:
+    """
+    Retained drawing of one scene object: layer, world bounds and a QPicture of its
+    draw_object() output. Replaying the picture is one call instead of re-reading the
+    component dicts. Pen widths depend on zoom, so pictures are re-recorded after zooming.
+    """
+    def __init__(self, obj):
+        self.obj = obj
+        self.order = 0 # Index in scene.objects
+        self.layer = 0
+        self.rank = 0 # Index in draw order
+        self.color = None # Average (r, g, b), for clusters (None: draws nothing)
+        self.brush = None # Same colour, for flat rects
+        self.shape = None # Rotated sprite rect in world space (QPolygonF), for flat rects
+        self.bounds = QRectF()
+        self.center = (0.0, 0.0) # Of bounds
+        self.size = 0.0 # Largest side of the sprite rect (level of detail)
+        self.margin = HANDLE_MARGIN
+        self.screen_space = False # Fixed backgrounds cover the whole view and are drawn live, below the world
+        self.overlay = False # Camera gizmo (screen-size label) is drawn live, above the world
+        self.picture = None
+        self.picture_zoom = None
 
 class SceneCanvas(QWidget):
     # Handle types
@@ -25,9 +78,10 @@ class SceneCanvas(QWidget):
         self.setAcceptDrops(True)
         
         self.state = EditorState.instance()
-        self.state.scene_loaded.connect(self.update)
-        self.state.scene_updated.connect(self.update)
-        self.state.selection_changed.connect(lambda _: self.update())
+        self.state.scene_loaded.connect(self.on_scene_loaded)
+        self.state.scene_updated.connect(self.on_scene_updated)
+        self.state.object_changed.connect(self.invalidate_object)
+        self.state.selection_changed.connect(self.on_selection_changed)
         
         # View
         self.grid_size = 50
@@ -44,10 +98,32 @@ class SceneCanvas(QWidget):
         self.drag_scale_start = [1, 1]
         self.drag_zoom_start = 1.0
         self.drag_obj_start_bounds = (0, 0) # w, h at start
+        self.drag_group_start = {} # id -> start position of the other selected objects (group move)
         
         self.sprite_cache = {}
+        self.atlas = load_index(self.state.project_root) # None if the project has no atlas
         self.handle_size = 10
 
+        # Display list: rebuilt on structure changes, refreshed per changed object
+        self.items = {} # object id -> DisplayItem
+        self.scene_order = [] # DisplayItems in scene.objects order
+        self.draw_order = [] # Sorted by layer (stable, so scene order within a layer)
+        self.structure_dirty = True
+        self.stale_ids = set()
+        self.drawn_selection = set()
+        self.screen_items = set() # DisplayItems drawn in screen space (always painted)
+        self.overlay_items = set()
+        self.color_cache = {} # sprite path -> average QColor
+        self.tiles = {} # (tx, ty) -> QPixmap of the items in that TILE_PIXELS square, at tile_zoom
+        self.tile_zoom = None
+        self.old_tiles = {} # Tiles of the previous zoom, shown scaled until the new ones are rendered
+        self.old_zoom = None
+        self.index = QuadTree() # DisplayItem -> world bounds, for hit-testing
+
+        self.hover_id = None
+        self.marquee_start = None # Screen point where a Shift+drag selection started
+        self.marquee_rect = None
+
     def get_canvas_center(self):
         cx = (self.width() / 2 - self.pan_offset.x()) / self.zoom - (self.width() / 2 / self.zoom)
         cy = (self.height() / 2 - self.pan_offset.y()) / self.zoom - (self.height() / 2 / self.zoom)
@@ -69,6 +145,17 @@ class SceneCanvas(QWidget):
             return None
         if path in self.sprite_cache:
             return self.sprite_cache[path]
+        
+        # Packed sprites: one pixmap per atlas page, regions cut from it
+        region = find_region(self.atlas, path)
+        if region:
+            page = self.load_sprite(region[0])
+            if page and not page.isNull():
+                x, y, w, h = region[1]
+                pixmap = page.copy(x, y, w, h)
+                self.sprite_cache[path] = pixmap
+                return pixmap
+        
         full_path = os.path.join(self.state.project_root, path)
         if os.path.exists(full_path):
             pixmap = QPixmap(full_path)
@@ -90,7 +177,7 @@ class SceneCanvas(QWidget):
         scale = transform.get("scale", [1, 1])
         rotation = transform.get("rotation", 0)
         
-        sprite_path = sprite_data.get("sprite_path", "")
+        sprite_path = sprite_data.get("region") or sprite_data.get("sprite_path", "")
         pixmap = self.load_sprite(sprite_path) if sprite_path else None
         
         if pixmap and not pixmap.isNull():
@@ -121,37 +208,454 @@ class SceneCanvas(QWidget):
         
         return pos[0], pos[1], w, h, rotation
 
+    # --- Display list ---
+    def view_transform(self):
+        """World -> screen: Screen = World * Zoom + Pan + CenterOffset."""
+        t = QTransform()
+        t.translate(self.width() / 2 + self.pan_offset.x(), self.height() / 2 + self.pan_offset.y())
+        t.scale(self.zoom, self.zoom)
+        return t
+
+    def sprite_rect(self, obj):
+        """The sprite (or fallback shape / background) rect in local space, as draw_object() draws it."""
+        comps = obj.get("components", {})
+        scale = comps.get("Transform", {}).get("scale", [1, 1])
+        data = comps.get("Background") or comps.get("SpriteRenderer", {})
+        path = data.get("region") or data.get("sprite_path", "")
+        pixmap = self.load_sprite(path) if path else None
+        if pixmap and not pixmap.isNull():
+            return _centered(0, 0, pixmap.width() * scale[0], pixmap.height() * scale[1])
+        base = 100 if "Background" in comps else 40
+        return _centered(0, 0, base * scale[0], base * scale[1])
+
+    def local_bounds(self, obj):
+        """Rect in the object's local (unrotated) space covering everything draw_object() draws."""
+        comps = obj.get("components", {})
+        scale = comps.get("Transform", {}).get("scale", [1, 1])
+        _, _, w, h, _ = self.get_obj_geometry(obj)
+        rect = _centered(0, 0, w, h)
+
+        sprite_data = comps.get("SpriteRenderer", {})
+        sprite_path = sprite_data.get("region") or sprite_data.get("sprite_path", "")
+        pixmap = self.load_sprite(sprite_path) if sprite_path else None
+        if pixmap and not pixmap.isNull():
+            rect = rect.united(_centered(0, 0, pixmap.width() * scale[0], pixmap.height() * scale[1]))
+        else:
+            rect = rect.united(_centered(0, 0, 40 * scale[0], 40 * scale[1]))
+
+        bg = comps.get("Background")
+        if bg:
+            path = bg.get("sprite_path")
+            pixmap = self.load_sprite(path) if path else None
+            if pixmap and not pixmap.isNull():
+                rect = rect.united(_centered(0, 0, pixmap.width() * scale[0], pixmap.height() * scale[1]))
+            else:
+                rect = rect.united(_centered(0, 0, 100 * scale[0], 100 * scale[1]))
+
+        box = comps.get("BoxCollider")
+        if box:
+            size_w, size_h = box.get("size", [50, 50])
+            off_x, off_y = box.get("offset", [0, 0])
+            rect = rect.united(_centered(off_x * scale[0], off_y * scale[1], size_w * scale[0], size_h * scale[1]))
+
+        circle = comps.get("CircleCollider")
+        if circle:
+            d = 2 * circle.get("radius", 25.0) * max(abs(scale[0]), abs(scale[1]))
+            off_x, off_y = circle.get("offset", [0, 0])
+            rect = rect.united(_centered(off_x * scale[0], off_y * scale[1], d, d))
+
+        cam = comps.get("Camera")
+        if cam:
+            zoom = cam.get("zoom", 1.0)
+            if zoom <= 0.001: zoom = 1.0
+            rect = rect.united(_centered(0, 0, cam.get("width", 800.0) / zoom, cam.get("height", 600.0) / zoom))
+        return rect
+
+    def update_item(self, item):
+        obj = item.obj
+        comps = obj.get("components", {})
+        transform = comps.get("Transform", {})
+        pos = transform.get("position", [0, 0])
+        bg = comps.get("Background")
+
+        item.layer = get_layer(obj)
+        item.screen_space = bool(bg) and bg.get("fixed", True)
+        item.overlay = "Camera" in comps
+        item.margin = CAMERA_MARGIN if "Camera" in comps else HANDLE_MARGIN
+        t = QTransform()
+        t.translate(pos[0], pos[1])
+        t.rotate(transform.get("rotation", 0))
+        item.bounds = t.mapRect(self.local_bounds(obj))
+        item.center = (item.bounds.center().x(), item.bounds.center().y())
+        color = self.item_color(obj)
+        item.color = (color.red(), color.green(), color.blue()) if color is not None else None
+        item.brush = color
+        rect = self.sprite_rect(obj)
+        item.shape = t.map(QPolygonF(rect))
+        item.size = max(rect.width(), rect.height())
+        self.index_item(item)
+        item.picture = None
+        item.picture_zoom = None
+
+    def index_item(self, item):
+        b = item.bounds
+        self.index.insert(item, (b.left(), b.top(), b.right(), b.bottom()))
+        for live, items in ((item.screen_space, self.screen_items), (item.overlay, self.overlay_items)):
+            if live:
+                items.add(item)
+            else:
+                items.discard(item)
+
+    def average_color(self, path):
+        color = self.color_cache.get(path)
+        if color is None:
+            pixmap = self.load_sprite(path)
+            if not pixmap or pixmap.isNull():
+                return None
+            color = pixmap.scaled(1, 1, Qt.IgnoreAspectRatio, Qt.SmoothTransformation).toImage().pixelColor(0, 0)
+            self.color_cache[path] = color
+        return color
+
+    def item_color(self, obj):
+        """Flat colour standing in for the object when it is too small to draw in detail."""
+        if not obj.get("active", True):
+            return None
+        comps = obj.get("components", {})
+        bg = comps.get("Background")
+        if bg:
+            path = bg.get("sprite_path")
+            return (path and self.average_color(path)) or QColor(*bg.get("color", [255, 255, 255, 255])[:4])
+        sprite_data = comps.get("SpriteRenderer", {})
+        if not sprite_data.get("visible", True):
+            return None
+        path = sprite_data.get("region") or sprite_data.get("sprite_path", "")
+        return (path and self.average_color(path)) or QColor(*sprite_data.get("tint", [255, 255, 255, 255])[:4])
+
+    def sort_draw_order(self):
+        self.draw_order = sorted(self.scene_order, key=lambda item: item.layer)
+        for rank, item in enumerate(self.draw_order):
+            item.rank = rank
+
+    def record_item(self, item):
+        picture = QPicture()
+        painter = QPainter(picture)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.draw_object(painter, item.obj, selected=False, camera_gizmo=False)
+        painter.end()
+        item.picture = picture
+        item.picture_zoom = self.zoom
+
+    def screen_rect(self, item):
+        """Widget area an item covers (including handles), for partial repaints."""
+        if item.screen_space:
+            return self.rect()
+        m = item.margin
+        return self.view_transform().mapRect(item.bounds).toAlignedRect().adjusted(-m, -m, m, m)
+
+    def sync_display_list(self):
+        """Brings the display list up to date with the scene. Cheap when nothing changed."""
+        scene = self.state.current_scene
+        if not scene:
+            self.items = {}
+            self.scene_order = []
+            self.draw_order = []
+            self.index.clear()
+            self.screen_items.clear()
+            self.overlay_items.clear()
+            self.stale_ids.clear()
+            return
+
+        if not self.structure_dirty and self.stale_ids:
+            resort = False
+            for obj_id in self.stale_ids:
+                item = self.items.get(obj_id)
+                if item is None or self.state.get_object_by_id(obj_id) is not item.obj:
+                    # Created, deleted or restored by undo
+                    self.structure_dirty = True
+                    break
+                layer = item.layer
+                self.update_item(item)
+                self.repaint_item(item)
+                resort = resort or item.layer != layer
+            else:
+                self.stale_ids.clear()
+                if resort:
+                    self.sort_draw_order()
+
+        if self.structure_dirty:
+            # Unchanged objects keep their items (and recorded pictures)
+            old = self.items
+            self.items = {}
+            self.scene_order = []
+            self.index.clear()
+            self.screen_items.clear()
+            self.overlay_items.clear()
+            for i, obj in enumerate(scene.objects):
+                obj_id = obj.get("id")
+                item = old.get(obj_id)
+                if item is None or item.obj is not obj or obj_id in self.stale_ids:
+                    item = DisplayItem(obj)
+                    self.update_item(item)
+                else:
+                    self.index_item(item)
+                item.order = i
+                self.items[obj_id] = item
+                self.scene_order.append(item)
+            self.sort_draw_order()
+            self.stale_ids.clear()
+            self.structure_dirty = False
+            self.tiles.clear()
+            self.old_tiles.clear()
+            self.update()
+
+    def invalidate_object(self, obj_id):
+        """An object changed (EditorState.object_changed). Its old area is repainted now, its new one on sync."""
+        item = self.items.get(obj_id)
+        if item is None:
+            self.structure_dirty = True
+        else:
+            self.repaint_item(item)
+        self.stale_ids.add(obj_id)
+
+    def repaint_item(self, item):
+        """Schedules a repaint of the item's area and drops the cached tiles under it."""
+        self.update(self.screen_rect(item))
+        if item.screen_space or self.tile_zoom is None:
+            return
+        z = self.tile_zoom
+        b = item.bounds
+        for tx in range(math.floor((b.left() * z - TILE_PAD) / TILE_PIXELS), math.floor((b.right() * z + TILE_PAD) / TILE_PIXELS) + 1):
+            for ty in range(math.floor((b.top() * z - TILE_PAD) / TILE_PIXELS), math.floor((b.bottom() * z + TILE_PAD) / TILE_PIXELS) + 1):
+                self.tiles.pop((tx, ty), None)
+        self.old_tiles.clear()
+
+    def on_scene_loaded(self):
+        self.structure_dirty = True
+        self.update()
+
+    def on_scene_updated(self):
+        self.sync_display_list()
+
+    def on_selection_changed(self, obj_id):
+        # Only the old and new selection change appearance
+        selection = set(self.state.selected_object_ids)
+        if obj_id:
+            selection.add(obj_id)
+        for sel_id in self.drawn_selection ^ selection:
+            item = self.items.get(sel_id)
+            if item is not None:
+                self.update(self.screen_rect(item))
+        self.drawn_selection = selection
+
+    def set_hover(self, obj_id):
+        if obj_id == self.hover_id:
+            return
+        for hover_id in (self.hover_id, obj_id):
+            item = self.items.get(hover_id)
+            if item is not None:
+                self.update(self.screen_rect(item))
+        self.hover_id = obj_id
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
         
         # Center the view
-        cx = self.width() / 2
-        cy = self.height() / 2
-        
-        painter.translate(cx, cy)
-        painter.translate(self.pan_offset)
-        painter.scale(self.zoom, self.zoom)
+        view = self.view_transform()
+        painter.setTransform(view)
         
+        area = view.inverted()[0].mapRect(QRectF(event.rect())) # Repainted area in world space
         if self.show_grid:
-            self.draw_grid(painter)
+            self.draw_grid(painter, area)
             self.draw_axes(painter) # New axis drawing
         
         scene = self.state.current_scene
         if scene:
-            # Sort by layer: Background (-100), Sprite (0), Text (100)
-            def get_layer(o):
-                bg = o.get("components", {}).get("Background")
-                if bg: return bg.get("layer", -100)
-                sr = o.get("components", {}).get("SpriteRenderer")
-                if sr: return sr.get("layer", 0)
-                return 0
-            
-            sorted_objs = sorted(scene.objects, key=get_layer)
-            
-            for obj in sorted_objs:
-                self.draw_object(painter, obj)
+            self.sync_display_list()
+            selected = self.state.selected_object_id
+
+            # Fixed backgrounds depend on the widget size: drawn live, below the world
+            for item in sorted(self.screen_items, key=lambda item: item.rank):
+                self.draw_object(painter, item.obj)
+
+            self.draw_tiles(painter, event.rect(), view)
+
+            # Camera gizmos over the world (label stays the same size on screen)
+            for item in sorted(self.overlay_items, key=lambda item: item.rank):
+                if item is not self.items.get(selected) and item.obj.get("active", True):
+                    transform = item.obj.get("components", {}).get("Transform", {})
+                    pos = transform.get("position", [0, 0])
+                    painter.save()
+                    painter.translate(pos[0], pos[1])
+                    painter.rotate(transform.get("rotation", 0))
+                    self.draw_camera_gizmo(painter, item.obj["components"]["Camera"])
+                    painter.restore()
+
+            # Selection drawn live with its handles, then whatever is drawn after it and overlaps it
+            selected_item = self.items.get(selected)
+            if selected_item is not None and not selected_item.screen_space:
+                self.draw_object(painter, selected_item.obj)
+                b = selected_item.bounds
+                above = [item for item in self.index.query_rect((b.left(), b.top(), b.right(), b.bottom()))
+                         if item.rank > selected_item.rank and not item.screen_space]
+                for item in sorted(above, key=lambda item: item.rank):
+                    if item.picture_zoom != self.zoom:
+                        self.record_item(item)
+                    painter.drawPicture(0, 0, item.picture)
+
+            # Outlines: rest of a multi-selection, then the object under the mouse
+            for obj_id in self.state.selected_object_ids:
+                if obj_id != selected and obj_id in self.items:
+                    self.draw_outline(painter, self.items[obj_id].obj, QColor(100, 180, 255))
+            if self.hover_id and self.hover_id not in self.state.selected_object_ids and self.hover_id in self.items:
+                self.draw_outline(painter, self.items[self.hover_id].obj, QColor(200, 200, 200, 160))
+
+        if self.marquee_rect is not None:
+            painter.resetTransform()
+            painter.setPen(QPen(QColor(100, 180, 255), 1))
+            painter.setBrush(QColor(100, 180, 255, 40))
+            painter.drawRect(self.marquee_rect)
+
+    def draw_tiles(self, painter, rect, view):
+        """
+        Draws the world from cached tiles. Tiles sit on a grid fixed in zoomed-world space
+        (TILE_PIXELS squares at tile_zoom), so panning only blits them and renders the strips
+        scrolled into view. Rendering is capped at TILE_BUDGET per paint; tiles not ready yet
+        show the previous zoom's tiles scaled, and another paint is scheduled for them.
+        """
+        if self.tile_zoom != self.zoom:
+            if self.tiles:
+                self.old_tiles, self.old_zoom = self.tiles, self.tile_zoom
+            self.tiles = {}
+            self.tile_zoom = self.zoom
+
+        dx, dy = round(view.dx()), round(view.dy())
+        r = rect.translated(-dx, -dy)
+        wanted = [(tx, ty) for tx in range(r.left() // TILE_PIXELS, r.right() // TILE_PIXELS + 1)
+                  for ty in range(r.top() // TILE_PIXELS, r.bottom() // TILE_PIXELS + 1)]
+        if len(self.tiles) + len(wanted) > MAX_TILES:
+            # Forget tiles scrolled out of view
+            keep = set(wanted)
+            self.tiles = {key: tile for key, tile in self.tiles.items() if key in keep}
+
+        painter.save()
+        painter.resetTransform()
+        deadline = time.perf_counter() + TILE_BUDGET
+        missing = QRect()
+        for key in wanted:
+            tile = self.tiles.get(key)
+            if tile is None and time.perf_counter() < deadline:
+                tile = self.tiles[key] = self.render_tile(*key)
+            target = QRect(key[0] * TILE_PIXELS + dx, key[1] * TILE_PIXELS + dy, TILE_PIXELS, TILE_PIXELS)
+            if tile is None:
+                self.draw_old_tiles(painter, target, view)
+                missing = missing.united(target)
+            else:
+                painter.drawPixmap(target.topLeft(), tile)
+        painter.restore()
+
+        if missing.isEmpty():
+            self.old_tiles = {}
+        else:
+            QTimer.singleShot(0, lambda: self.update(missing))
+
+    def draw_old_tiles(self, painter, target, view):
+        """Fills a not-yet-rendered tile area with the previous zoom's tiles, scaled."""
+        if not self.old_tiles:
+            return
+        k = self.zoom / self.old_zoom
+        size = TILE_PIXELS * k
+        painter.save()
+        painter.setClipRect(target)
+        for ux in range(math.floor((target.left() - view.dx()) / size), math.floor((target.right() - view.dx()) / size) + 1):
+            for uy in range(math.floor((target.top() - view.dy()) / size), math.floor((target.bottom() - view.dy()) / size) + 1):
+                tile = self.old_tiles.get((ux, uy))
+                if tile is not None:
+                    painter.drawPixmap(QRectF(ux * size + view.dx(), uy * size + view.dy(), size, size), tile, QRectF(tile.rect()))
+        painter.restore()
+
+    def render_tile(self, tx, ty):
+        """Renders every non-screen-space item overlapping tile (tx, ty) into a transparent pixmap."""
+        zoom = self.zoom
+        tile = QPixmap(TILE_PIXELS, TILE_PIXELS)
+        tile.fill(Qt.transparent)
+        painter = QPainter(tile)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        t = QTransform()
+        t.translate(-tx * TILE_PIXELS, -ty * TILE_PIXELS)
+        t.scale(zoom, zoom)
+        painter.setTransform(t)
+
+        # Viewport culling: only items overlapping the tile (spatial index), in draw order
+        pad = TILE_PAD / zoom
+        x0 = tx * TILE_PIXELS / zoom - pad
+        y0 = ty * TILE_PIXELS / zoom - pad
+        x1 = (tx + 1) * TILE_PIXELS / zoom + pad
+        y1 = (ty + 1) * TILE_PIXELS / zoom + pad
+        items = sorted(self.index.query_rect((x0, y0, x1, y1)), key=lambda item: item.rank)
+
+        cells = {} # Clustered tiny objects: cell in zoomed-world space -> [r, g, b, count]
+        layer = None
+        painter.setPen(Qt.NoPen)
+        for item in items:
+            if item.screen_space:
+                continue
+            if item.layer != layer:
+                # Clusters are flushed per layer so layers still stack correctly
+                self.draw_clusters(painter, cells, -tx * TILE_PIXELS, -ty * TILE_PIXELS)
+                layer = item.layer
+            if item.size * zoom < CLUSTER_PIXELS:
+                color = item.color
+                if color is not None:
+                    key = (int(item.center[0] * zoom // CLUSTER_PIXELS), int(item.center[1] * zoom // CLUSTER_PIXELS))
+                    cell = cells.get(key)
+                    if cell is None:
+                        cells[key] = [color[0], color[1], color[2], 1]
+                    else:
+                        cell[0] += color[0]
+                        cell[1] += color[1]
+                        cell[2] += color[2]
+                        cell[3] += 1
+                continue
+            if item.size * zoom < DETAIL_PIXELS:
+                if item.brush is not None:
+                    painter.setBrush(item.brush)
+                    painter.drawPolygon(item.shape)
+                continue
+            if item.picture_zoom != zoom:
+                self.record_item(item)
+            painter.drawPicture(0, 0, item.picture)
+            painter.setPen(Qt.NoPen)
+        self.draw_clusters(painter, cells, -tx * TILE_PIXELS, -ty * TILE_PIXELS)
+        painter.end()
+        return tile
+
+    def draw_clusters(self, painter, cells, ox, oy):
+        """Fills each cell with the average colour of the tiny objects merged into it."""
+        if not cells:
+            return
+        painter.save()
+        painter.resetTransform()
+        for (cx, cy), (r, g, b, n) in cells.items():
+            painter.fillRect(QRectF(cx * CLUSTER_PIXELS + ox, cy * CLUSTER_PIXELS + oy, CLUSTER_PIXELS, CLUSTER_PIXELS),
+                             QColor(r // n, g // n, b // n))
+        painter.restore()
+        cells.clear()
+
+    def draw_outline(self, painter, obj, color):
+        if not obj.get("active", True):
+            return
+        cx, cy, w, h, rotation = self.get_obj_geometry(obj)
+        painter.save()
+        painter.translate(cx, cy)
+        painter.rotate(rotation)
+        painter.setPen(QPen(color, 1.5 / self.zoom))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(QRectF(-w/2, -h/2, w, h))
+        painter.restore()
 
     def draw_axes(self, painter):
         # Draw World Origin Axes (X=Red, Y=Green)
@@ -167,26 +671,34 @@ class SceneCanvas(QWidget):
         painter.setPen(QPen(QColor(40, 70, 40), pen_width))
         painter.drawLine(0, -10000, 0, 10000)
 
-    def draw_grid(self, painter):
+    def draw_grid(self, painter, area=None):
         pen = QPen(QColor(30, 30, 30))
         pen.setWidthF(1 / self.zoom)
         painter.setPen(pen)
         
-        # Get visible bounds in world space
-        tl_x, tl_y = self.screen_to_world(0, 0)
-        br_x, br_y = self.screen_to_world(self.width(), self.height())
+        # Get visible bounds in world space (only the repainted area)
+        if area is None:
+            tl_x, tl_y = self.screen_to_world(0, 0)
+            br_x, br_y = self.screen_to_world(self.width(), self.height())
+        else:
+            tl_x, tl_y, br_x, br_y = area.left(), area.top(), area.right(), area.bottom()
+
+        # Adaptive spacing: zoomed far out, every 2nd/4th/... line is drawn
+        step = self.grid_size
+        while step * self.zoom < GRID_MIN_PIXELS:
+            step *= 2
         
-        x = int(tl_x / self.grid_size) * self.grid_size
+        x = int(tl_x / step) * step
         while x < br_x:
             painter.drawLine(x, int(tl_y), x, int(br_y))
-            x += self.grid_size
+            x += step
         
-        y = int(tl_y / self.grid_size) * self.grid_size
+        y = int(tl_y / step) * step
         while y < br_y:
             painter.drawLine(int(tl_x), y, int(br_x), y)
-            y += self.grid_size
+            y += step
 
-    def draw_object(self, painter, obj):
+    def draw_object(self, painter, obj, selected=None, camera_gizmo=True):
         if not obj.get("active", True):
             return
         
@@ -262,9 +774,9 @@ class SceneCanvas(QWidget):
         if not sprite_data.get("visible", True):
             return
         
-        is_selected = (obj.get("id") == self.state.selected_object_id)
+        is_selected = (obj.get("id") == self.state.selected_object_id) if selected is None else selected
         
-        sprite_path = sprite_data.get("sprite_path", "")
+        sprite_path = sprite_data.get("region") or sprite_data.get("sprite_path", "")
         pixmap = self.load_sprite(sprite_path) if sprite_path else None
         
         # Calculate Unrotated dimensions
@@ -278,6 +790,9 @@ class SceneCanvas(QWidget):
         w = base_w * scale[0]
         h = base_h * scale[1]
 
+        # Level of detail: small on screen -> flat colour, no outline, label or collider gizmos
+        detailed = is_selected or max(abs(w), abs(h)) * self.zoom >= DETAIL_PIXELS
+
         painter.save()
         painter.translate(pos[0], pos[1])
         painter.rotate(rotation)
@@ -289,7 +804,10 @@ class SceneCanvas(QWidget):
             # Simple tinting only if no sprite logic or separate shader
             # For MVP, we just draw the pixmap. Full tinting is expensive in QPainter per frame without caching.
             # But let's check if we can simply multiply color
-            painter.drawPixmap(target_rect, pixmap, QRectF(pixmap.rect()))
+            if detailed:
+                painter.drawPixmap(target_rect, pixmap, QRectF(pixmap.rect()))
+            else:
+                painter.fillRect(target_rect, self.average_color(sprite_path))
         else:
             # Fallback Shapes (Square/Circle)
             
@@ -303,8 +821,10 @@ class SceneCanvas(QWidget):
             # Selection Style (Overlay)
             if is_selected:
                 pen = QPen(QColor(100, 180, 255), 2/self.zoom)
-            else:
+            elif detailed:
                 pen = QPen(QColor(50, 50, 50, 150), 1/self.zoom)
+            else:
+                pen = QPen(Qt.NoPen)
             
             painter.setBrush(brush)
             painter.setPen(pen)
@@ -319,48 +839,26 @@ class SceneCanvas(QWidget):
                 painter.drawRect(QRectF(-w/2, -h/2, w, h))
             
             # Name Tag
-            if is_selected:
-                painter.setPen(QPen(Qt.white))
-            else:
-                painter.setPen(QPen(Qt.lightGray))
-                
-            painter.setFont(QFont("Segoe UI", 10))
-            painter.drawText(QRectF(-w/2, -h/2, w, h), Qt.AlignCenter, obj.get("name", "?")[:10])
+            if detailed:
+                if is_selected:
+                    painter.setPen(QPen(Qt.white))
+                else:
+                    painter.setPen(QPen(Qt.lightGray))
+                    
+                painter.setFont(QFont("Segoe UI", 10))
+                painter.drawText(QRectF(-w/2, -h/2, w, h), Qt.AlignCenter, obj.get("name", "?")[:10])
 
         # Draw Camera Gizmo
         camera_data = obj.get("components", {}).get("Camera")
-        if camera_data:
-            cw = camera_data.get("width", 800.0)
-            ch = camera_data.get("height", 600.0)
-            zoom = camera_data.get("zoom", 1.0)
-            if zoom <= 0.001: zoom = 1.0
-            
-            # The yellow box represents the WORLD AREA visible in the camera.
-            # If Zoom > 1 (Zoom In), we see LESS world (Box shrinks).
-            # If Zoom < 1 (Zoom Out), we see MORE world (Box grows).
-            world_w = cw / zoom
-            world_h = ch / zoom
-            
-            painter.setPen(QColor(255, 255, 0)) # Yellow
-            painter.setBrush(Qt.NoBrush)
-            painter.drawRect(QRectF(-world_w/2, -world_h/2, world_w, world_h))
-            
-            # Label
-            scale_factor = 1.0 / self.zoom if self.zoom else 1.0
-            painter.save()
-            painter.scale(scale_factor, scale_factor)
-            painter.setPen(QColor(255, 255, 0))
-            # Adjust label position to top-left of the scaled box
-            label_x = -world_w/2 / scale_factor
-            label_y = (-world_h/2 / scale_factor) - 20
-            painter.drawText(QRectF(label_x, label_y, 100, 20), Qt.AlignLeft, f"Camera ({int(cw)}x{int(ch)})")
-            painter.restore()
+        if camera_data and camera_gizmo:
+            self.draw_camera_gizmo(painter, camera_data)
 
         # Draw Selection Handles (in rotated local space)
         if is_selected:
             self.draw_handles_local(painter, w, h)
             
         # --- Draw Collider Gizmos (Green) ---
+        # Skipped when tiny on screen (level of detail)
         # Draw BoxCollider
         box = obj.get("components", {}).get("BoxCollider")
         if box:
@@ -377,10 +875,11 @@ class SceneCanvas(QWidget):
             
             collider_rect = QRectF(cox - cw/2, coy - ch/2, cw, ch)
             
-            pen = QPen(QColor(0, 255, 0), 2 / self.zoom) # Green
-            painter.setPen(pen)
-            painter.setBrush(Qt.NoBrush)
-            painter.drawRect(collider_rect)
+            if max(abs(cw), abs(ch)) * self.zoom >= DETAIL_PIXELS:
+                pen = QPen(QColor(0, 255, 0), 2 / self.zoom) # Green
+                painter.setPen(pen)
+                painter.setBrush(Qt.NoBrush)
+                painter.drawRect(collider_rect)
             
         # Draw CircleCollider
         circle = obj.get("components", {}).get("CircleCollider")
@@ -396,13 +895,43 @@ class SceneCanvas(QWidget):
             cox = off_x * scale[0]
             coy = off_y * scale[1]
             
-            pen = QPen(QColor(0, 255, 0), 2 / self.zoom)
-            painter.setPen(pen)
-            painter.setBrush(Qt.NoBrush)
-            painter.drawEllipse(QPointF(cox, coy), s_radius, s_radius)
+            if 2 * s_radius * self.zoom >= DETAIL_PIXELS:
+                pen = QPen(QColor(0, 255, 0), 2 / self.zoom)
+                painter.setPen(pen)
+                painter.setBrush(Qt.NoBrush)
+                painter.drawEllipse(QPointF(cox, coy), s_radius, s_radius)
 
         painter.restore()
 
+    def draw_camera_gizmo(self, painter, camera_data):
+        """Camera view rect and label, in the camera object's local space."""
+        cw = camera_data.get("width", 800.0)
+        ch = camera_data.get("height", 600.0)
+        zoom = camera_data.get("zoom", 1.0)
+        if zoom <= 0.001: zoom = 1.0
+        
+        # The yellow box represents the WORLD AREA visible in the camera.
+        # If Zoom > 1 (Zoom In), we see LESS world (Box shrinks).
+        # If Zoom < 1 (Zoom Out), we see MORE world (Box grows).
+        world_w = cw / zoom
+        world_h = ch / zoom
+        
+        painter.setPen(QColor(255, 255, 0)) # Yellow
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(QRectF(-world_w/2, -world_h/2, world_w, world_h))
+        
+        # Label (hidden when the box itself is tiny on screen)
+        if world_w * self.zoom >= DETAIL_PIXELS:
+            scale_factor = 1.0 / self.zoom if self.zoom else 1.0
+            painter.save()
+            painter.scale(scale_factor, scale_factor)
+            painter.setPen(QColor(255, 255, 0))
+            # Adjust label position to top-left of the scaled box
+            label_x = -world_w/2 / scale_factor
+            label_y = (-world_h/2 / scale_factor) - 20
+            painter.drawText(QRectF(label_x, label_y, 100, 20), Qt.AlignLeft, f"Camera ({int(cw)}x{int(ch)})")
+            painter.restore()
+
     def draw_handles_local(self, painter, w, h):
         hs = self.handle_size / self.zoom
         
@@ -498,27 +1027,34 @@ class SceneCanvas(QWidget):
                 if obj:
                     handle = self.hit_handle(wx, wy, obj)
                     if handle != self.HANDLE_NONE:
-                        self.active_handle = handle
-                        self.drag_start = QPointF(wx, wy)
-                        transform = obj.get("components", {}).get("Transform", {})
-                        self.drag_obj_start_pos = list(transform.get("position", [0, 0]))
-                        self.drag_rot_start = transform.get("rotation", 0)
-                        self.drag_scale_start = list(transform.get("scale", [1, 1]))
-                        
-                        cam = obj.get("components", {}).get("Camera")
-                        if cam:
-                            self.drag_zoom_start = cam.get("zoom", 1.0)
-                        else:
-                            self.drag_zoom_start = 1.0
-                        
-                        _, _, w, h, _ = self.get_obj_geometry(obj)
-                        self.drag_obj_start_bounds = (w, h)
+                        self.begin_drag(obj, handle, wx, wy)
                         return
 
             # Hit test for selection
             hit_obj = self.hit_test(wx, wy)
+            shift = event.modifiers() & Qt.ShiftModifier
             if hit_obj:
-                self.state.select_object(hit_obj.get("id"))
+                ids = self.state.selected_object_ids
+                if not shift and len(ids) > 1 and hit_obj.get("id") in ids:
+                    # Pressed on another member of a multi-selection: it leads, the group moves together
+                    self.state.select_objects([hit_obj.get("id")] + ids)
+                    self.begin_drag(hit_obj, self.HANDLE_MOVE, wx, wy)
+                elif shift:
+                    # Shift+Click toggles the object in the selection
+                    ids = list(self.state.selected_object_ids)
+                    if hit_obj.get("id") in ids:
+                        ids.remove(hit_obj.get("id"))
+                    else:
+                        ids.append(hit_obj.get("id"))
+                    self.state.select_objects(ids)
+                else:
+                    self.state.select_object(hit_obj.get("id"))
+                return
+
+            if shift:
+                # Shift+Drag on empty space: rubber-band selection
+                self.marquee_start = pos
+                self.marquee_rect = QRectF(pos, pos)
                 return
             
             # Pan
@@ -527,6 +1063,29 @@ class SceneCanvas(QWidget):
             self.drag_start = pos
             self.setCursor(Qt.ClosedHandCursor)
 
+    def begin_drag(self, obj, handle, wx, wy):
+        self.active_handle = handle
+        self.drag_start = QPointF(wx, wy)
+        transform = obj.get("components", {}).get("Transform", {})
+        self.drag_obj_start_pos = list(transform.get("position", [0, 0]))
+        self.drag_rot_start = transform.get("rotation", 0)
+        self.drag_scale_start = list(transform.get("scale", [1, 1]))
+        
+        cam = obj.get("components", {}).get("Camera")
+        if cam:
+            self.drag_zoom_start = cam.get("zoom", 1.0)
+        else:
+            self.drag_zoom_start = 1.0
+        
+        _, _, w, h, _ = self.get_obj_geometry(obj)
+        self.drag_obj_start_bounds = (w, h)
+
+        self.drag_group_start = {}
+        if handle == self.HANDLE_MOVE:
+            for other in self.state.get_selected_objects():
+                if other is not obj and "Transform" in other.get("components", {}):
+                    self.drag_group_start[other.get("id")] = list(other["components"]["Transform"].get("position", [0, 0]))
+
     def mouseMoveEvent(self, event):
         pos = event.position()
         
@@ -537,6 +1096,19 @@ class SceneCanvas(QWidget):
             self.update()
             return
 
+        if self.marquee_start is not None:
+            old_rect = self.marquee_rect
+            self.marquee_rect = QRectF(self.marquee_start, pos).normalized()
+            self.update(old_rect.united(self.marquee_rect).toAlignedRect().adjusted(-2, -2, 2, 2))
+            return
+
+        if self.active_handle == self.HANDLE_NONE:
+            # Hover highlight
+            wx, wy = self.screen_to_world(pos.x(), pos.y())
+            hit_obj = self.hit_test(wx, wy)
+            self.set_hover(hit_obj.get("id") if hit_obj else None)
+            return
+
         if self.active_handle != self.HANDLE_NONE and self.state.selected_object_id:
             obj = self.state.get_selected_object()
             if not obj: return
@@ -562,8 +1134,18 @@ class SceneCanvas(QWidget):
                 
                 # Push Command (will merge with previous move command)
                 cmd = ChangeComponentCommand(obj, "Transform", "position", new_pos)
-                self.state.undo_stack.push(cmd)
+                if self.drag_group_start:
+                    # The rest of the selection follows by the same (snapped) offset, as one undo step
+                    dx = new_pos_x - self.drag_obj_start_pos[0]
+                    dy = new_pos_y - self.drag_obj_start_pos[1]
+                    cmds = [cmd]
+                    for other_id, (sx, sy) in self.drag_group_start.items():
+                        other = self.state.get_object_by_id(other_id)
+                        if other is not None:
+                            cmds.append(ChangeComponentCommand(other, "Transform", "position", [sx + dx, sy + dy]))
+                    cmd = CompoundCommand(cmds)
                 cmd.redo() # Ensure visual update
+                self.state.undo_stack.push(cmd)
             
             elif self.active_handle in (self.HANDLE_SCALE_TL, self.HANDLE_SCALE_TR, 
                                         self.HANDLE_SCALE_BL, self.HANDLE_SCALE_BR):
@@ -598,12 +1180,12 @@ class SceneCanvas(QWidget):
                             new_zoom = self.drag_zoom_start / factor
                             new_zoom = max(0.01, min(100.0, new_zoom))
                             cmd = ChangeComponentCommand(obj, "Camera", "zoom", new_zoom)
-                            self.state.undo_stack.push(cmd)
                             cmd.redo()
+                            self.state.undo_stack.push(cmd)
                     else:
                         cmd = ChangeComponentCommand(obj, "Transform", "scale", [nsx, nsy])
-                        self.state.undo_stack.push(cmd)
                         cmd.redo()
+                        self.state.undo_stack.push(cmd)
 
             elif self.active_handle == self.HANDLE_ROTATE:
                 cx, cy = self.drag_obj_start_pos
@@ -621,10 +1203,12 @@ class SceneCanvas(QWidget):
                 new_rot = raw_rot % 360
                 
                 cmd = ChangeComponentCommand(obj, "Transform", "rotation", new_rot)
-                self.state.undo_stack.push(cmd)
                 cmd.redo()
+                self.state.undo_stack.push(cmd)
             
-            self.state.scene_updated.emit()
+            # Repaint the new bounds now; other views refresh at most once per frame
+            self.sync_display_list()
+            self.state.request_update()
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -633,6 +1217,12 @@ class SceneCanvas(QWidget):
             # So we don't need to push a final command here. 
             # The 'drag_obj_*' state was just for calculation.
             pass
+
+            if self.marquee_start is not None:
+                self.update(self.marquee_rect.toAlignedRect().adjusted(-2, -2, 2, 2))
+                self.state.select_objects(self.objects_in_rect(self.marquee_rect))
+                self.marquee_start = None
+                self.marquee_rect = None
             
             self.panning = False
             self.active_handle = self.HANDLE_NONE
@@ -655,22 +1245,14 @@ class SceneCanvas(QWidget):
     def hit_test(self, wx, wy):
         scene = self.state.current_scene
         if not scene: return None
-        # Sort by visual order (High Layers on Top)
-        # We want to pick the "Topmost" object, so highest Layer first.
-        # Layer: Text(100) > Sprite(0) > Background(-100)
-        # Sort key: Layer
-        def get_layer(o):
-            bg = o.get("components", {}).get("Background")
-            if bg: return bg.get("layer", -100)
-            sr = o.get("components", {}).get("SpriteRenderer")
-            if sr: return sr.get("layer", 0)
-            return 0
-        
-        # Sort Descending (Highest First)
-        sorted_objs = sorted(scene.objects, key=get_layer, reverse=True)
+        # Only objects whose bounds contain the point (spatial index), in visual order:
+        # we want to pick the "Topmost" object, so highest Layer first.
+        # Layer: Text(100) > Sprite(0) > Background(-100); ties keep scene order
+        self.sync_display_list()
+        candidates = sorted(self.index.query_point(wx, wy), key=lambda item: (-item.layer, item.order))
 
         camera_hits = []
-        for obj in sorted_objs:
+        for obj in (item.obj for item in candidates):
             if not obj.get("active", True): continue
             
             cx, cy, w, h, rotation = self.get_obj_geometry(obj)
@@ -692,6 +1274,24 @@ class SceneCanvas(QWidget):
             return camera_hits[0]
         return None
 
+    def objects_in_rect(self, screen_rect):
+        """Ids of active objects whose centre lies inside a screen rect, in scene order."""
+        tl = self.screen_to_world(screen_rect.left(), screen_rect.top())
+        br = self.screen_to_world(screen_rect.right(), screen_rect.bottom())
+        self.sync_display_list()
+        ids = []
+        for item in sorted(self.index.query_rect((tl[0], tl[1], br[0], br[1])), key=lambda item: item.order):
+            obj = item.obj
+            if not obj.get("active", True):
+                continue
+            cx, cy = obj.get("components", {}).get("Transform", {}).get("position", [0, 0])
+            if tl[0] <= cx <= br[0] and tl[1] <= cy <= br[1]:
+                ids.append(obj.get("id"))
+        return ids
+
+    def leaveEvent(self, event):
+        self.set_hover(None)
+
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_R and event.modifiers() == Qt.ControlModifier:
             self.zoom = 1.0
@@ -699,6 +1299,9 @@ class SceneCanvas(QWidget):
             self.update()
         elif event.key() == Qt.Key_Escape:
             self.state.select_object(None)
+        elif event.key() == Qt.Key_Delete and self.state.selected_object_ids:
+            self.state.delete_objects(list(self.state.selected_object_ids))
+            self.window().refresh_ui()
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -741,8 +1344,9 @@ class SceneCanvas(QWidget):
             # Add to scene
             scene = self.state.current_scene
             if scene:
-                scene.objects.append(prefab_data)
-                self.state.scene_loaded.emit()
+                cmd = CreateObjectCommand(scene, prefab_data)
+                cmd.redo()
+                self.state.undo_stack.push(cmd) # object_changed adds it to the display list
                 self.state.select_object(new_id)
                 print(f"Instantiated prefab {new_name} at {wx:.1f}, {wy:.1f}")
 
@@ -1,4 +1,4 @@
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Signal, QTimer
 from typing import Optional
 import os
 import sys
@@ -7,15 +7,21 @@ import sys
 sys.path.append(os.getcwd())
 
 from shared.scene_schema import Scene, GameObject
-from editor.undo_redo import UndoStack
+from editor.undo_redo import UndoStack, DeleteObjectsCommand, ReparentCommand
+from editor.scene_writer import SceneWriter
+from editor.scene_index import SceneIndex
 
 from .undo_redo import UndoStack
 
+UPDATE_INTERVAL_MS = 16 # request_update(): at most one scene_updated per frame
+
 class EditorState(QObject):
     # Signals
     scene_loaded = Signal() # Structure changed (new scene, add/remove object)
     scene_updated = Signal() # Data changed (property edit, transform)
     selection_changed = Signal(str) # object_id, empty if none
+    object_changed = Signal(str) # object_id; emitted for each changed object (undo commands and untracked edits)
+    _saved = Signal(object, int, int, str, str) # on_done, load generation, revision, path, error; from the writer thread
     
     _instance = None
 
@@ -23,9 +29,28 @@ class EditorState(QObject):
         super().__init__()
         self.undo_stack = UndoStack()
         self.current_scene: Optional[Scene] = None
-        self.selected_object_id: Optional[str] = None
+        self.selected_object_id: Optional[str] = None # Primary selection (handles, inspector)
+        self.selected_object_ids = [] # Whole selection, primary first
         self.current_scene_path: Optional[str] = None
         self.project_root = os.getcwd()
+        self.index = SceneIndex() # id -> object and parent -> children of current_scene
+
+        # Change tracking: saves only re-serialise objects changed since they were last written
+        self.scene_writer = SceneWriter()
+        self.keep_undo_history = True # Saves also write the undo history (<scene>.undo), restored on open
+        self.revision = 0 # Bumped on every change
+        self.saved_revision = 0
+        self._generation = 0 # Bumped by load_scene, so a save finishing late is not credited to the next scene
+        self._saved.connect(self._on_saved) # Queued: bookkeeping runs on the UI thread
+        self.undo_stack.listeners.append(self._on_command)
+        # Edits that bypass the undo stack call mark_dirty() for the objects they change
+
+        # Coalesced scene_updated for live previews (see request_update)
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(UPDATE_INTERVAL_MS)
+        self._update_timer.timeout.connect(self._flush_update)
+        self._pending_updates = set()
 
     @classmethod
     def instance(cls):
@@ -34,92 +59,146 @@ class EditorState(QObject):
         return cls._instance
 
     def load_scene(self, scene: Scene):
+        self.undo_stack.clear() # Its commands belong to the previous scene
         self.current_scene = scene
+        self.index.rebuild(scene)
+        self.scene_writer.reset(scene)
+        self._generation += 1
         self.select_object(None)
         self.scene_loaded.emit()
+        self.revision = self.saved_revision = 0
+
+    def mark_dirty(self, obj_id: Optional[str] = None):
+        """Records a change to obj_id (None: scene header or structure only)."""
+        self.revision += 1
+        if obj_id:
+            self.scene_writer.mark_dirty(obj_id)
+            self.object_changed.emit(obj_id)
+
+    def request_update(self, obj_id: Optional[str] = None):
+        """
+        Schedules scene_updated for obj_id's change. Requests made before the timer fires are
+        merged into one emission, so a burst of edits (typing, dragging) repaints once per frame.
+        """
+        if obj_id:
+            self._pending_updates.add(obj_id)
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def _flush_update(self):
+        pending, self._pending_updates = self._pending_updates, set()
+        for obj_id in pending:
+            self.mark_dirty(obj_id)
+        self.scene_updated.emit()
+
+    def is_modified(self) -> bool:
+        return self.revision != self.saved_revision
+
+    def _on_command(self, command):
+        command.update_index(self.index)
+        for obj_id in command.touched_ids():
+            self.mark_dirty(obj_id)
+
+    def save(self, path: str, on_done=None):
+        """
+        Starts an incremental background save of the current scene. Returns a Future (None if no scene).
+        on_done(path, error) is called on the UI thread once the scene counts as saved.
+        """
+        if not self.current_scene:
+            return None
+        generation, revision = self._generation, self.revision
+
+        def finished(saved_path, error):
+            self._saved.emit(on_done, generation, revision, saved_path, error)
+
+        # Cached per command: only steps new since the last save are serialised here
+        history = self.undo_stack.history_lines() if self.keep_undo_history else None
+        return self.scene_writer.save(self.current_scene, path, finished, history)
+
+    def _on_saved(self, on_done, generation, revision, path, error):
+        # Changes made while the write was in flight keep the scene modified; so does opening another scene
+        if not error and generation == self._generation and self.saved_revision < revision:
+            self.saved_revision = revision
+        if on_done:
+            on_done(path, error)
+
+    def restore_history(self, path: str) -> int:
+        """Reloads the undo history saved with path, if the loaded scene is that file. Returns the steps restored."""
+        if not self.keep_undo_history or not self.current_scene:
+            return 0
+        text = self.scene_writer.read_history(path)
+        return self.undo_stack.loads(text, self.current_scene) if text else 0
+
+    def autosave(self) -> int:
+        """Appends unsaved changes to the scene's journal. Returns the number of journal entries written."""
+        if not self.current_scene or not self.current_scene_path or not self.is_modified():
+            return 0
+        return self.scene_writer.append_journal(self.current_scene, self.current_scene_path)
 
     def select_object(self, object_id: Optional[str]):
         self.selected_object_id = object_id
+        self.selected_object_ids = [object_id] if object_id else []
         self.selection_changed.emit(object_id if object_id else "")
 
+    def select_objects(self, object_ids):
+        """Selects several objects. The first one becomes the primary selection."""
+        ids = list(dict.fromkeys(object_ids))
+        self.selected_object_id = ids[0] if ids else None
+        self.selected_object_ids = ids
+        self.selection_changed.emit(ids[0] if ids else "")
+
     def get_selected_object(self) -> Optional[GameObject]:
         if not self.current_scene or not self.selected_object_id:
             return None
-        
-        # Linear search for now, optimization later if needed
-        for obj_dict in self.current_scene.objects:
-            if obj_dict.get("id") == self.selected_object_id:
-                return obj_dict
-        return None
+        return self.index.get(self.selected_object_id)
+
+    def get_selected_objects(self):
+        """Every selected object, primary first. Ids no longer in the scene are skipped."""
+        if not self.current_scene:
+            return []
+        return [obj for obj in map(self.index.get, self.selected_object_ids) if obj is not None]
+
+    def delete_objects(self, object_ids):
+        """Deletes the objects and their descendants as one undo step."""
+        if not self.current_scene or not object_ids:
+            return None
+        cmd = DeleteObjectsCommand(self.current_scene, object_ids, self.index.children)
+        # Deselected first: views then drop the rows without re-selecting after each one
+        doomed = set(cmd.touched_ids())
+        self.select_objects([obj_id for obj_id in self.selected_object_ids if obj_id not in doomed])
+        cmd.redo()
+        self.undo_stack.push(cmd)
+        return cmd
 
     def get_object_by_id(self, obj_id: str) -> Optional[GameObject]:
         if not self.current_scene or not obj_id:
             return None
-        
-        for obj_dict in self.current_scene.objects:
-            if obj_dict.get("id") == obj_id:
-                return obj_dict
-        return None
-    hierarchy_changed = Signal()
+        return self.index.get(obj_id)
 
     def reparent_object(self, child_id: str, new_parent_id: Optional[str]):
-        """Sets the parent of child_id to new_parent_id (or None for root)."""
-        if not self.current_scene: return
-        
-        # 1. Validation
-        if child_id == new_parent_id:
-            print("Cannot parent object to itself.")
-            return
-            
-        if new_parent_id:
-            # Cycle Check: Walk up from new_parent. If we hit child_id, it's a cycle.
-            cwd = new_parent_id
-            while cwd:
-                if cwd == child_id:
-                    print(f"Cycle detected! Cannot make {child_id} parent of {new_parent_id}")
-                    return
-                parent_obj = self.get_object_by_id(cwd)
-                if not parent_obj: break
-                
-                # Get next parent
-                cwd = None
-                if "Transform" in parent_obj.get("components", {}):
-                    cwd = parent_obj["components"]["Transform"].get("parent_id")
-
-        # 2. Update Transform
+        """Sets the parent of child_id to new_parent_id (None: root) as one undo step. Returns the command, or None."""
         child_obj = self.get_object_by_id(child_id)
-        if not child_obj: return
-        
-        if "Transform" not in child_obj.get("components", {}):
-            child_obj["components"]["Transform"] = {}
-            
-        # Record Undo (TODO: Make a dedicated ReparentCommand)
-        old_parent = child_obj["components"]["Transform"].get("parent_id")
-        
-        if new_parent_id:
-            child_obj["components"]["Transform"]["parent_id"] = new_parent_id
-        else:
-            # Remove key or set to None
-            child_obj["components"]["Transform"]["parent_id"] = None
-            
-        print(f"Reparented {child_id} to {new_parent_id}")
-        self.hierarchy_changed.emit()
-        self.scene_loaded.emit() # Refresh all for now
+        if not child_obj or self.index.parents.get(child_id) == new_parent_id:
+            return None
+        # The new parent cannot be the child itself or one of its descendants
+        if new_parent_id and self.is_descendant(new_parent_id, child_id):
+            return None
+        cmd = ReparentCommand(self.current_scene, child_obj, new_parent_id)
+        cmd.redo()
+        self.undo_stack.push(cmd)
+        return cmd
 
     def get_children(self, parent_id: Optional[str]):
-        """Returns list of objects that have parent_id as their parent."""
+        """Returns list of objects that have parent_id as their parent (None: root objects)."""
         if not self.current_scene: return []
-        
-        children = []
-        for obj in self.current_scene.objects:
-            t = obj.get("components", {}).get("Transform", {})
-            p_id = t.get("parent_id")
-            
-            # If parent_id is None, we want root objects (p_id is None or missing)
-            if parent_id is None:
-                if not p_id:
-                    children.append(obj)
-            else:
-                if p_id == parent_id:
-                    children.append(obj)
-        return children
+        return self.index.get_children(parent_id)
+
+    def is_descendant(self, obj_id: str, ancestor_id: str) -> bool:
+        """True if ancestor_id is obj_id or one of its parents (walks the parent index, O(depth))."""
+        seen = set()
+        while obj_id and obj_id not in seen:
+            if obj_id == ancestor_id:
+                return True
+            seen.add(obj_id)
+            obj_id = self.index.parents.get(obj_id)
+        return False
@@ -1,13 +1,301 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem, 
+    QWidget, QVBoxLayout, QLabel, QTreeView, QAbstractItemView,
     QPushButton, QHBoxLayout, QInputDialog, QMessageBox, QMenu
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex, QMimeData, QItemSelectionModel, QItemSelection
+from PySide6.QtGui import QColor
 from editor.editor_state import EditorState
 from shared.scene_schema import GameObject
-from editor.undo_redo import CreateObjectCommand, DeleteObjectCommand, RenameObjectCommand
+from editor.undo_redo import CreateObjectCommand, RenameObjectCommand, ReparentCommand, CompoundCommand
 from dataclasses import asdict
 
+OBJECT_IDS_MIME = "application/x-aspis-object-ids"
+# Combined once: the view asks for the flags of every expanded row when it lays out the tree
+EXPAND_ALL_LIMIT = 500 # Scenes up to this many objects open fully expanded
+ITEM_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled | Qt.ItemIsDropEnabled
+
+class _Node:
+    """One row of the hierarchy. children stays None until the view first asks for them."""
+    __slots__ = ("obj_id", "parent", "children", "row", "stale", "label")
+
+    def __init__(self, obj_id, parent):
+        self.obj_id = obj_id
+        self.parent = parent
+        self.children = None
+        self.row = 0
+        self.stale = None # First child row whose .row may be out of date (None: all current)
+        self.label = None # (name, active) last shown
+
+class HierarchyModel(QAbstractItemModel):
+    """
+    Tree model over EditorState.index. Rows are created lazily, one level at a time, when
+    the view expands a parent. object_changed is applied as single row inserts, removals,
+    moves and dataChanged, so an edit costs O(siblings) instead of a rebuild; only a new
+    scene resets the model. Children appear in index order (new or reparented objects
+    last); objects whose parent no longer exists are shown at the root.
+    """
+    def __init__(self, state):
+        super().__init__()
+        self.state = state
+        self.scene_index = state.index
+        self.scene = None
+        self.root = _Node(None, None)
+        self.nodes = {} # obj_id -> _Node, for rows created so far
+        state.object_changed.connect(self.on_object_changed)
+
+    def reset(self):
+        self.beginResetModel()
+        self.scene = self.state.current_scene
+        self.root = _Node(None, None)
+        self.nodes = {}
+        self.endResetModel()
+
+    # --- Tree structure ---
+
+    def display_parent(self, obj_id):
+        """Parent row of obj_id: its parent, or None (root) if that does not exist."""
+        parent_id = self.scene_index.parents.get(obj_id)
+        return parent_id if parent_id in self.scene_index.objects else None
+
+    def _populate(self, node):
+        if node.children is not None:
+            return node.children
+        if node.obj_id is None:
+            ids = [obj["id"] for obj in self.scene_index.get_children(None)]
+            # Orphans: children of ids that are not in the scene
+            for parent_id, children in self.scene_index.children.items():
+                if parent_id is not None and parent_id not in self.scene_index.objects:
+                    ids.extend(children)
+        else:
+            ids = [obj["id"] for obj in self.scene_index.get_children(node.obj_id)]
+        node.children = []
+        for obj_id in ids:
+            self._append_node(node, obj_id)
+        return node.children
+
+    def _append_node(self, parent, obj_id):
+        child = _Node(obj_id, parent)
+        child.row = len(parent.children)
+        parent.children.append(child)
+        self.nodes[obj_id] = child
+        return child
+
+    def _row(self, node):
+        """
+        node's row. Removals only mark the rows after them stale; they are renumbered here, up
+        to node, so removing many rows in order (a bulk delete) renumbers each sibling once.
+        """
+        parent = node.parent
+        start = parent.stale
+        if start is not None and node.row >= start:
+            children = parent.children
+            for row in range(start, len(children)):
+                children[row].row = row
+                if children[row] is node:
+                    break
+            parent.stale = row + 1 if row + 1 < len(children) else None
+        return node.row
+
+    def _unlink(self, node):
+        # Takes node out of its parent's rows; the rows after it are renumbered lazily
+        parent = node.parent
+        row = self._row(node)
+        del parent.children[row]
+        if row < len(parent.children):
+            parent.stale = row
+
+    def _forget(self, node):
+        # Drops a removed subtree from the id map
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if self.nodes.get(node.obj_id) is node:
+                del self.nodes[node.obj_id]
+            if node.children:
+                stack.extend(node.children)
+
+    def _index_of(self, node):
+        if node is None or node is self.root:
+            return QModelIndex()
+        return self.createIndex(self._row(node), 0, node)
+
+    def index_for_id(self, obj_id):
+        """Model index of obj_id, creating the rows of its ancestors if needed."""
+        if obj_id not in self.scene_index.objects:
+            return QModelIndex()
+        if obj_id not in self.nodes:
+            path = []
+            cwd = self.display_parent(obj_id)
+            while cwd is not None and cwd not in self.nodes and cwd not in path:
+                path.append(cwd)
+                cwd = self.display_parent(cwd)
+            self._populate(self.nodes[cwd] if cwd is not None else self.root)
+            for ancestor in reversed(path):
+                if ancestor in self.nodes:
+                    self._populate(self.nodes[ancestor])
+            if obj_id not in self.nodes:
+                return QModelIndex()
+        return self._index_of(self.nodes[obj_id])
+
+    def obj_id(self, index):
+        return index.internalPointer().obj_id if index.isValid() else None
+
+    # --- Incremental updates ---
+
+    def on_object_changed(self, obj_id):
+        if self.scene is not self.state.current_scene:
+            return # Reset pending (new scene)
+        obj = self.scene_index.get(obj_id)
+        node = self.nodes.get(obj_id)
+        if obj is None:
+            if node is not None:
+                self._remove(node)
+            # Children left behind move to the root
+            for child_id in self.scene_index.children.get(obj_id, {}):
+                self._place(child_id)
+            return
+
+        self._place(obj_id)
+        node = self.nodes.get(obj_id)
+        if node is not None and node.label != (obj.get("name", "Unnamed"), obj.get("active", True)):
+            index = self._index_of(node)
+            self.dataChanged.emit(index, index)
+        if node is None or node.children is None:
+            # Orphans shown at the root that now have their parent back
+            for child_id in self.scene_index.children.get(obj_id, {}):
+                child = self.nodes.get(child_id)
+                if child is not None and child.parent is self.root:
+                    self._place(child_id)
+
+    def _place(self, obj_id):
+        """Moves (or adds) obj_id's row under its current parent."""
+        parent_id = self.display_parent(obj_id)
+        target = self.root if parent_id is None else self.nodes.get(parent_id)
+        node = self.nodes.get(obj_id)
+        if node is not None and node.parent is target:
+            return
+        if target is None or target.children is None:
+            # Parent's rows not created yet: obj_id shows up once it is expanded
+            if node is not None:
+                self._remove(node)
+            if target is not None:
+                index = self._index_of(target)
+                self.dataChanged.emit(index, index) # Expander may appear
+            return
+        row = len(target.children)
+        if node is None:
+            self.beginInsertRows(self._index_of(target), row, row)
+            self._append_node(target, obj_id)
+            self.endInsertRows()
+            return
+        source = node.parent
+        source_row = self._row(node)
+        self.beginMoveRows(self._index_of(source), source_row, source_row, self._index_of(target), row)
+        self._unlink(node)
+        node.parent = target
+        node.row = len(target.children)
+        target.children.append(node)
+        self.endMoveRows()
+
+    def _remove(self, node):
+        parent = node.parent
+        row = self._row(node)
+        self.beginRemoveRows(self._index_of(parent), row, row)
+        self._unlink(node)
+        self._forget(node)
+        self.endRemoveRows()
+
+    # --- QAbstractItemModel ---
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = parent.internalPointer() if parent.isValid() else self.root
+        children = self._populate(node)
+        if column != 0 or not 0 <= row < len(children):
+            return QModelIndex()
+        return self.createIndex(row, 0, children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0 or self.scene is None:
+            return 0
+        node = parent.internalPointer() if parent.isValid() else self.root
+        return len(self._populate(node))
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return self.scene is not None
+        node = parent.internalPointer()
+        if node.children is not None:
+            return bool(node.children)
+        return bool(self.scene_index.children.get(node.obj_id)) # Without creating the rows
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        obj = self.scene_index.get(node.obj_id)
+        if obj is None:
+            return None
+        name = obj.get("name", "Unnamed")
+        active = obj.get("active", True)
+        node.label = (name, active)
+        if role == Qt.DisplayRole:
+            return name if active else f"[x] {name}"
+        if role == Qt.ForegroundRole and not active:
+            return QColor(Qt.gray)
+        if role == Qt.UserRole:
+            return node.obj_id
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return ITEM_FLAGS
+
+    # --- Drag and drop (reparenting) ---
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [OBJECT_IDS_MIME]
+
+    def mimeData(self, indexes):
+        data = QMimeData()
+        ids = [self.obj_id(index) for index in indexes if index.isValid()]
+        data.setData(OBJECT_IDS_MIME, "\n".join(ids).encode("utf-8"))
+        return data
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if not data.hasFormat(OBJECT_IDS_MIME):
+            return False
+        # Dropped ON an item (row -1) -> becomes its child;
+        # dropped ABOVE/BELOW an item -> becomes a sibling, i.e. a child of `parent` too
+        new_parent_id = self.obj_id(parent)
+        cmds = []
+        for obj_id in bytes(data.data(OBJECT_IDS_MIME)).decode("utf-8").split("\n"):
+            obj = self.scene_index.get(obj_id)
+            if obj is None or self.scene_index.parents.get(obj_id) == new_parent_id:
+                continue
+            if new_parent_id and self.state.is_descendant(new_parent_id, obj_id):
+                print(f"Cycle detected! Cannot make {obj_id} parent of {new_parent_id}")
+                continue
+            cmd = ReparentCommand(self.state.current_scene, obj, new_parent_id)
+            cmd.redo()
+            cmds.append(cmd)
+        if cmds:
+            # Several dragged rows are undone as one step
+            self.state.undo_stack.push(cmds[0] if len(cmds) == 1 else CompoundCommand(cmds))
+        # False: the rows were moved by the model itself, the view must not remove the dragged rows
+        return False
+
 class HierarchyPanel(QWidget):
     def __init__(self):
         super().__init__()
@@ -32,149 +320,94 @@ class HierarchyPanel(QWidget):
         toolbar_widget.setLayout(toolbar)
         layout.addWidget(toolbar_widget)
 
+        # Connect signals
+        self.state = EditorState.instance()
+        self.model = HierarchyModel(self.state)
+
         # Tree
-        self.tree = QTreeWidget()
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
         self.tree.setHeaderHidden(True)
         self.tree.setIndentation(12)
+        self.tree.setUniformRowHeights(True) # Row layout without measuring every item (large scenes)
+        self.tree.setSelectionMode(QAbstractItemView.ExtendedSelection) # Ctrl/Shift+Click: multi-selection
         self.tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.show_context_menu)
-        self.tree.currentItemChanged.connect(self.on_selection_changed)
+        self.tree.selectionModel().selectionChanged.connect(self.on_selection_changed)
         layout.addWidget(self.tree)
 
-        # Connect signals
-        self.state = EditorState.instance()
         self.state.scene_loaded.connect(self.refresh)
-
-        self.tree.clear()
+        self.state.selection_changed.connect(self.on_state_selection_changed)
         self.refresh()
 
         # Enable Drag & Drop
         self.tree.setDragEnabled(True)
         self.tree.setAcceptDrops(True)
-        self.tree.setDragDropMode(QTreeWidget.InternalMove)
+        self.tree.setDragDropMode(QAbstractItemView.InternalMove)
         self.tree.setDefaultDropAction(Qt.MoveAction)
 
     def refresh(self):
-        self.tree.clear()
-        scene = self.state.current_scene
-        if not scene:
-            return
-
-        # 1. Create all items first
-        item_map = {} # id -> QTreeWidgetItem
-        orphans = []
-        
-        for obj in scene.objects:
-            item = QTreeWidgetItem()
-            name = obj.get("name", "Unnamed")
-            active = obj.get("active", True)
-            obj_id = obj.get("id")
-            
-            if active:
-                item.setText(0, name)
-            else:
-                item.setText(0, f"[x] {name}")
-                item.setForeground(0, Qt.gray)
-            
-            item.setData(0, Qt.UserRole, obj_id)
-            item_map[obj_id] = item
-            
-        # 2. Build Tree Structure
-        for obj in scene.objects:
-            obj_id = obj.get("id")
-            # Get Parent from Transform
-            parent_id = None
-            if "Transform" in obj.get("components", {}):
-                parent_id = obj["components"]["Transform"].get("parent_id")
-
-            item = item_map[obj_id]
-            
-            if parent_id and parent_id in item_map:
-                # Attach to parent
-                parent_item = item_map[parent_id]
-                parent_item.addChild(item)
-            else:
-                # Root item (or orphan)
-                self.tree.addTopLevelItem(item)
-                
-        self.tree.expandAll()
-
-    def dropEvent(self, event):
-        item = self.tree.currentItem() # The item being dragged
-        if not item: 
-            event.ignore()
+        """Resets the tree for a new scene. Edits to the current scene arrive through the model."""
+        if self.model.scene is self.state.current_scene:
             return
-            
-        target_item = self.tree.itemAt(event.position().toPoint())
-        drop_indicator = self.tree.dropIndicatorPosition()
-        
-        obj_id = item.data(0, Qt.UserRole)
-        # Find object data
-        obj = self.state.get_object_by_id(obj_id)
-        if not obj: return
-        
-        new_parent_id = None
-        
-        if target_item:
-            # Dropped ON an item -> becomes child
-            if drop_indicator == QTreeWidget.OnItem:
-                new_parent_id = target_item.data(0, Qt.UserRole)
-                if new_parent_id == obj_id:
-                    event.ignore()
-                    return
-            
-            # Dropped ABOVE/BELOW -> becomes sibling (same parent as target)
-            elif drop_indicator in (QTreeWidget.AboveItem, QTreeWidget.BelowItem):
-                target_obj_id = target_item.data(0, Qt.UserRole)
-                target_obj = self.state.get_object_by_id(target_obj_id)
-                if target_obj and "Transform" in target_obj.get("components", {}):
-                    new_parent_id = target_obj["components"]["Transform"].get("parent_id")
-        
-        # Execute Command
-        from editor.undo_redo import ReparentCommand
-        cmd = ReparentCommand(self.state.current_scene, obj, new_parent_id)
-        self.state.undo_stack.push(cmd)
-        cmd.redo()
-        
-        # Refresh UI
-        self.refresh()
-        self.state.selection_changed.emit(obj_id) # keep selection
-        event.accept()
+        self.model.reset()
+        if self.state.current_scene and len(self.state.current_scene.objects) <= EXPAND_ALL_LIMIT:
+            self.tree.expandAll()
+        # Larger scenes start collapsed: every expanded row is laid out again after each structural change
+        self.on_state_selection_changed(self.state.selected_object_id or "")
 
-    # Override standard drag events to allow drop
-    def dragEnterEvent(self, event):
-        event.accept()
-        
-    def dragMoveEvent(self, event):
-        event.accept()
-        
     def refresh_tree(self):
         self.refresh()
     
-    def on_selection_changed(self, current, previous):
-        if current:
-            obj_id = current.data(0, Qt.UserRole)
-            if self.state.selected_object_id != obj_id:
-                self.state.select_object(obj_id)
-        else:
-            self.state.select_object(None)
+    def on_selection_changed(self, selected, deselected):
+        selection = self.tree.selectionModel()
+        # selectedIndexes(): one column, so the same rows without selectedRows()' per-row parent() lookups
+        ids = [self.model.obj_id(index) for index in selection.selectedIndexes()]
+        current = self.model.obj_id(selection.currentIndex())
+        if current in ids:
+            ids.remove(current)
+            ids.insert(0, current) # The clicked row leads (handles, inspector)
+        if ids != self.state.selected_object_ids:
+            self.state.select_objects(ids)
+
+    def on_state_selection_changed(self, obj_id):
+        selection = self.tree.selectionModel()
+        selected = [self.model.obj_id(index) for index in selection.selectedIndexes()]
+        current = self.model.obj_id(self.tree.currentIndex())
+        ids = self.state.selected_object_ids
+        if current == (obj_id or None) and sorted(selected) == sorted(ids):
+            return
+
+        index = self.model.index_for_id(obj_id) if obj_id else QModelIndex()
+        rows = QItemSelection()
+        for other_id in ids:
+            other = index if other_id == obj_id else self.model.index_for_id(other_id)
+            if other.isValid():
+                rows.select(other, other)
+        selection.blockSignals(True)
+        selection.setCurrentIndex(index, QItemSelectionModel.NoUpdate)
+        selection.select(rows, QItemSelectionModel.ClearAndSelect)
+        selection.blockSignals(False)
+        self.tree.viewport().update()
+        if index.isValid():
+            self.tree.scrollTo(index) # Expands its parents
 
     def show_context_menu(self, position):
-        item = self.tree.itemAt(position)
+        obj_id = self.model.obj_id(self.tree.indexAt(position))
         
         menu = QMenu(self)
         
-        if item:
+        if obj_id:
             rename_action = menu.addAction("Rename")
-            rename_action.triggered.connect(lambda: self.rename_object(item))
+            rename_action.triggered.connect(lambda: self.rename_object(obj_id))
             
             delete_action = menu.addAction("Delete")
-            delete_action.triggered.connect(lambda: self.delete_object(item))
+            delete_action.triggered.connect(lambda: self.delete_object(obj_id))
             
             menu.addSeparator()
             
             save_prefab_action = menu.addAction("Save as Prefab")
-            save_prefab_action.triggered.connect(lambda: self.save_prefab(item))
+            save_prefab_action.triggered.connect(lambda: self.save_prefab(obj_id))
         else:
             add_menu = menu.addMenu("Add Object")
             self.populate_add_menu(add_menu)
@@ -195,8 +428,7 @@ class HierarchyPanel(QWidget):
         menu.addAction("Text", lambda: self.add_new_object("Text", {"TextRenderer": {"text": "New Text", "font_size": 24, "color": [255, 255, 255]}}))
         menu.addAction("Background", lambda: self.add_new_object("Background", {"Background": {}}))
 
-    def rename_object(self, item):
-        obj_id = item.data(0, Qt.UserRole)
+    def rename_object(self, obj_id):
         obj = self.state.get_object_by_id(obj_id)
         if not obj:
             return
@@ -206,22 +438,18 @@ class HierarchyPanel(QWidget):
         
         if ok and new_name:
             cmd = RenameObjectCommand(obj, new_name)
-            self.state.undo_stack.push(cmd)
             cmd.redo()
+            self.state.undo_stack.push(cmd)
             self.window().refresh_ui()
 
-    def delete_object(self, item):
-        obj_id = item.data(0, Qt.UserRole)
-        scene = self.state.current_scene
-        
-        # Command now handles finding indices and recursion
-        cmd = DeleteObjectCommand(scene, obj_id)
-        self.state.undo_stack.push(cmd)
-        cmd.redo()
+    def delete_object(self, obj_id):
+        # Deleting one of several selected objects deletes the whole selection
+        ids = self.state.selected_object_ids if obj_id in self.state.selected_object_ids else [obj_id]
+        self.state.delete_objects(ids)
         self.window().refresh_ui()
 
-    def save_prefab(self, item):
-        obj_id = item.data(0, Qt.UserRole)
+
+    def save_prefab(self, obj_id):
         obj = self.state.get_object_by_id(obj_id)
         if not obj:
             return
@@ -244,11 +472,7 @@ class HierarchyPanel(QWidget):
             try:
                 with open(path, 'w') as f:
                     json.dump(obj, f, indent=2)
-                print(f"Saved prefab to {path}")
-                
-                # Notify asset browser to refresh
-                self.state.scene_loaded.emit() 
-                
+                print(f"Saved prefab to {path}") # The asset browser's file model picks it up; the scene is unchanged
             except Exception as e:
                 print(f"Error saving prefab: {e}")
                 QMessageBox.critical(self, "Error", f"Failed to save prefab:\n{e}")
@@ -270,64 +494,6 @@ class HierarchyPanel(QWidget):
                 "BoxCollider": {"size": [50.0, 50.0], "offset": [0.0, 0.0], "is_trigger": False},
                 "Background": {"sprite_path": "", "color": [255, 255, 255, 255], "loop_x": False, "loop_y": False, "scroll_speed": [0.0, 0.0], "fixed": True, "layer": -100}
             }
-        obj_id = item.data(0, Qt.UserRole)
-        scene = self.state.current_scene
-        
-        # Command now handles finding indices and recursion
-        cmd = DeleteObjectCommand(scene, obj_id)
-        self.state.undo_stack.push(cmd)
-        cmd.redo()
-        self.window().refresh_ui()
-
-    def save_prefab(self, item):
-        obj_id = item.data(0, Qt.UserRole)
-        obj = self.state.get_object_by_id(obj_id)
-        if not obj:
-            return
-            
-        from PySide6.QtWidgets import QFileDialog, QMessageBox
-        import json
-        import os
-        
-        # Default filename = object name
-        safe_name = "".join(c for c in obj.get("name", "prefab") if c.isalnum() or c in (' ', '_', '-')).strip()
-        
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Save Prefab",
-            os.path.join(self.state.project_root, "assets", f"{safe_name}.prefab"),
-            "Prefab Files (*.prefab)"
-        )
-        
-        if path:
-            print(f"Attempting to save prefab to: {path}")
-            try:
-                with open(path, 'w') as f:
-                    json.dump(obj, f, indent=2)
-                print(f"Saved prefab to {path}")
-                
-                # Notify asset browser to refresh
-                self.state.scene_loaded.emit() 
-                
-            except Exception as e:
-                print(f"Error saving prefab: {e}")
-                QMessageBox.critical(self, "Error", f"Failed to save prefab:\n{e}")
-
-    def add_new_object(self, name="New Object", components=None):
-        scene = self.state.current_scene
-        if not scene:
-            return
-        
-        new_obj = GameObject.create(name)
-        if components:
-            from shared.component_defs import Camera, LightSource, CircleCollider, SpriteRenderer, BoxCollider, COMPONENT_MAP
-            # Helper to get defaults
-            defaults = {
-                "Camera": {"width": 1280, "height": 720, "zoom": 1.0, "is_main": False},
-                "LightSource": {"color": [255, 255, 255, 255], "intensity": 1.0, "radius": 200.0, "type": "point"},
-                "CircleCollider": {"radius": 25.0, "offset": [0.0, 0.0], "is_trigger": False},
-                "SpriteRenderer": {"sprite_path": "", "layer": 0, "visible": True, "tint": [255, 255, 255, 255]},
-                "BoxCollider": {"size": [50.0, 50.0], "offset": [0.0, 0.0], "is_trigger": False}
-            }
             
             for comp_name, comp_data in components.items():
                 # Merge defaults
@@ -352,13 +518,12 @@ class HierarchyPanel(QWidget):
         
         obj_dict = asdict(new_obj)
         cmd = CreateObjectCommand(scene, obj_dict)
-        self.state.undo_stack.push(cmd)
         cmd.redo()
+        self.state.undo_stack.push(cmd)
         
         if hasattr(main_window, "refresh_ui"):
              main_window.refresh_ui()
-        else:
-             self.refresh()
         
         # Select the new object
         self.state.select_object(new_obj.id)
+
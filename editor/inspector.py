@@ -1,12 +1,16 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QScrollArea, QFrame, 
-    QFormLayout, QLineEdit, QHBoxLayout, QPushButton, QFileDialog, QCheckBox, QMenu
+    QFormLayout, QLineEdit, QHBoxLayout, QPushButton, QFileDialog, QCheckBox, QMenu, QApplication
 )
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QDoubleValidator
 from editor.editor_state import EditorState
-from editor.script_parser import ScriptParser
-from editor.undo_redo import AddComponentCommand, ChangeComponentCommand, RemoveComponentCommand
+from editor.script_metadata import ScriptMetadataService
+from editor.undo_redo import (AddComponentCommand, ChangeComponentCommand, RemoveComponentCommand, CompoundCommand,
+                              SetScriptPropertyCommand)
+from shared.atlas import load_index, find_region
+import copy
+import math
 import os
 
 class FloatField(QLineEdit):
@@ -33,6 +37,7 @@ class FloatField(QLineEdit):
             }
         """)
         self.setText(f"{value:.2f}")
+        self.setPlaceholderText("—") # Shown while empty: mixed values (see set_mixed)
         self.textChanged.connect(self._on_text_changed)
         self.editingFinished.connect(self._on_editing_finished)
         self._last_committed_value = value
@@ -70,12 +75,11 @@ class FloatField(QLineEdit):
             if self.min_val is not None: val = max(self.min_val, val)
             if self.max_val is not None: val = min(self.max_val, val)
             
-            # Use set_value to format text
+            # Use set_value to format text (it also moves the baseline, so read it first)
+            old_val = self._last_committed_value
             self.set_value(val)
                 
-            if val != self._last_committed_value:
-                old_val = self._last_committed_value
-                self._last_committed_value = val
+            if val != old_val:
                 self.value_committed.emit(val, old_val)
         except ValueError:
             pass
@@ -86,6 +90,13 @@ class FloatField(QLineEdit):
         self._last_committed_value = v
         self.blockSignals(False)
 
+    def set_mixed(self):
+        """Shows no value: the selected objects differ. Typing one sets it on all of them."""
+        self.blockSignals(True)
+        self.setText("")
+        self._last_committed_value = math.nan
+        self.blockSignals(False)
+
 
 class Vec2Field(QWidget):
     """X/Y input pair."""
@@ -128,10 +139,16 @@ class Vec2Field(QWidget):
         self.x_field.value_committed.connect(lambda n, o: self._emit_commit())
         self.y_field.value_committed.connect(lambda n, o: self._emit_commit())
     
+    @staticmethod
+    def _axis(field):
+        # An empty (mixed) axis is NaN: each object keeps its own value (see merge_value)
+        text = field.text()
+        return float(text) if text else math.nan
+
     def _emit_edit(self):
         try:
-            x = float(self.x_field.text())
-            y = float(self.y_field.text())
+            x = self._axis(self.x_field)
+            y = self._axis(self.y_field)
             self.value_edited.emit(x, y)
         except ValueError:
             pass
@@ -147,8 +164,8 @@ class Vec2Field(QWidget):
     def _emit_commit(self):
         if self.block_updates: return
         try:
-            x = float(self.x_field.text())
-            y = float(self.y_field.text())
+            x = self._axis(self.x_field)
+            y = self._axis(self.y_field)
             
             if x != self.last_x or y != self.last_y:
                 old_x, old_y = self.last_x, self.last_y
@@ -166,6 +183,15 @@ class Vec2Field(QWidget):
         self.last_y = y
         self.block_updates = False
 
+    def set_mixed(self, mixed_x, mixed_y):
+        """Blanks the axes whose values differ across the selected objects."""
+        if mixed_x:
+            self.x_field.set_mixed()
+            self.last_x = math.nan
+        if mixed_y:
+            self.y_field.set_mixed()
+            self.last_y = math.nan
+
 
 class ColorField(QPushButton):
     """Button that shows color and opens picker."""
@@ -198,12 +224,131 @@ class ColorField(QPushButton):
 
     def set_value(self, c):
         self.color = tuple(c)
+        self.setText("")
         self._update_style()
 
+    def set_mixed(self):
+        self.color = (128, 128, 128, 255) # Picker starting point
+        self.setText("—")
+        self.setStyleSheet("background-color: #252525; color: #888888; border: 1px dashed #555;")
+
 
 from editor.undo_redo import ChangeComponentCommand, AddComponentCommand, RemoveComponentCommand
 
+LABEL_STYLE = "color: #666666; font-size: 10px;"
+
+def set_field_value(widget, value, others=()):
+    """
+    Loads value into an editor field without emitting its edit signals. others are the values
+    of the rest of a multi-selection; if any differs the field shows a mixed state instead.
+    """
+    mixed = any(other != value for other in others)
+    try:
+        if isinstance(widget, Vec2Field):
+            if isinstance(value, (list, tuple)) and len(value) >= 2:
+                widget.set_value(float(value[0]), float(value[1]))
+                if mixed:
+                    def differs(axis):
+                        return any(not isinstance(o, (list, tuple)) or len(o) < 2 or o[axis] != value[axis] for o in others)
+                    widget.set_mixed(differs(0), differs(1))
+        elif isinstance(widget, FloatField):
+            if mixed:
+                widget.set_mixed()
+            else:
+                widget.set_value(float(value))
+        elif isinstance(widget, ColorField):
+            if mixed:
+                widget.set_mixed()
+            else:
+                widget.set_value(value)
+        elif isinstance(widget, QCheckBox):
+            widget.blockSignals(True)
+            if mixed:
+                widget.setCheckState(Qt.PartiallyChecked) # A click then checks it for all
+            else:
+                widget.setTristate(False)
+                widget.setChecked(bool(value))
+            widget.blockSignals(False)
+        elif isinstance(widget, QLineEdit):
+            if not hasattr(widget, "base_placeholder"):
+                widget.base_placeholder = widget.placeholderText()
+            widget.blockSignals(True)
+            widget.setText("" if mixed else str(value or ""))
+            widget.setPlaceholderText("—" if mixed else widget.base_placeholder)
+            widget.blockSignals(False)
+        elif isinstance(widget, QLabel): # Asset paths
+            if mixed:
+                widget.setText("(mixed)")
+            else:
+                widget.setText(os.path.basename(value) if value else "(none)")
+    except (TypeError, ValueError):
+        pass
+
+def merge_value(current, value):
+    """An edit from a field in mixed state: NaN entries (blank axes) keep the object's own value."""
+    if isinstance(value, float) and math.isnan(value):
+        return current
+    if isinstance(value, list) and any(isinstance(v, float) and math.isnan(v) for v in value):
+        if not isinstance(current, (list, tuple)) or len(current) != len(value):
+            current = [0.0] * len(value)
+        return [c if isinstance(v, float) and math.isnan(v) else v for c, v in zip(current, value)]
+    return value
+
+class ComponentSection(QWidget):
+    """
+    Editor for one component type. Built once and kept in InspectorPanel's pool; bind()
+    points it at another object and loads that object's values into the same widgets.
+    Edit handlers read self.obj, so they act on whichever object is bound (and, through
+    InspectorPanel.targets(), on the rest of a multi-selection).
+    """
+    def __init__(self, comp_name):
+        super().__init__()
+        self.comp_name = comp_name
+        self.obj = None
+        self.fields = [] # (widget, getter(component data) -> value)
+        self.layout_ = QVBoxLayout(self)
+        self.layout_.setContentsMargins(0, 0, 0, 0)
+        self.layout_.setSpacing(4)
+
+    def add(self, widget):
+        self.layout_.addWidget(widget)
+
+    def field(self, widget, key=None, default=None, get=None):
+        """Registers widget to show data[key] (or get(data)) of the bound component."""
+        self.fields.append((widget, get or (lambda data: data.get(key, default))))
+        return widget
+
+    def bind(self, obj, skip_focused=False, others=()):
+        """Loads obj's values; with others (rest of a multi-selection), fields that differ show as mixed."""
+        self.obj = obj
+        data = obj.get("components", {}).get(self.comp_name) or {}
+        other_data = [o.get("components", {}).get(self.comp_name) or {} for o in others]
+        focus = QApplication.focusWidget()
+        typing = isinstance(focus, QLineEdit)
+        for widget, get in self.fields:
+            # Skip update if user is currently typing in this widget
+            if skip_focused and typing and (focus is widget or widget.isAncestorOf(focus)):
+                continue
+            set_field_value(widget, get(data), [get(d) for d in other_data])
+
 class InspectorPanel(QWidget):
+    # Component name -> builder method; components without one are not shown
+    BUILDERS = {
+        "Transform": "add_transform_editor",
+        "SpriteRenderer": "add_sprite_editor",
+        "Script": "add_script_editor",
+        "RigidBody": "add_rigidbody_editor",
+        "BoxCollider": "add_box_collider_editor",
+        "CircleCollider": "add_circle_collider_editor",
+        "Camera": "add_camera_editor",
+        "LightSource": "add_light_source_editor",
+        "Background": "add_background_editor",
+    }
+    ALL_COMPONENTS = [
+        "Transform", "SpriteRenderer", "Script", "RigidBody",
+        "BoxCollider", "CircleCollider", "Camera", "LightSource", "Background", "TextRenderer"
+    ]
+
     def __init__(self):
         super().__init__()
         self.setMinimumWidth(220)
@@ -224,79 +369,182 @@ class InspectorPanel(QWidget):
         
         scroll.setWidget(self.container)
         main_layout.addWidget(scroll)
-        
-        self.show_placeholder("No selection")
 
-        self.active_editors = {} # (comp_name, key) -> widget
+        # Fixed widgets, reused for every object
+        self.placeholder = QLabel("No selection")
+        self.placeholder.setStyleSheet("color: #555555; padding: 10px;")
+        self.placeholder.setAlignment(Qt.AlignCenter)
+        self.content_layout.addWidget(self.placeholder)
+
+        # Object name
+        self.name_label = QLabel()
+        self.name_label.setStyleSheet("""
+            font-size: 12px;
+            font-weight: bold;
+            color: #cccccc;
+            padding: 4px;
+            background: #252525;
+        """)
+        self.content_layout.addWidget(self.name_label)
+
+        # ID
+        self.id_label = QLabel()
+        self.id_label.setStyleSheet("color: #444444; font-size: 9px; padding-left: 4px;")
+        self.content_layout.addWidget(self.id_label)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.setContentsMargins(4, 8, 4, 4)
+        add_btn = QPushButton("+ Add Component")
+        add_btn.setFixedHeight(22)
+        add_btn.clicked.connect(lambda: self.show_add_menu(self.obj, self.available, add_btn))
+        btn_layout.addWidget(add_btn)
+        btn_layout.addStretch()
+        self.add_widget = QWidget()
+        self.add_widget.setLayout(btn_layout)
+        self.content_layout.addWidget(self.add_widget)
+
+        self.obj = None # Object shown (primary of a multi-selection)
+        self.others = [] # Rest of a multi-selection
+        self.preview_originals = {} # (id, component, key) -> value before the live preview began
+        self.available = [] # Components it can still add
+        self.sections = {} # Pool: section_key() -> ComponentSection
+        self.shown = [] # Sections in the layout, in component order
+        self.shown_keys = [] # Their pool keys
+        self.show_object(None)
+
         self.state = EditorState.instance()
+        self.atlas = load_index(self.state.project_root) # None if the project has no atlas
+        self.scripts = ScriptMetadataService(self) # Script properties, parsed off the UI thread
+        self.scripts.metadata_changed.connect(self.on_script_changed)
         self.state.selection_changed.connect(self.on_selection_changed)
         self.state.scene_loaded.connect(self.refresh_values)
         self.state.scene_updated.connect(self.refresh_values)
 
     def on_selection_changed(self, obj_id):
-        self.clear_content() # Clears active_editors too
+        focus = QApplication.focusWidget()
+        if focus is not None and self.isAncestorOf(focus):
+            focus.clearFocus() # Commits a pending edit to the object it was made on
         
+        self.preview_originals.clear()
         if not obj_id:
-            self.show_placeholder("No selection")
+            self.show_object(None, "No selection")
             return
         
-        obj = self.state.get_selected_object()
-        if not obj:
-            self.show_placeholder("Object not found")
+        objs = self.state.get_selected_objects()
+        if not objs:
+            self.show_object(None, "Object not found")
             return
         
-        self.build_inspector(obj)
-
-    def clear_content(self):
-        while self.content_layout.count():
-            item = self.content_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        self.active_editors.clear()
-
-    def show_placeholder(self, text):
-        placeholder = QLabel(text)
-        placeholder.setStyleSheet("color: #555555; padding: 10px;")
-        placeholder.setAlignment(Qt.AlignCenter)
-        self.content_layout.addWidget(placeholder)
+        self.show_object(objs[0], others=objs[1:])
+
+    def section_key(self, comp_name, obj):
+        """Pool key. Sections whose layout depends on the data get one entry per layout."""
+        comps = obj.get("components", {})
+        if comp_name == "Script":
+            # One field per script property: a section per script and property set
+            path = (comps.get("Script") or {}).get("script_path", "")
+            meta = self.scripts.get(self.script_file(path)) if path else None
+            return (comp_name, path, tuple(meta.fields()) if meta else ())
+        if comp_name == "BoxCollider":
+            return (comp_name, "SpriteRenderer" in comps) # "Snap to Visual Size" button
+        return (comp_name,)
+
+    def section_keys(self, obj, others=()):
+        """Sections to show for obj; with others, only those every selected object shares."""
+        keys = [self.section_key(name, obj) for name in obj.get("components", {}) if name in self.BUILDERS]
+        for other in others:
+            other_keys = set(self.section_keys(other))
+            keys = [key for key in keys if key in other_keys]
+        return keys
+
+    def script_file(self, path):
+        return os.path.normpath(os.path.join(self.state.project_root, path))
+
+    def on_script_changed(self, path):
+        """A script's properties were (re)parsed: rebuild its sections, dropping the outdated ones."""
+        self.refresh_values()
+        for key, section in list(self.sections.items()):
+            if key[0] == "Script" and key[1] and section not in self.shown and self.script_file(key[1]) == path:
+                del self.sections[key]
+                section.deleteLater()
+
+    def targets(self, obj, comp_name):
+        """Objects an edit made through obj's section applies to: the whole selection if obj leads it."""
+        if obj is not self.obj or not self.others:
+            return [obj]
+        return [o for o in [obj] + self.others if comp_name in o.get("components", {})]
+
+    def show_object(self, obj, placeholder="No selection", others=()):
+        """
+        Shows obj with pooled sections: widgets are only created for layouts not seen before.
+        others (rest of a multi-selection) narrow it to shared components, with mixed values blank.
+        """
+        self.container.setUpdatesEnabled(False)
+        for section in self.shown:
+            self.content_layout.removeWidget(section)
+            section.hide()
+        self.shown = []
+        self.shown_keys = []
+        self.obj = obj
+        self.others = list(others)
+
+        self.placeholder.setText(placeholder)
+        self.placeholder.setVisible(obj is None)
+        for widget in (self.name_label, self.id_label, self.add_widget):
+            widget.setVisible(obj is not None)
+
+        if obj is not None:
+            self.show_name(obj)
+
+            for key in self.section_keys(obj, self.others):
+                section = self.sections.get(key)
+                if section is None:
+                    section = ComponentSection(key[0])
+                    section.obj = obj
+                    getattr(self, self.BUILDERS[key[0]])(section)
+                    self.sections[key] = section
+                section.bind(obj, others=self.others)
+                self.content_layout.insertWidget(self.content_layout.indexOf(self.add_widget), section)
+                section.show()
+                self.shown.append(section)
+                self.shown_keys.append(key)
+
+            # Determine available components (adding to a multi-selection is not supported)
+            components = obj.get("components", {})
+            self.available = [c for c in self.ALL_COMPONENTS if c not in components] if not self.others else []
+            self.add_widget.setVisible(bool(self.available))
+        self.container.setUpdatesEnabled(True)
+
+    def show_name(self, obj):
+        if self.others:
+            self.name_label.setText(f"{len(self.others) + 1} objects")
+            self.id_label.setText("Shared components") # Blank fields: values differ
+        else:
+            self.name_label.setText(obj.get("name", "Unnamed"))
+            self.id_label.setText(f"ID: {obj.get('id', 'N/A')[:8]}...")
 
     def refresh_values(self):
-        """Updates active editors from current object state without rebuilding UI."""
+        """Updates the shown sections from current object state without rebuilding UI."""
         if not self.state.selected_object_id:
             return
             
-        obj = self.state.get_selected_object()
-        if not obj:
+        objs = self.state.get_selected_objects()
+        if not objs:
             return
-            
-        # Iterate over active editors and update their values
-        for (comp_name, key), widget in self.active_editors.items():
-            # Skip update if user is currently typing in this widget
-            if widget.hasFocus():
-                continue
-                
-            # For Vec2Field, check its children focus
-            if isinstance(widget, Vec2Field):
-                 if widget.x_field.hasFocus() or widget.y_field.hasFocus():
-                     continue
-            
-            if comp_name in obj.get("components", {}):
-                data = obj["components"][comp_name]
-                if key in data:
-                    val = data[key]
-                    
-                    # Update widget safely
-                    if isinstance(widget, Vec2Field):
-                        if isinstance(val, (list, tuple)) and len(val) >= 2:
-                            widget.set_value(val[0], val[1])
-                    elif isinstance(widget, FloatField):
-                        widget.set_value(float(val))
-                    elif isinstance(widget, ColorField):
-                        widget.set_value(val)
-                    # Add more types as needed
-
-    def create_header(self, text, obj, comp_name):
+        obj, others = objs[0], objs[1:]
+
+        if (obj is not self.obj or len(others) != len(self.others) or any(a is not b for a, b in zip(others, self.others))
+                or self.section_keys(obj, others) != self.shown_keys):
+            # Another copy of the object (undo), another selection, components added/removed or a script's properties changed
+            self.show_object(obj, others=others)
+            return
+        self.show_name(obj)
+        for section in self.shown:
+            section.bind(obj, skip_focused=True, others=others)
+
+    def create_header(self, text, section):
         """Creates a header with a remove button (unless it's Transform)."""
+        comp_name = section.comp_name
         container = QWidget()
         layout = QHBoxLayout(container)
         layout.setContentsMargins(0, 6, 0, 2)
@@ -314,7 +562,7 @@ class InspectorPanel(QWidget):
                 QPushButton { background: transparent; color: #666; border: none; font-weight: bold; }
                 QPushButton:hover { color: #ff4444; }
             """)
-            remove_btn.clicked.connect(lambda: self.remove_component(obj, comp_name))
+            remove_btn.clicked.connect(lambda: self.remove_component(section.obj, comp_name))
             layout.addWidget(remove_btn)
 
         # Separator line
@@ -335,7 +583,7 @@ class InspectorPanel(QWidget):
         
         # Right click context menu
         w.setContextMenuPolicy(Qt.CustomContextMenu)
-        w.customContextMenuRequested.connect(lambda pos: self.show_header_context_menu(pos, w, obj, comp_name))
+        w.customContextMenuRequested.connect(lambda pos: self.show_header_context_menu(pos, w, section.obj, comp_name))
         
         return w
 
@@ -351,213 +599,91 @@ class InspectorPanel(QWidget):
             menu.exec(widget.mapToGlobal(pos))
 
     def remove_component(self, obj, comp_name):
-        cmd = RemoveComponentCommand(obj, comp_name)
-        self.state.undo_stack.push(cmd)
+        cmds = [RemoveComponentCommand(target, comp_name) for target in self.targets(obj, comp_name)]
+        cmd = cmds[0] if len(cmds) == 1 else CompoundCommand(cmds)
         cmd.redo()
+        self.state.undo_stack.push(cmd)
         # Refresh is handled by MainWindow loop usually, but here we force inspector refresh
-        self.state.select_object(obj.get("id"))
-
-
-    def build_inspector(self, obj):
-        # Object name
-        name_label = QLabel(obj.get("name", "Unnamed"))
-        name_label.setStyleSheet("""
-            font-size: 12px;
-            font-weight: bold;
-            color: #cccccc;
-            padding: 4px;
-            background: #252525;
-        """)
-        self.content_layout.addWidget(name_label)
-
-        # ID
-        id_label = QLabel(f"ID: {obj.get('id', 'N/A')[:8]}...")
-        id_label.setStyleSheet("color: #444444; font-size: 9px; padding-left: 4px;")
-        self.content_layout.addWidget(id_label)
-
-        # Components
-        components = obj.get("components", {})
-        
-        for comp_name, comp_data in components.items():
-            if comp_name == "Transform":
-                self.add_transform_editor(comp_data, obj)
-            elif comp_name == "SpriteRenderer":
-                self.add_sprite_editor(comp_data, obj)
-            elif comp_name == "Script":
-                self.add_script_editor(comp_data, obj)
-            elif comp_name == "RigidBody":
-                self.add_rigidbody_editor(comp_data, obj)
-            elif comp_name == "BoxCollider":
-                self.add_box_collider_editor(comp_data, obj)
-            elif comp_name == "CircleCollider":
-                self.add_circle_collider_editor(comp_data, obj)
-            elif comp_name == "Camera":
-                self.add_camera_editor(comp_data, obj)
-            elif comp_name == "LightSource":
-                self.add_light_source_editor(comp_data, obj)
-            elif comp_name == "Background":
-                self.add_background_editor(comp_data, obj)
-
-        # Determine available components
-        available = []
-        all_components = [
-            "Transform", "SpriteRenderer", "Script", "RigidBody", 
-            "BoxCollider", "CircleCollider", "Camera", "LightSource", "Background", "TextRenderer"
-        ]
-        
-        for c in all_components:
-            if c not in components:
-                available.append(c)
-        
-        if not available:
-            return
-        
-        btn_layout = QHBoxLayout()
-        btn_layout.setContentsMargins(4, 8, 4, 4)
-        
-        add_btn = QPushButton("+ Add Component")
-        add_btn.setFixedHeight(22)
-        add_btn.clicked.connect(lambda: self.show_add_menu(obj, available, add_btn))
-        btn_layout.addWidget(add_btn)
-        btn_layout.addStretch()
-        
-        btn_widget = QWidget()
-        btn_widget.setLayout(btn_layout)
-        self.content_layout.addWidget(btn_widget)
-
-    def add_camera_editor(self, data, obj):
-        if data is None: data = {}
-        self.content_layout.addWidget(self.create_header("Camera", obj, "Camera"))
+        if obj is self.obj:
+            self.state.select_objects(self.state.selected_object_ids)
+        else:
+            self.state.select_object(obj.get("id"))
 
+    def new_form(self, spacing=2):
         form = QFormLayout()
         form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(2)
+        form.setSpacing(spacing)
         form.setLabelAlignment(Qt.AlignRight)
+        return form
+
+    def add_form(self, section, form):
+        form_widget = QWidget()
+        form_widget.setLayout(form)
+        section.add(form_widget)
+
+    def styled_label(self, text):
+        label = QLabel(text)
+        label.setStyleSheet(LABEL_STYLE)
+        return label
+
+    def add_camera_editor(self, section):
+        section.add(self.create_header("Camera", section))
+        form = self.new_form()
         
         # Size
-        width = data.get("width", 800.0)
-        height = data.get("height", 600.0)
-        size_field = Vec2Field(width, height, labels=("W", "H"))
-        size_field.value_edited.connect(lambda w, h: [self.preview_component(obj, "Camera", "width", w), self.preview_component(obj, "Camera", "height", h)])
-        size_field.value_committed.connect(lambda w, h: [self.update_component(obj, "Camera", "width", w), self.update_component(obj, "Camera", "height", h)])
+        size_field = section.field(Vec2Field(800.0, 600.0, labels=("W", "H")),
+                                   get=lambda data: (data.get("width", 800.0), data.get("height", 600.0)))
+        size_field.value_edited.connect(lambda w, h: [self.preview_component(section.obj, "Camera", "width", w), self.preview_component(section.obj, "Camera", "height", h)])
+        size_field.value_committed.connect(lambda w, h: [self.update_component(section.obj, "Camera", "width", w), self.update_component(section.obj, "Camera", "height", h)])
         form.addRow(QLabel("Size:"), size_field)
 
         # Zoom
-        zoom = data.get("zoom", 1.0)
-        zoom_field = FloatField(zoom)
-        zoom_field.value_edited.connect(lambda v: self.preview_component(obj, "Camera", "zoom", v))
-        zoom_field.value_committed.connect(lambda v: self.update_component(obj, "Camera", "zoom", v))
+        zoom_field = section.field(FloatField(1.0), "zoom", 1.0)
+        zoom_field.value_edited.connect(lambda v: self.preview_component(section.obj, "Camera", "zoom", v))
+        zoom_field.value_committed.connect(lambda v: self.update_component(section.obj, "Camera", "zoom", v))
         form.addRow(QLabel("Zoom:"), zoom_field)
         
         # Is Main
-        is_main = data.get("is_main", True)
-        main_check = QCheckBox()
-        main_check.setChecked(is_main)
-        main_check.stateChanged.connect(lambda s: self.update_component(obj, "Camera", "is_main", s == 2))
+        main_check = section.field(QCheckBox(), "is_main", True)
+        main_check.stateChanged.connect(lambda s: self.update_component(section.obj, "Camera", "is_main", s == 2))
         form.addRow(QLabel("Main Camera:"), main_check)
 
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
+        self.add_form(section, form)
 
-    def add_background_editor(self, data, obj):
-        if data is None: data = {}
-        self.content_layout.addWidget(self.create_header("Background", obj, "Background"))
-
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(2)
-        form.setLabelAlignment(Qt.AlignRight)
+    def add_background_editor(self, section):
+        section.add(self.create_header("Background", section))
+        form = self.new_form()
 
         # Sprite
         path_row = QHBoxLayout()
-        current_path = data.get("sprite_path", "")
-        path_label = QLabel(os.path.basename(current_path) if current_path else "(none)")
+        path_label = section.field(QLabel(), "sprite_path", "")
         path_label.setStyleSheet("color: #999999; font-size: 10px;")
         browse_btn = QPushButton("...")
         browse_btn.setFixedSize(24, 18)
-        browse_btn.clicked.connect(lambda: self.pick_image_generic(obj, "Background", "sprite_path", path_label))
+        browse_btn.clicked.connect(lambda: self.pick_image_generic(section.obj, "Background", "sprite_path"))
         
         path_row.addWidget(path_label)
         path_row.addWidget(browse_btn)
         form.addRow(QLabel("Image:"), path_row)
 
         # Color
-        color = data.get("color", [255, 255, 255, 255])
-        col_field = ColorField(tuple(color))
-        col_field.value_changed.connect(lambda c: self.update_component(obj, "Background", "color", c))
+        col_field = section.field(ColorField(), "color", [255, 255, 255, 255])
+        col_field.value_changed.connect(lambda c: self.update_component(section.obj, "Background", "color", c))
         form.addRow(QLabel("Color:"), col_field)
         
         # Fixed
-        fixed = data.get("fixed", True)
-        fixed_check = QCheckBox()
-        fixed_check.setChecked(fixed)
-        fixed_check.stateChanged.connect(lambda s: self.update_component(obj, "Background", "fixed", s == 2))
+        fixed_check = section.field(QCheckBox(), "fixed", True)
+        fixed_check.stateChanged.connect(lambda s: self.update_component(section.obj, "Background", "fixed", s == 2))
         form.addRow(QLabel("Fixed (Camera):"), fixed_check)
         
         # Layer
-        layer = data.get("layer", -100)
-        layer_field = FloatField(layer)
-        layer_field.value_committed.connect(lambda v: self.update_component(obj, "Background", "layer", int(v)))
+        layer_field = section.field(FloatField(-100), "layer", -100)
+        layer_field.value_committed.connect(lambda v: self.update_component(section.obj, "Background", "layer", int(v)))
         form.addRow(QLabel("Layer:"), layer_field)
 
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
-    
-    def pick_image_generic(self, obj, comp_name, key, label_widget):
-        path, _ = QFileDialog.getOpenFileName(
-            self, "Select Image", 
-            os.path.join(self.state.project_root, "assets", "sprites"),
-            "Images (*.png *.jpg *.jpeg *.bmp)"
-        )
-        if path:
-            import shutil
-            try:
-                rel_path = os.path.relpath(path, self.state.project_root)
-                if rel_path.startswith("..") or os.path.isabs(rel_path): raise ValueError()
-            except ValueError:
-                dest_dir = os.path.join(self.state.project_root, "assets", "sprites")
-                os.makedirs(dest_dir, exist_ok=True)
-                filename = os.path.basename(path)
-                dest_path = os.path.join(dest_dir, filename)
-                shutil.copy2(path, dest_path)
-                rel_path = os.path.relpath(dest_path, self.state.project_root)
-            
-            if comp_name not in obj.get("components", {}): obj["components"][comp_name] = {}
-            obj["components"][comp_name][key] = rel_path
-            label_widget.setText(os.path.basename(rel_path))
-            self.state.scene_loaded.emit()
-        browse_btn.clicked.connect(lambda: self.pick_image_generic(obj, "Background", "sprite_path", path_label))
-        
-        path_row.addWidget(path_label)
-        path_row.addWidget(browse_btn)
-        form.addRow(QLabel("Image:"), path_row)
-
-        # Color
-        color = data.get("color", [255, 255, 255, 255])
-        col_field = ColorField(tuple(color))
-        col_field.value_changed.connect(lambda c: self.update_component(obj, "Background", "color", c))
-        form.addRow(QLabel("Color:"), col_field)
-        
-        # Fixed
-        fixed = data.get("fixed", True)
-        fixed_check = QCheckBox()
-        fixed_check.setChecked(fixed)
-        fixed_check.stateChanged.connect(lambda s: self.update_component(obj, "Background", "fixed", s == 2))
-        form.addRow(QLabel("Fixed (Camera):"), fixed_check)
-        
-        # Layer
-        layer = data.get("layer", -100)
-        layer_field = FloatField(layer)
-        layer_field.value_committed.connect(lambda v: self.update_component(obj, "Background", "layer", int(v)))
-        form.addRow(QLabel("Layer:"), layer_field)
+        self.add_form(section, form)
 
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
-    
-    def pick_image_generic(self, obj, comp_name, key, label_widget):
+    def pick_image_generic(self, obj, comp_name, key):
         current_val = obj.get("components", {}).get(comp_name, {}).get(key, "")
         
         if current_val:
@@ -572,10 +698,7 @@ class InspectorPanel(QWidget):
             action = menu.exec(QCursor.pos())
             
             if action == delete_action:
-                if comp_name in obj.get("components", {}):
-                     obj["components"][comp_name][key] = ""
-                label_widget.setText("None")
-                self.state.scene_loaded.emit()
+                self.update_component(obj, comp_name, key, "")
                 return
             elif action == replace_action:
                 pass # Proceed to picker
@@ -600,55 +723,32 @@ class InspectorPanel(QWidget):
                 shutil.copy2(path, dest_path)
                 rel_path = os.path.relpath(dest_path, self.state.project_root)
             
-            if comp_name not in obj.get("components", {}): obj["components"][comp_name] = {}
-            obj["components"][comp_name][key] = rel_path
-            label_widget.setText(os.path.basename(rel_path))
-            self.state.scene_loaded.emit()
+            # Every selected object, as one undo step; the rebind shows the new path
+            self.update_component(obj, comp_name, key, rel_path)
 
-    def add_transform_editor(self, data, obj):
-        self.content_layout.addWidget(self.create_header("Transform", obj, "Transform"))
-
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(4)
-        form.setLabelAlignment(Qt.AlignRight)
+    def add_transform_editor(self, section):
+        section.add(self.create_header("Transform", section))
+        form = self.new_form(spacing=4)
 
         # Position
-        pos = data.get("position", [0, 0])
-        pos_field = Vec2Field(pos[0], pos[1])
-        pos_field.value_edited.connect(lambda x, y: self.preview_transform(obj, "position", (x, y)))
-        pos_field.value_committed.connect(lambda nx, ny, ox, oy: self.commit_transform(obj, "position", (nx, ny), (ox, oy)))
-        
-        pos_label = QLabel("Position:")
-        pos_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(pos_label, pos_field)
-        self.active_editors[("Transform", "position")] = pos_field
+        pos_field = section.field(Vec2Field(), "position", [0, 0])
+        pos_field.value_edited.connect(lambda x, y: self.preview_transform(section.obj, "position", (x, y)))
+        pos_field.value_committed.connect(lambda nx, ny, ox, oy: self.commit_transform(section.obj, "position", (nx, ny), (ox, oy)))
+        form.addRow(self.styled_label("Position:"), pos_field)
 
         # Rotation
-        rot = data.get("rotation", 0)
-        rot_field = FloatField(rot)
-        rot_field.value_edited.connect(lambda v: self.preview_transform(obj, "rotation", v))
-        rot_field.value_committed.connect(lambda n, o: self.commit_transform(obj, "rotation", n, o))
-        
-        rot_label = QLabel("Rotation:")
-        rot_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(rot_label, rot_field)
-        self.active_editors[("Transform", "rotation")] = rot_field
+        rot_field = section.field(FloatField(), "rotation", 0)
+        rot_field.value_edited.connect(lambda v: self.preview_transform(section.obj, "rotation", v))
+        rot_field.value_committed.connect(lambda n, o: self.commit_transform(section.obj, "rotation", n, o))
+        form.addRow(self.styled_label("Rotation:"), rot_field)
 
         # Scale
-        scale = data.get("scale", [1, 1])
-        scale_field = Vec2Field(scale[0], scale[1])
-        scale_field.value_edited.connect(lambda x, y: self.preview_transform(obj, "scale", (x, y)))
-        scale_field.value_committed.connect(lambda nx, ny, ox, oy: self.commit_transform(obj, "scale", (nx, ny), (ox, oy)))
-        
-        scale_label = QLabel("Scale:")
-        scale_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(scale_label, scale_field)
-        self.active_editors[("Transform", "scale")] = scale_field
+        scale_field = section.field(Vec2Field(1.0, 1.0), "scale", [1, 1])
+        scale_field.value_edited.connect(lambda x, y: self.preview_transform(section.obj, "scale", (x, y)))
+        scale_field.value_committed.connect(lambda nx, ny, ox, oy: self.commit_transform(section.obj, "scale", (nx, ny), (ox, oy)))
+        form.addRow(self.styled_label("Scale:"), scale_field)
 
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
+        self.add_form(section, form)
 
     def preview_transform(self, obj, key, value):
         val = list(value) if isinstance(value, tuple) else value
@@ -659,50 +759,22 @@ class InspectorPanel(QWidget):
         old = list(old_value) if isinstance(old_value, tuple) else old_value
         self.update_component(obj, "Transform", key, val, old_value=old)
 
-    def add_component_section(self, name, data, obj):
-        self.content_layout.addWidget(self.create_header(name, obj, name))
-
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(2)
-        form.setLabelAlignment(Qt.AlignRight)
-
-        if isinstance(data, dict):
-            for key, value in data.items():
-                key_label = QLabel(f"{key}:")
-                key_label.setStyleSheet("color: #666666; font-size: 10px;")
-                
-                val_label = QLabel(str(value))
-                val_label.setStyleSheet("color: #999999; font-size: 10px;")
-                val_label.setWordWrap(True)
-                
-                form.addRow(key_label, val_label)
-        
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
-
-    def add_sprite_editor(self, data, obj):
-        self.content_layout.addWidget(self.create_header("SpriteRenderer", obj, "SpriteRenderer"))
-
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(4)
-        form.setLabelAlignment(Qt.AlignRight)
+    def add_sprite_editor(self, section):
+        section.add(self.create_header("SpriteRenderer", section))
+        form = self.new_form(spacing=4)
 
         # Sprite path
         path_row = QHBoxLayout()
         path_row.setSpacing(4)
         
-        current_path = data.get("sprite_path", "")
-        path_label = QLabel(os.path.basename(current_path) if current_path else "(none)")
+        path_label = section.field(QLabel(), "sprite_path", "")
         path_label.setStyleSheet("color: #999999; font-size: 10px;")
         path_label.setFixedWidth(100)
         
         browse_btn = QPushButton("...")
         browse_btn.setFixedSize(24, 18)
         # Use generic picker
-        browse_btn.clicked.connect(lambda: self.pick_image_generic(obj, "SpriteRenderer", "sprite_path", path_label))
+        browse_btn.clicked.connect(lambda: self.pick_image_generic(section.obj, "SpriteRenderer", "sprite_path"))
         
         path_row.addWidget(path_label)
         path_row.addWidget(browse_btn)
@@ -710,133 +782,126 @@ class InspectorPanel(QWidget):
         
         path_widget = QWidget()
         path_widget.setLayout(path_row)
-        
-        sprite_label = QLabel("Sprite:")
-        sprite_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(sprite_label, path_widget)
+        form.addRow(self.styled_label("Sprite:"), path_widget)
+
+        # Atlas region (optional, overrides the sprite path)
+        region_edit = section.field(QLineEdit(), "region", "")
+        region_edit.setPlaceholderText("(sprite path)")
+        # Only when typed in: leaving a blank (mixed) field must not clear every region
+        region_edit.editingFinished.connect(
+            lambda: region_edit.isModified() and self.update_component(section.obj, "SpriteRenderer", "region", region_edit.text().strip()))
+        form.addRow(self.styled_label("Region:"), region_edit)
 
         # Layer
-        layer = data.get("layer", 0)
-        layer_field = FloatField(layer)
+        layer_field = section.field(FloatField(), "layer", 0)
         layer_field.setFixedWidth(40)
-        layer_field.value_edited.connect(lambda v: self.preview_component(obj, "SpriteRenderer", "layer", int(v)))
-        layer_field.value_committed.connect(lambda v: self.update_component(obj, "SpriteRenderer", "layer", int(v)))
-        
-        layer_label = QLabel("Layer:")
-        layer_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(layer_label, layer_field)
+        layer_field.value_edited.connect(lambda v: self.preview_component(section.obj, "SpriteRenderer", "layer", int(v)))
+        layer_field.value_committed.connect(lambda v: self.update_component(section.obj, "SpriteRenderer", "layer", int(v)))
+        form.addRow(self.styled_label("Layer:"), layer_field)
 
         # Visible
-        visible = data.get("visible", True)
-        visible_check = QCheckBox()
-        visible_check.setChecked(visible)
-        visible_check.stateChanged.connect(lambda s: self.update_sprite(obj, "visible", s == 2))
-        
-        visible_label = QLabel("Visible:")
-        visible_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(visible_label, visible_check)
+        visible_check = section.field(QCheckBox(), "visible", True)
+        visible_check.stateChanged.connect(lambda s: self.update_component(section.obj, "SpriteRenderer", "visible", s == 2))
+        form.addRow(self.styled_label("Visible:"), visible_check)
 
         # Tint
-        tint = data.get("tint", [255, 255, 255, 255])
-        col_field = ColorField(tuple(tint))
-        col_field.value_changed.connect(lambda c: self.update_component(obj, "SpriteRenderer", "tint", c))
+        col_field = section.field(ColorField(), "tint", [255, 255, 255, 255])
+        col_field.value_changed.connect(lambda c: self.update_component(section.obj, "SpriteRenderer", "tint", c))
         form.addRow(QLabel("Tint:"), col_field)
 
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
+        self.add_form(section, form)
 
-    def update_sprite(self, obj, key, value):
-        if "SpriteRenderer" not in obj.get("components", {}):
-            obj["components"]["SpriteRenderer"] = {}
-        obj["components"]["SpriteRenderer"][key] = value
-        self.state.scene_loaded.emit()
-
-    def add_script_editor(self, data, obj):
-        self.content_layout.addWidget(self.create_header("Script", obj, "Script"))
+    def add_script_editor(self, section):
+        section.add(self.create_header("Script", section))
 
         form = QFormLayout()
         form.setContentsMargins(8, 4, 4, 4)
         form.setSpacing(2)
         
-        # Script path row
-        current_path = data.get("script_path", "")
+        # Script path row (one section per script: the property rows depend on it)
+        current_path = (section.obj["components"].get("Script") or {}).get("script_path", "")
         
         path_widget = QWidget()
         path_layout = QHBoxLayout(path_widget)
         path_layout.setContentsMargins(0, 0, 0, 0)
         path_layout.setSpacing(4)
         
-        path_label = QLabel(os.path.basename(current_path) if current_path else "(none)")
+        path_label = section.field(QLabel(), "script_path", "")
         path_label.setStyleSheet("color: #aaaaaa; background: #222222; border-radius: 2px; padding: 2px 4px;")
         path_label.setFixedHeight(22)
         
         browse_btn = QPushButton("...")
         browse_btn.setFixedSize(24, 22)
         browse_btn.setStyleSheet("background: #333333; color: white; border: none;")
-        browse_btn.clicked.connect(lambda: self.pick_script(obj, path_label))
+        browse_btn.clicked.connect(lambda: self.pick_script(section.obj))
         
         path_layout.addWidget(path_label)
         path_layout.addWidget(browse_btn)
         
         form.addRow("Script:", path_widget)
 
-        # Properties
-        if current_path:
-            full_path = os.path.join(self.state.project_root, current_path)
-            defaults = ScriptParser.parse_properties(full_path)
-            
-            # Merge stored properties
-            stored_props = data.get("properties", {})
-            
-            # Ensure all defaults are present in stored_props if not set
-            # But we don't necessarily save them back unless changed
-            
-            for key, default_val in defaults.items():
-                current_val = stored_props.get(key, default_val)
-                
-                # Check type
-                if isinstance(default_val, (int, float)):
-                    field = FloatField(float(current_val))
-                    field.value_edited.connect(lambda v, k=key: self.preview_script_property(obj, k, v))
-                    field.value_committed.connect(lambda v, k=key: self.update_script_property(obj, k, v))
-                    form.addRow(f"{key}:", field)
-                elif isinstance(default_val, bool):
-                    check = QCheckBox()
-                    check.setChecked(bool(current_val))
-                    # Note: QCheckBox doesn't separate edited/committed clearly, so we just update
-                    check.stateChanged.connect(lambda s, k=key: self.update_script_property(obj, k, s == 2))
-                    form.addRow(f"{key}:", check)
-                # TODO: String, Color support?
+        # Properties (none until the script is parsed; on_script_changed then rebuilds the section)
+        meta = self.scripts.get(self.script_file(current_path)) if current_path else None
+        for key, kind, default_val in (meta.fields() if meta else []):
+            # Stored properties override the script's defaults
+            get = lambda data, k=key, d=default_val: (data.get("properties") or {}).get(k, d)
+
+            if kind == "bool":
+                check = section.field(QCheckBox(), get=get)
+                # Note: QCheckBox doesn't separate edited/committed clearly, so we just update
+                check.stateChanged.connect(lambda s, k=key: self.update_script_property(section.obj, k, s == 2))
+                form.addRow(f"{key}:", check)
+            elif kind == "str":
+                edit = section.field(QLineEdit(), get=get)
+                edit.editingFinished.connect(
+                    lambda k=key, e=edit: e.isModified() and self.update_script_property(section.obj, k, e.text()))
+                form.addRow(f"{key}:", edit)
+            else:
+                cast = int if kind == "int" else float
+                field = section.field(FloatField(), get=get)
+                field.value_edited.connect(lambda v, k=key, c=cast: self.preview_script_property(section.obj, k, c(v)))
+                field.value_committed.connect(lambda v, old, k=key, c=cast: self.update_script_property(section.obj, k, c(v)))
+                form.addRow(f"{key}:", field)
+            # TODO: Color support?
         
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
+        self.add_form(section, form)
 
     def preview_script_property(self, obj, key, value):
-        if "Script" in obj.get("components", {}):
-            if "properties" not in obj["components"]["Script"]:
-                obj["components"]["Script"]["properties"] = {}
-            obj["components"]["Script"]["properties"][key] = value
-            # self.state.scene_loaded.emit() # Optional: heavy reload?
+        for target in self.targets(obj, "Script"):
+            if "Script" not in target.get("components", {}):
+                continue
+            props = target["components"]["Script"].get("properties") or {}
+            # The commit's undo step starts from the state before the first preview (unset: the script default)
+            self.preview_originals.setdefault((target.get("id"), "Script.properties", key),
+                                              (key in props, copy.deepcopy(props.get(key)), bool(props)))
+            if not props:
+                target["components"]["Script"]["properties"] = props # Missing or null
+            props[key] = value
+            self.state.request_update(target.get("id"))
 
     def update_script_property(self, obj, key, value):
-        if "Script" in obj.get("components", {}):
-            if "properties" not in obj["components"]["Script"]:
-                obj["components"]["Script"]["properties"] = {}
-            
-            current = obj["components"]["Script"]["properties"].get(key)
-            if current != value:
-                # We need a specific Command or reuse ChangeComponentCommand
-                # Reusing ChangeComponentCommand is tricky because the path is deeper (components -> Script -> properties -> key)
-                # Simplified: Direct update for now, or add specific command later
-                obj["components"]["Script"]["properties"][key] = value
-                
-                # To support undo properly, we should really update ChangeComponentCommand to support nested keys or make a generic SetPropertyCommand
-                # For now, let's just trigger scene load emit to save state
-                self.state.scene_loaded.emit()
+        """Sets a script property with an undoable command; on a multi-selection, one CompoundCommand for all."""
+        cmds = []
+        for target in self.targets(obj, "Script"):
+            if "Script" not in target.get("components", {}):
+                continue
+            current = (target["components"]["Script"].get("properties") or {}).get(key)
+            cmd = SetScriptPropertyCommand(target, key, value)
+            original = self.preview_originals.pop((target.get("id"), "Script.properties", key), None)
+            if original is not None:
+                cmd.was_set, cmd.old_value, cmd.had_properties = original
+            if cmd.was_set and cmd.old_value == value and current == value:
+                continue
+            cmds.append(cmd)
 
-    def pick_script(self, obj, label_widget):
+        if not cmds:
+            return
+        cmd = cmds[0] if len(cmds) == 1 else CompoundCommand(cmds)
+        cmd.redo()
+        self.state.undo_stack.push(cmd)
+        self.state.scene_updated.emit()
+
+    def pick_script(self, obj):
         path, _ = QFileDialog.getOpenFileName(
             self, "Select Script", 
             os.path.join(self.state.project_root, "scripts"),
@@ -864,185 +929,76 @@ class InspectorPanel(QWidget):
                 shutil.copy2(path, dest_path)
                 rel_path = os.path.relpath(dest_path, self.state.project_root)
             
-            if "Script" not in obj.get("components", {}):
-                obj["components"]["Script"] = {}
-            obj["components"]["Script"]["script_path"] = rel_path
-            self.state.scene_loaded.emit()
-            label_widget.setText(os.path.basename(rel_path))
-
-    def add_component_button(self, obj):
-        components = obj.get("components", {})
-        available = []
-        
-        if "SpriteRenderer" not in components:
-            available.append("SpriteRenderer")
-        if "BoxCollider" not in components:
-            available.append("BoxCollider")
-        if "CircleCollider" not in components:
-            available.append("CircleCollider")
-        if "RigidBody" not in components:
-            available.append("RigidBody")
-        if "Script" not in components:
-            available.append("Script")
-        if "Camera" not in components:
-            available.append("Camera")
-        if "LightSource" not in components:
-            available.append("LightSource")
-        
-        if not available:
-            return
-        
-        btn_layout = QHBoxLayout()
-        btn_layout.setContentsMargins(4, 8, 4, 4)
-        
-        add_btn = QPushButton("+ Add Component")
-        add_btn.setFixedHeight(22)
-        add_btn.clicked.connect(lambda: self.show_add_menu(obj, available, add_btn))
-        btn_layout.addWidget(add_btn)
-        btn_layout.addStretch()
-        
-        btn_widget = QWidget()
-        btn_widget.setLayout(btn_layout)
-        self.content_layout.addWidget(btn_widget)
-
-    def add_camera_editor(self, data, obj):
-        if data is None: data = {}
-        self.content_layout.addWidget(self.create_header("Camera", obj, "Camera"))
+            self.update_component(obj, "Script", "script_path", rel_path)
 
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(2)
-        form.setLabelAlignment(Qt.AlignRight)
-        
-        # Size
-        width = data.get("width", 800.0)
-        height = data.get("height", 600.0)
-        size_field = Vec2Field(width, height, labels=("W", "H"))
-        size_field.value_edited.connect(lambda w, h: [self.preview_component(obj, "Camera", "width", w), self.preview_component(obj, "Camera", "height", h)])
-        size_field.value_committed.connect(lambda w, h: [self.update_component(obj, "Camera", "width", w), self.update_component(obj, "Camera", "height", h)])
-        form.addRow(QLabel("Size:"), size_field)
-
-        # Zoom
-        zoom = data.get("zoom", 1.0)
-        zoom_field = FloatField(zoom)
-        zoom_field.value_edited.connect(lambda v: self.preview_component(obj, "Camera", "zoom", v))
-        zoom_field.value_committed.connect(lambda v: self.update_component(obj, "Camera", "zoom", v))
-        form.addRow(QLabel("Zoom:"), zoom_field)
-        
-        # Is Main
-        is_main = data.get("is_main", True)
-        main_check = QCheckBox()
-        main_check.setChecked(is_main)
-        main_check.stateChanged.connect(lambda s: self.update_component(obj, "Camera", "is_main", s == 2))
-        form.addRow(QLabel("Main Camera:"), main_check)
-
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
-
-    def add_rigidbody_editor(self, data, obj):
-        if data is None: data = {}
-        self.content_layout.addWidget(self.create_header("RigidBody", obj, "RigidBody"))
-
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(2)
-        form.setLabelAlignment(Qt.AlignRight)
+    def add_rigidbody_editor(self, section):
+        section.add(self.create_header("RigidBody", section))
+        form = self.new_form()
 
         # Mass
-        mass = data.get("mass", 1.0)
-        mass_field = FloatField(mass, min_val=0.001) # Prevent zero mass
-        mass_field.value_edited.connect(lambda v: self.preview_component(obj, "RigidBody", "mass", v))
-        mass_field.value_committed.connect(lambda v: self.update_component(obj, "RigidBody", "mass", v))
-        
-        mass_label = QLabel("Mass:")
-        mass_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(mass_label, mass_field)
-        self.active_editors[("RigidBody", "mass")] = mass_field
+        mass_field = section.field(FloatField(min_val=0.001), "mass", 1.0) # Prevent zero mass
+        mass_field.value_edited.connect(lambda v: self.preview_component(section.obj, "RigidBody", "mass", v))
+        mass_field.value_committed.connect(lambda v: self.update_component(section.obj, "RigidBody", "mass", v))
+        form.addRow(self.styled_label("Mass:"), mass_field)
 
         # Drag
-        drag = data.get("drag", 0.0)
-        drag_field = FloatField(drag, min_val=0.0)
-        drag_field.value_edited.connect(lambda v: self.preview_component(obj, "RigidBody", "drag", v))
-        drag_field.value_committed.connect(lambda v: self.update_component(obj, "RigidBody", "drag", v))
-        
-        drag_label = QLabel("Drag:")
-        drag_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(drag_label, drag_field)
-        self.active_editors[("RigidBody", "drag")] = drag_field
+        drag_field = section.field(FloatField(min_val=0.0), "drag", 0.0)
+        drag_field.value_edited.connect(lambda v: self.preview_component(section.obj, "RigidBody", "drag", v))
+        drag_field.value_committed.connect(lambda v: self.update_component(section.obj, "RigidBody", "drag", v))
+        form.addRow(self.styled_label("Drag:"), drag_field)
 
         # Use Gravity
-        use_gravity = data.get("use_gravity", True)
-        gravity_check = QCheckBox()
-        gravity_check.setChecked(use_gravity)
-        gravity_check.stateChanged.connect(lambda s: self.update_component(obj, "RigidBody", "use_gravity", s == 2))
-        
-        gravity_label = QLabel("Use Gravity:")
-        gravity_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(gravity_label, gravity_check)
+        gravity_check = section.field(QCheckBox(), "use_gravity", True)
+        gravity_check.stateChanged.connect(lambda s: self.update_component(section.obj, "RigidBody", "use_gravity", s == 2))
+        form.addRow(self.styled_label("Use Gravity:"), gravity_check)
 
         # Restitution
-        restitution = data.get("restitution", 0.5)
-        rest_field = FloatField(restitution)
-        rest_field.value_edited.connect(lambda v: self.preview_component(obj, "RigidBody", "restitution", v))
-        rest_field.value_committed.connect(lambda v: self.update_component(obj, "RigidBody", "restitution", v))
+        rest_field = section.field(FloatField(), "restitution", 0.5)
+        rest_field.value_edited.connect(lambda v: self.preview_component(section.obj, "RigidBody", "restitution", v))
+        rest_field.value_committed.connect(lambda v: self.update_component(section.obj, "RigidBody", "restitution", v))
         form.addRow(QLabel("Restitution:"), rest_field)
 
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
-
-    def add_box_collider_editor(self, data, obj):
-        if data is None: data = {}
-        self.content_layout.addWidget(self.create_header("BoxCollider", obj, "BoxCollider"))
+        self.add_form(section, form)
 
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(2)
-        form.setLabelAlignment(Qt.AlignRight)
+    def add_box_collider_editor(self, section):
+        section.add(self.create_header("BoxCollider", section))
+        form = self.new_form()
 
         # Size
-        size = data.get("size", [50.0, 50.0])
-        size_field = Vec2Field(size[0], size[1], labels=("W", "H"))
-        size_field.value_edited.connect(lambda w, h: self.preview_component(obj, "BoxCollider", "size", [w, h]))
-        size_field.value_committed.connect(lambda w, h: self.update_component(obj, "BoxCollider", "size", [w, h]))
-        
-        size_label = QLabel("Size:")
-        size_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(size_label, size_field)
-        self.active_editors[("BoxCollider", "size")] = size_field
+        size_field = section.field(Vec2Field(50.0, 50.0, labels=("W", "H")), "size", [50.0, 50.0])
+        size_field.value_edited.connect(lambda w, h: self.preview_component(section.obj, "BoxCollider", "size", [w, h]))
+        size_field.value_committed.connect(lambda w, h: self.update_component(section.obj, "BoxCollider", "size", [w, h]))
+        form.addRow(self.styled_label("Size:"), size_field)
 
         # Offset
-        offset = data.get("offset", [0.0, 0.0])
-        offset_field = Vec2Field(offset[0], offset[1])
-        offset_field.value_edited.connect(lambda x, y: self.preview_component(obj, "BoxCollider", "offset", [x, y]))
-        offset_field.value_committed.connect(lambda x, y: self.update_component(obj, "BoxCollider", "offset", [x, y]))
-        
-        offset_label = QLabel("Offset:")
-        offset_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(offset_label, offset_field)
-        self.active_editors[("BoxCollider", "offset")] = offset_field
+        offset_field = section.field(Vec2Field(), "offset", [0.0, 0.0])
+        offset_field.value_edited.connect(lambda x, y: self.preview_component(section.obj, "BoxCollider", "offset", [x, y]))
+        offset_field.value_committed.connect(lambda x, y: self.update_component(section.obj, "BoxCollider", "offset", [x, y]))
+        form.addRow(self.styled_label("Offset:"), offset_field)
 
         # Is Trigger
-        is_trigger = data.get("is_trigger", False)
-        trigger_check = QCheckBox()
-        trigger_check.setChecked(is_trigger)
-        trigger_check.stateChanged.connect(lambda s: self.update_component(obj, "BoxCollider", "is_trigger", s == 2))
-        
-        trigger_label = QLabel("Is Trigger:")
-        trigger_label.setStyleSheet("color: #666666; font-size: 10px;")
-        form.addRow(trigger_label, trigger_check)
+        trigger_check = section.field(QCheckBox(), "is_trigger", False)
+        trigger_check.stateChanged.connect(lambda s: self.update_component(section.obj, "BoxCollider", "is_trigger", s == 2))
+        form.addRow(self.styled_label("Is Trigger:"), trigger_check)
 
-        # Sync Button
-        if "SpriteRenderer" in obj.get("components", {}):
+        # Category
+        cat_field = section.field(FloatField(), "category_bitmask", 1) # Using FloatField as IntField for simplicity MVP
+        cat_field.value_committed.connect(lambda v: self.update_component(section.obj, "BoxCollider", "category_bitmask", int(v)))
+        form.addRow(QLabel("Category (Bitmask):"), cat_field)
+
+        # Mask
+        mask_field = section.field(FloatField(), "collision_mask", 0xFFFFFFFF)
+        mask_field.value_committed.connect(lambda v: self.update_component(section.obj, "BoxCollider", "collision_mask", int(v)))
+        form.addRow(QLabel("Mask (Bitmask):"), mask_field)
+
+        # Sync Button (section_key() gives objects with a sprite their own section)
+        if "SpriteRenderer" in section.obj.get("components", {}):
             sync_btn = QPushButton("Snap to Visual Size")
             sync_btn.setFixedHeight(20)
-            sync_btn.clicked.connect(lambda: self.sync_collider_size(obj))
+            sync_btn.clicked.connect(lambda: self.sync_collider_size(section.obj))
             form.addRow("", sync_btn)
 
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
+        self.add_form(section, form)
 
     def sync_collider_size(self, obj):
         # 1. Get Scale
@@ -1052,11 +1008,14 @@ class InspectorPanel(QWidget):
             
         # 2. Get Base Size (Sprite or Default)
         sprite_data = obj["components"].get("SpriteRenderer", {})
-        path = sprite_data.get("sprite_path", "")
+        path = sprite_data.get("region") or sprite_data.get("sprite_path", "")
         
         base_w, base_h = 50.0, 50.0 # Default fallback
         
-        if path:
+        region = find_region(self.atlas, path)
+        if region:
+            base_w, base_h = float(region[1][2]), float(region[1][3])
+        elif path:
             full_path = os.path.join(self.state.project_root, path)
             if os.path.exists(full_path):
                 from PySide6.QtGui import QImage
@@ -1073,28 +1032,50 @@ class InspectorPanel(QWidget):
         
     def preview_component(self, obj, comp_name, key, value):
         """Updates the component data directly without undo history (for live preview)."""
-        if comp_name in obj.get("components", {}):
-            obj["components"][comp_name][key] = value
-            self.state.scene_updated.emit()
+        for target in self.targets(obj, comp_name):
+            if comp_name in target.get("components", {}):
+                data = target["components"][comp_name]
+                # The commit's undo step starts from the value before the first preview
+                self.preview_originals.setdefault((target.get("id"), comp_name, key), copy.deepcopy(data.get(key)))
+                data[key] = merge_value(data.get(key), value)
+                # Coalesced: a burst of keystrokes repaints once per frame interval
+                self.state.request_update(target.get("id"))
 
     def update_component(self, obj, comp_name, key, value, old_value=None):
-        if comp_name in obj.get("components", {}):
-            current = obj["components"][comp_name].get(key)
-            
-            # If old_value is provided, we skip the equality check because current might already == value (preview)
-            if old_value is None and current == value:
-                return
+        """
+        Sets the value with an undoable command. On a multi-selection every selected object gets
+        it, as one CompoundCommand (one undo step, one scene_updated).
+        """
+        cmds = []
+        for target in self.targets(obj, comp_name):
+            if comp_name not in target.get("components", {}):
+                continue
+            current = target["components"][comp_name].get(key)
+            new_value = merge_value(current, value)
+
+            # After a preview, current already == value: the old value is the one the preview replaced
+            preview_key = (target.get("id"), comp_name, key)
+            if preview_key in self.preview_originals:
+                old = self.preview_originals.pop(preview_key)
+            elif target is obj and old_value is not None:
+                old = merge_value(current, old_value)
+            else:
+                old = current
+            if old == new_value and current == new_value:
+                continue
 
-            cmd = ChangeComponentCommand(obj, comp_name, key, value)
-            if old_value is not None:
-                 cmd.old_value = old_value
-                 
-            self.state.undo_stack.push(cmd)
-            # cmd.redo() # Redo is implicit if we trust 'value' is what we want. 
-            # BUT: redo() sets obj[...] = value. If obj is already value, it does nothing harmful.
-            cmd.redo()
-            
-            self.state.scene_updated.emit()
+            cmd = ChangeComponentCommand(target, comp_name, key, new_value)
+            cmd.old_value = old
+            cmds.append(cmd)
+
+        if not cmds:
+            return
+        cmd = cmds[0] if len(cmds) == 1 else CompoundCommand(cmds)
+        # redo() sets obj[...] = value. If obj is already value, it does nothing harmful.
+        cmd.redo()
+        self.state.undo_stack.push(cmd)
+        
+        self.state.scene_updated.emit()
 
     def show_add_menu(self, obj, available, button):
         from PySide6.QtWidgets import QMenu
@@ -1116,127 +1097,62 @@ class InspectorPanel(QWidget):
         }
         if comp_name in defaults:
             cmd = AddComponentCommand(obj, comp_name, defaults[comp_name])
-            self.state.undo_stack.push(cmd)
             cmd.redo()
+            self.state.undo_stack.push(cmd)
             self.state.select_object(obj.get("id"))  # Refresh inspector
 
-    def add_circle_collider_editor(self, data, obj):
-        if data is None: data = {}
-        self.content_layout.addWidget(self.create_header("CircleCollider", obj, "CircleCollider"))
-
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(2)
-        form.setLabelAlignment(Qt.AlignRight)
+    def add_circle_collider_editor(self, section):
+        section.add(self.create_header("CircleCollider", section))
+        form = self.new_form()
 
         # Radius
-        radius = data.get("radius", 25.0)
-        radius_field = FloatField(radius)
-        radius_field.value_edited.connect(lambda v: self.preview_component(obj, "CircleCollider", "radius", v))
-        radius_field.value_committed.connect(lambda v: self.update_component(obj, "CircleCollider", "radius", v))
+        radius_field = section.field(FloatField(), "radius", 25.0)
+        radius_field.value_edited.connect(lambda v: self.preview_component(section.obj, "CircleCollider", "radius", v))
+        radius_field.value_committed.connect(lambda v: self.update_component(section.obj, "CircleCollider", "radius", v))
         form.addRow(QLabel("Radius:"), radius_field)
 
         # Offset
-        offset = data.get("offset", [0.0, 0.0])
-        offset_field = Vec2Field(offset[0], offset[1])
-        offset_field.value_edited.connect(lambda x, y: self.preview_component(obj, "CircleCollider", "offset", [x, y]))
-        offset_field.value_committed.connect(lambda x, y: self.update_component(obj, "CircleCollider", "offset", [x, y]))
+        offset_field = section.field(Vec2Field(), "offset", [0.0, 0.0])
+        offset_field.value_edited.connect(lambda x, y: self.preview_component(section.obj, "CircleCollider", "offset", [x, y]))
+        offset_field.value_committed.connect(lambda x, y: self.update_component(section.obj, "CircleCollider", "offset", [x, y]))
         form.addRow(QLabel("Offset:"), offset_field)
 
         # Is Trigger
-        is_trigger = data.get("is_trigger", False)
-        trigger_check = QCheckBox()
-        trigger_check.setChecked(is_trigger)
-        trigger_check.stateChanged.connect(lambda s: self.update_component(obj, "CircleCollider", "is_trigger", s == 2))
+        trigger_check = section.field(QCheckBox(), "is_trigger", False)
+        trigger_check.stateChanged.connect(lambda s: self.update_component(section.obj, "CircleCollider", "is_trigger", s == 2))
         form.addRow(QLabel("Is Trigger:"), trigger_check)
 
         # Category
-        cat = data.get("category_bitmask", 1)
-        cat_field = FloatField(cat) # Using FloatField as IntField for simplicity MVP
-        cat_field.value_committed.connect(lambda v: self.update_component(obj, "CircleCollider", "category_bitmask", int(v)))
+        cat_field = section.field(FloatField(), "category_bitmask", 1) # Using FloatField as IntField for simplicity MVP
+        cat_field.value_committed.connect(lambda v: self.update_component(section.obj, "CircleCollider", "category_bitmask", int(v)))
         form.addRow(QLabel("Category (Bitmask):"), cat_field)
 
         # Mask
-        mask = data.get("collision_mask", 0xFFFFFFFF)
-        mask_field = FloatField(mask)
-        mask_field.value_committed.connect(lambda v: self.update_component(obj, "CircleCollider", "collision_mask", int(v)))
+        mask_field = section.field(FloatField(), "collision_mask", 0xFFFFFFFF)
+        mask_field.value_committed.connect(lambda v: self.update_component(section.obj, "CircleCollider", "collision_mask", int(v)))
         form.addRow(QLabel("Mask (Bitmask):"), mask_field)
 
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
-
-    def add_box_collider_editor(self, data, obj):
-        if data is None: data = {}
-        self.content_layout.addWidget(self.create_header("BoxCollider", obj, "BoxCollider"))
-
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(2)
-        form.setLabelAlignment(Qt.AlignRight)
-
-        # Size
-        size = data.get("size", [50.0, 50.0])
-        size_field = Vec2Field(size[0], size[1], labels=("W", "H"))
-        size_field.value_committed.connect(lambda w, h, ow, oh: self.update_component(obj, "BoxCollider", "size", [w, h]))
-        form.addRow(QLabel("Size:"), size_field)
+        self.add_form(section, form)
 
-        # Offset
-        offset = data.get("offset", [0.0, 0.0])
-        offset_field = Vec2Field(offset[0], offset[1])
-        offset_field.value_committed.connect(lambda x, y, ox, oy: self.update_component(obj, "BoxCollider", "offset", [x, y]))
-        form.addRow(QLabel("Offset:"), offset_field)
-
-        # Is Trigger
-        is_trigger = data.get("is_trigger", False)
-        trigger_check = QCheckBox()
-        trigger_check.setChecked(is_trigger)
-        trigger_check.stateChanged.connect(lambda s: self.update_component(obj, "BoxCollider", "is_trigger", s == 2))
-        form.addRow(QLabel("Is Trigger:"), trigger_check)
-        
-        # Category
-        cat = data.get("category_bitmask", 1)
-        cat_field = FloatField(cat) 
-        cat_field.value_committed.connect(lambda v: self.update_component(obj, "BoxCollider", "category_bitmask", int(v)))
-        form.addRow(QLabel("Category (Bitmask):"), cat_field)
-
-        # Mask
-        mask = data.get("collision_mask", 0xFFFFFFFF)
-        mask_field = FloatField(mask)
-        mask_field.value_committed.connect(lambda v: self.update_component(obj, "BoxCollider", "collision_mask", int(v)))
-        form.addRow(QLabel("Mask (Bitmask):"), mask_field)
-
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
-        if data is None: data = {}
-        self.content_layout.addWidget(self.create_header("LightSource", obj, "LightSource"))
-
-        form = QFormLayout()
-        form.setContentsMargins(8, 4, 4, 4)
-        form.setSpacing(2)
-        form.setLabelAlignment(Qt.AlignRight)
+    def add_light_source_editor(self, section):
+        section.add(self.create_header("LightSource", section))
+        form = self.new_form()
 
         # Color
-        color = data.get("color", [255, 255, 255, 255])
-        col_field = ColorField(tuple(color))
-        col_field.value_changed.connect(lambda c: self.update_component(obj, "LightSource", "color", c))
+        col_field = section.field(ColorField(), "color", [255, 255, 255, 255])
+        col_field.value_changed.connect(lambda c: self.update_component(section.obj, "LightSource", "color", c))
         form.addRow(QLabel("Color:"), col_field)
 
         # Intensity
-        intensity = data.get("intensity", 1.0)
-        int_field = FloatField(intensity)
-        int_field.value_edited.connect(lambda v: self.preview_component(obj, "LightSource", "intensity", v))
-        int_field.value_committed.connect(lambda v: self.update_component(obj, "LightSource", "intensity", v))
+        int_field = section.field(FloatField(), "intensity", 1.0)
+        int_field.value_edited.connect(lambda v: self.preview_component(section.obj, "LightSource", "intensity", v))
+        int_field.value_committed.connect(lambda v: self.update_component(section.obj, "LightSource", "intensity", v))
         form.addRow(QLabel("Intensity:"), int_field)
 
         # Radius
-        radius = data.get("radius", 200.0)
-        rad_field = FloatField(radius)
-        rad_field.value_edited.connect(lambda v: self.preview_component(obj, "LightSource", "radius", v))
-        rad_field.value_committed.connect(lambda v: self.update_component(obj, "LightSource", "radius", v))
+        rad_field = section.field(FloatField(), "radius", 200.0)
+        rad_field.value_edited.connect(lambda v: self.preview_component(section.obj, "LightSource", "radius", v))
+        rad_field.value_committed.connect(lambda v: self.update_component(section.obj, "LightSource", "radius", v))
         form.addRow(QLabel("Radius:"), rad_field)
 
-        form_widget = QWidget()
-        form_widget.setLayout(form)
-        self.content_layout.addWidget(form_widget)
+        self.add_form(section, form)
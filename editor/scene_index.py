@@ -0,0 +1,59 @@
+"""
+Lookup tables over the editor's scene: id -> object and parent id -> children.
+
+EditorState rebuilds it on load and hands it every command pushed, undone or redone
+(Command.update_index), so lookups are O(1) instead of a scan of scene.objects. Parents
+are read from Transform.parent_id, as the hierarchy writes them; root objects are the
+children of None.
+"""
+
+def parent_of(obj):
+    return obj.get("components", {}).get("Transform", {}).get("parent_id") or None
+
+class SceneIndex:
+    def __init__(self):
+        self.objects = {} # id -> object dict
+        self.children = {} # parent id (None: roots) -> {child id: object dict}, scene order after a rebuild
+        self.parents = {} # id -> parent id it is filed under
+
+    def rebuild(self, scene):
+        self.objects.clear()
+        self.children.clear()
+        self.parents.clear()
+        if scene is not None:
+            for obj in scene.objects:
+                self.add(obj)
+
+    def add(self, obj):
+        obj_id = obj.get("id")
+        self.remove(self.objects.get(obj_id))
+        self.objects[obj_id] = obj
+        self._file(obj_id, obj, parent_of(obj))
+
+    def remove(self, obj):
+        """Drops obj. Does nothing if the index holds another object under its id (e.g. a restored copy)."""
+        if obj is None or self.objects.get(obj.get("id")) is not obj:
+            return
+        obj_id = obj["id"]
+        del self.objects[obj_id]
+        del self.children[self.parents.pop(obj_id)][obj_id]
+
+    def refresh(self, obj_id):
+        """Re-files obj_id under its current parent."""
+        obj = self.objects.get(obj_id)
+        if obj is None:
+            return
+        parent_id = parent_of(obj)
+        if self.parents.get(obj_id) != parent_id:
+            del self.children[self.parents[obj_id]][obj_id]
+            self._file(obj_id, obj, parent_id)
+
+    def _file(self, obj_id, obj, parent_id):
+        self.parents[obj_id] = parent_id
+        self.children.setdefault(parent_id, {})[obj_id] = obj
+
+    def get(self, obj_id):
+        return self.objects.get(obj_id)
+
+    def get_children(self, parent_id):
+        return list(self.children.get(parent_id or None, {}).values())
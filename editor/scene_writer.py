@@ -0,0 +1,270 @@
+"""
+Incremental scene saving for the editor.
+
+The JSON text of every object is cached. A save only re-serialises the objects marked
+dirty on EditorState (plus the small header: metadata, prefabs, settings) and joins the
+cached fragments, so Ctrl+S on a large scene costs about as much as the edits made since
+the last save. The output is byte-identical to json.dump(asdict(scene), f, indent=2).
+
+Disk writes run on a single background thread (saves and journal appends stay in order)
+and replace the scene file atomically: write <path>.tmp, fsync, os.replace.
+
+Autosave appends to <path>.journal, one JSON entry per line:
+    {"put": {...object...}}        object created or changed
+    {"order": [id, ...]}          object list after creates/deletes/reorders
+    {"header": {...}}             metadata / prefabs / settings changed
+A successful save truncates the journal, so a journal left on disk means the editor
+stopped before saving; replay_journal() rebuilds the unsaved scene from it.
+
+A save can also write the undo history (UndoStack.history_lines()) to <path>.undo. Its first line
+records the size and mtime of the scene file it belongs to; read_history() ignores it
+once the scene file has changed without it.
+"""
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List
+
+from shared import scene_binary
+
+JOURNAL_EXT = ".journal"
+HISTORY_EXT = ".undo"
+HEADER_KEYS = ("metadata", "prefabs", "settings")
+
+def write_atomic(path: str, data):
+    """Writes data (str or bytes) to path so readers only ever see the old or the new file."""
+    tmp_path = path + ".tmp"
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(tmp_path, mode) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def journal_path(scene_path: str) -> str:
+    return scene_path + JOURNAL_EXT
+
+def history_path(scene_path: str) -> str:
+    return scene_path + HISTORY_EXT
+
+def _fingerprint(path: str) -> Dict[str, int]:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def _indent(text: str, spaces: int) -> str:
+    return text.replace("\n", "\n" + " " * spaces)
+
+class SceneWriter:
+    def __init__(self):
+        self._fragments = {} # object id -> (object dict, JSON text indented for the objects list)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SceneWriter")
+
+        # What the journal already holds. A failed save resets it from the writer thread, hence the lock
+        self._journal_lock = threading.Lock()
+        self._journal_ids = set() # object ids changed since the last journal entry
+        self._journal_order = None
+        self._journal_header = None
+
+    def reset(self, scene=None):
+        """Forgets cached fragments (a different scene was loaded). scene is the journal's baseline."""
+        self._fragments.clear()
+        with self._journal_lock:
+            self._journal_ids.clear()
+            self._journal_order = [obj.get("id") for obj in scene.objects] if scene else None
+            self._journal_header = self._header_json(scene) if scene else None
+
+    def mark_dirty(self, obj_id: str):
+        self._fragments.pop(obj_id, None)
+        with self._journal_lock:
+            self._journal_ids.add(obj_id)
+
+    def _fragment(self, obj: Dict[str, Any]) -> str:
+        obj_id = obj.get("id")
+        entry = self._fragments.get(obj_id)
+        if entry is not None and entry[0] is obj:
+            return entry[1]
+        # Objects sit two levels deep in the file ({ "objects": [ ... ] })
+        text = "    " + _indent(json.dumps(obj, indent=2), 4)
+        self._fragments[obj_id] = (obj, text)
+        return text
+
+    def serialize(self, scene) -> str:
+        """Scene JSON text; only objects without a cached fragment are serialised."""
+        parts = []
+        for key, value in (("metadata", scene.metadata), ("objects", None),
+                           ("prefabs", scene.prefabs), ("settings", scene.settings)):
+            if key == "objects":
+                if scene.objects:
+                    live = set()
+                    fragments = []
+                    for obj in scene.objects:
+                        live.add(obj.get("id"))
+                        fragments.append(self._fragment(obj))
+                    body = "[\n" + ",\n".join(fragments) + "\n  ]"
+                    # Drop fragments of deleted objects
+                    if len(self._fragments) > len(live):
+                        for obj_id in [i for i in self._fragments if i not in live]:
+                            del self._fragments[obj_id]
+                else:
+                    body = "[]"
+            else:
+                body = _indent(json.dumps(value, indent=2), 2)
+            parts.append(f'  "{key}": {body}')
+        return "{\n" + ",\n".join(parts) + "\n}"
+
+    def save(self, scene, path: str, on_done=None, history=None):
+        """
+        Serialises on the calling (UI) thread, then writes in the background.
+        history: undo history lines to keep in <path>.undo, joined by the writer (None or empty: remove it).
+        on_done(path, error) is called from the writer thread; error is "" on success.
+        Returns a Future.
+        """
+        if path.endswith(scene_binary.BINARY_EXT):
+            # The binary format has no per-object layout to reuse; encode the whole scene
+            data = scene_binary.dumps({"metadata": scene.metadata, "objects": scene.objects,
+                                       "prefabs": scene.prefabs, "settings": scene.settings})
+        else:
+            data = self.serialize(scene)
+
+        # The file will hold everything the journal would have to replay (undone below if the write fails)
+        with self._journal_lock:
+            self._journal_ids.clear()
+            self._journal_order = [obj.get("id") for obj in scene.objects]
+            self._journal_header = self._header_json(scene)
+
+        def job():
+            error = ""
+            try:
+                write_atomic(path, data)
+                journal = journal_path(path)
+                if os.path.exists(journal):
+                    os.remove(journal)
+                self._write_history(path, history)
+            except Exception as e:
+                print(f"Error saving scene to {path}: {e}")
+                error = str(e)
+                with self._journal_lock:
+                    # Nothing reached the disk: the next journal entry records every object and the header
+                    self._journal_order = None
+                    self._journal_header = None
+            if on_done:
+                on_done(path, error)
+            return error
+
+        return self._executor.submit(job)
+
+    @staticmethod
+    def _write_history(path: str, history: Optional[List[str]]):
+        target = history_path(path)
+        try:
+            if history:
+                write_atomic(target, "\n".join([json.dumps(_fingerprint(path))] + history))
+            elif os.path.exists(target):
+                os.remove(target)
+        except Exception as e:
+            # The scene itself is saved; only undo across restarts is lost
+            print(f"Warning: Could not write undo history {target}: {e}")
+
+    @staticmethod
+    def read_history(path: str) -> Optional[str]:
+        """The undo history saved with path, or None if there is none or the scene file has changed since."""
+        try:
+            with open(history_path(path), "r") as f:
+                header = f.readline()
+                if not header or json.loads(header) != _fingerprint(path):
+                    return None
+                return f.read()
+        except (OSError, ValueError):
+            return None
+
+    # --- Journal ---
+    @staticmethod
+    def _header_json(scene) -> str:
+        return json.dumps({key: getattr(scene, key) for key in HEADER_KEYS})
+
+    def append_journal(self, scene, path: str):
+        """Appends the changes made since the last journal entry or save. Returns the number of entries."""
+        lines = []
+        header = self._header_json(scene)
+        order = [obj.get("id") for obj in scene.objects]
+        with self._journal_lock:
+            if header != self._journal_header:
+                lines.append('{"header": ' + header + '}')
+                self._journal_header = header
+
+            if order != self._journal_order:
+                lines.append(json.dumps({"order": order}))
+                # Objects added without a command (e.g. prefab drops) were never marked dirty
+                known = set(self._journal_order or ())
+                self._journal_ids.update(obj_id for obj_id in order if obj_id not in known)
+                self._journal_order = order
+
+            if self._journal_ids:
+                for obj in scene.objects:
+                    if obj.get("id") in self._journal_ids:
+                        lines.append(json.dumps({"put": obj}))
+                self._journal_ids.clear()
+
+        if lines:
+            text = "\n".join(lines) + "\n"
+            journal = journal_path(path)
+
+            def job():
+                try:
+                    with open(journal, "a") as f:
+                        f.write(text)
+                        f.flush()
+                        os.fsync(f.fileno())
+                except Exception as e:
+                    print(f"Warning: Could not write autosave journal {journal}: {e}")
+
+            self._executor.submit(job)
+        return len(lines)
+
+    @staticmethod
+    def has_journal(path: str) -> bool:
+        journal = journal_path(path)
+        return os.path.exists(journal) and os.path.getsize(journal) > 0
+
+    @staticmethod
+    def replay_journal(path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Applies the journal of path to the scene data loaded from path. Returns the recovered data."""
+        objects = {obj.get("id"): obj for obj in data.get("objects", [])}
+        order: Optional[List[str]] = None
+
+        with open(journal_path(path), "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break # Torn final write from the crash
+                if "put" in entry:
+                    objects[entry["put"].get("id")] = entry["put"]
+                elif "order" in entry:
+                    order = entry["order"]
+                elif "header" in entry:
+                    data.update(entry["header"])
+
+        if order is None:
+            order = [obj.get("id") for obj in data.get("objects", [])]
+            known = set(order)
+            order += [obj_id for obj_id in objects if obj_id not in known]
+        data["objects"] = [objects[obj_id] for obj_id in order if obj_id in objects]
+        return data
+
+    @staticmethod
+    def discard_journal(path: str):
+        journal = journal_path(path)
+        if os.path.exists(journal):
+            os.remove(journal)
+
+    def flush(self):
+        """Blocks until every queued write has finished."""
+        self._executor.submit(lambda: None).result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,79 @@
+"""
+Cached script metadata for the inspector.
+
+ScriptMetadataService keeps the ScriptMetadata of each script, keyed by its path and
+(mtime, size) when it was read. get() never parses on the calling (UI) thread: a miss
+queues the file on a worker thread and returns None (or the previous metadata); once it
+is parsed, metadata_changed is emitted on the UI thread. A QFileSystemWatcher re-queues
+scripts edited on disk, so the inspector follows them without being reopened.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal, QFileSystemWatcher
+
+from editor.script_parser import ScriptParser, ScriptMetadata
+
+def _fingerprint(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+class ScriptMetadataService(QObject):
+    metadata_changed = Signal(str) # Script path whose metadata differs from what get() returned before
+    _parsed = Signal(str, object, object) # path, fingerprint, ScriptMetadata; emitted from the parser thread
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cache = {} # path -> (fingerprint, ScriptMetadata)
+        self._pending = {} # path -> fingerprint queued for parsing
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ScriptParser")
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._parsed.connect(self._on_parsed)
+
+    def get(self, path):
+        """Metadata of the script at path, or None until its first parse finishes. No disk access once cached."""
+        cached = self._cache.get(path)
+        if cached is None:
+            self._request(path)
+            return None
+        return cached[1]
+
+    def _request(self, path):
+        fingerprint = _fingerprint(path)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == fingerprint:
+            return # Unchanged (e.g. only touched)
+        if path in self._pending and self._pending[path] == fingerprint:
+            return
+        self._pending[path] = fingerprint
+        if fingerprint is not None and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+        def job():
+            meta = ScriptParser.parse_metadata(path) if fingerprint is not None else ScriptMetadata()
+            self._parsed.emit(path, fingerprint, meta)
+
+        self._executor.submit(job)
+
+    def _on_parsed(self, path, fingerprint, meta):
+        if self._pending.get(path) != fingerprint:
+            return # Superseded by a newer request
+        del self._pending[path]
+        previous = self._cache.get(path)
+        self._cache[path] = (fingerprint, meta)
+        if previous is None or previous[1] != meta:
+            self.metadata_changed.emit(path)
+
+    def _on_file_changed(self, path):
+        # Editors that save by replacing the file drop it from the watcher: watch the new one
+        if path not in self._watcher.files() and os.path.exists(path):
+            self._watcher.addPath(path)
+        self._request(path)
+
+    def flush(self):
+        """Blocks until the queued parses are done (their results still arrive through the event loop)."""
+        self._executor.submit(lambda: None).result()
@@ -2,54 +2,114 @@
 import ast
 import os
 
+# Default for a property declared with a type hint but no value (e.g. "speed: float")
+HINT_DEFAULTS = {"bool": False, "int": 0, "float": 0.0, "str": ""}
+
+class ScriptMetadata:
+    """Editable properties of a script: default values, and type hints where the script gives them."""
+    def __init__(self, properties=None, hints=None):
+        self.properties = properties if properties is not None else {} # name -> default value
+        self.hints = hints if hints is not None else {} # name -> annotation source, e.g. "float"
+
+    def __eq__(self, other):
+        return isinstance(other, ScriptMetadata) and self.properties == other.properties and self.hints == other.hints
+
+    def kind(self, name):
+        """Editor type of a property: "bool", "int", "float" or "str" (None: not editable)."""
+        hint = self.hints.get(name)
+        if hint in HINT_DEFAULTS:
+            return hint
+        value = self.properties.get(name)
+        for kind in ("bool", "int", "float", "str"): # bool first: it is an int subclass
+            if type(value).__name__ == kind:
+                return kind
+        return None
+
+    def fields(self):
+        """(name, kind, default) of every editable property, in script order."""
+        return [(name, self.kind(name), value) for name, value in self.properties.items() if self.kind(name)]
+
 class ScriptParser:
     """Extracts default property values from Python scripts."""
-    
+
     @staticmethod
     def parse_properties(script_path):
         """
-        Parses a python script and finds variable assignments in start() or __init__.
+        Parses a python script and finds its properties.
         Returns a dictionary of {var_name: default_value}.
         Only supports simple literals (int, float, str, bool).
         """
-        props = {}
-        
+        return ScriptParser.parse_metadata(script_path).properties
+
+    @staticmethod
+    def parse_metadata(script_path):
+        """Reads and parses script_path. Returns an empty ScriptMetadata if it is missing or broken."""
         if not os.path.exists(script_path):
-            return props
-            
+            return ScriptMetadata()
+
         try:
             with open(script_path, "r") as f:
-                tree = ast.parse(f.read(), filename=script_path)
-                
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    # Check methods inside the class
-                    for item in node.body:
-                        if isinstance(item, ast.FunctionDef) and item.name in ["__init__", "start"]:
-                            ScriptParser._extract_assignments(item, props)
-                            
+                return ScriptParser.parse_source(f.read(), script_path)
         except Exception as e:
             print(f"Error parsing script {script_path}: {e}")
-            
-        return props
+        return ScriptMetadata()
 
     @staticmethod
-    def _extract_assignments(func_node, props):
+    def parse_source(source, filename="<script>"):
+        """
+        Properties of the classes in source: class-level attributes (target_name = "Player",
+        speed: float = 5.0), then self.var assignments in start() or __init__, which override
+        them as they do at runtime. Raises SyntaxError.
+        """
+        meta = ScriptMetadata()
+        tree = ast.parse(source, filename=filename)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                for item in node.body:
+                    if isinstance(item, (ast.Assign, ast.AnnAssign)):
+                        ScriptParser._extract_assignment(item, meta, ast.Name)
+                    # Check methods inside the class
+                    elif isinstance(item, ast.FunctionDef) and item.name in ["__init__", "start"]:
+                        ScriptParser._extract_assignments(item, meta)
+        return meta
+
+    @staticmethod
+    def _extract_assignments(func_node, meta):
         for stmt in func_node.body:
             # Look for self.var = value
-            if isinstance(stmt, ast.Assign):
-                for target in stmt.targets:
-                    if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name):
-                        if target.value.id == "self":
-                            var_name = target.attr
-                            
-                            # Filter out protected/private vars
-                            if var_name.startswith("_"):
-                                continue
-                                
-                            val = ScriptParser._get_literal_value(stmt.value)
-                            if val is not None:
-                                props[var_name] = val
+            if isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+                ScriptParser._extract_assignment(stmt, meta, ast.Attribute)
+
+    @staticmethod
+    def _extract_assignment(stmt, meta, target_type):
+        targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+        for target in targets:
+            if not isinstance(target, target_type):
+                continue
+            if target_type is ast.Attribute:
+                if not (isinstance(target.value, ast.Name) and target.value.id == "self"):
+                    continue
+                var_name = target.attr
+            else:
+                var_name = target.id
+
+            # Filter out protected/private vars
+            if var_name.startswith("_"):
+                continue
+
+            hint = None
+            if isinstance(stmt, ast.AnnAssign):
+                hint = ast.unparse(stmt.annotation)
+                meta.hints[var_name] = hint
+
+            val = ScriptParser._get_literal_value(stmt.value) if stmt.value is not None else None
+            if val is None:
+                if stmt.value is None and hint in HINT_DEFAULTS and var_name not in meta.properties:
+                    meta.properties[var_name] = HINT_DEFAULTS[hint]
+                continue
+            if hint == "float" and isinstance(val, int) and not isinstance(val, bool):
+                val = float(val) # speed: float = 5
+            meta.properties[var_name] = val
 
     @staticmethod
     def _get_literal_value(node):
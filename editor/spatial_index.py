@@ -0,0 +1,155 @@
+"""
+Quadtree over axis-aligned rectangles, for editor hit-testing.
+
+Rects are (x0, y0, x1, y1) tuples in world space. Each entry lives in the smallest node
+that fully contains it, so an entry straddling a split line stays in the parent; nodes
+split once they hold more than MAX_ITEMS entries. The root doubles in size towards
+entries outside it, so the world needs no fixed bounds.
+
+Keys are any hashable (the canvas uses its DisplayItems). update() is remove + insert,
+both O(depth).
+"""
+import math
+
+class _Node:
+    __slots__ = ("x0", "y0", "x1", "y1", "items", "children")
+
+    def __init__(self, x0, y0, x1, y1):
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        self.items = {} # key -> rect
+        self.children = None # [top-left, top-right, bottom-left, bottom-right]
+
+    def contains(self, rect):
+        return self.x0 <= rect[0] and self.y0 <= rect[1] and rect[2] <= self.x1 and rect[3] <= self.y1
+
+    def child_for(self, rect):
+        """Index of the quadrant fully containing rect, or None if it straddles a split line."""
+        mx = (self.x0 + self.x1) / 2
+        my = (self.y0 + self.y1) / 2
+        if rect[2] <= mx: col = 0
+        elif rect[0] >= mx: col = 1
+        else: return None
+        if rect[3] <= my: row = 0
+        elif rect[1] >= my: row = 2
+        else: return None
+        return col + row
+
+    def split(self):
+        mx = (self.x0 + self.x1) / 2
+        my = (self.y0 + self.y1) / 2
+        self.children = [_Node(self.x0, self.y0, mx, my), _Node(mx, self.y0, self.x1, my),
+                         _Node(self.x0, my, mx, self.y1), _Node(mx, my, self.x1, self.y1)]
+
+class QuadTree:
+    MAX_ITEMS = 8
+    MIN_SIZE = 16.0 # Nodes smaller than this do not split further
+
+    def __init__(self, size=1024.0):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self.root = _Node(-self.size, -self.size, self.size, self.size)
+        self._nowhere = _Node(math.nan, math.nan, math.nan, math.nan) # Outside the tree: non-finite rects
+        self._where = {} # key -> node holding it
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def insert(self, key, rect):
+        if key in self._where:
+            self.remove(key)
+        if not all(math.isfinite(v) for v in rect):
+            # NaN/inf positions: kept, but never hit
+            self._nowhere.items[key] = rect
+            self._where[key] = self._nowhere
+            return
+        while not self.root.contains(rect):
+            self._grow(rect)
+
+        node = self.root
+        while node.children is not None:
+            index = node.child_for(rect)
+            if index is None:
+                break
+            node = node.children[index]
+        node.items[key] = rect
+        self._where[key] = node
+
+        if node.children is None and len(node.items) > self.MAX_ITEMS and node.x1 - node.x0 > self.MIN_SIZE:
+            node.split()
+            for item_key, item_rect in list(node.items.items()):
+                index = node.child_for(item_rect)
+                if index is not None:
+                    del node.items[item_key]
+                    node.children[index].items[item_key] = item_rect
+                    self._where[item_key] = node.children[index]
+
+    def remove(self, key):
+        node = self._where.pop(key, None)
+        if node is not None:
+            del node.items[key]
+
+    def update(self, key, rect):
+        self.insert(key, rect)
+
+    def _grow(self, rect):
+        # Double the root towards rect; the old root becomes one quadrant of the new one
+        old = self.root
+        w = old.x1 - old.x0
+        h = old.y1 - old.y0
+        left = rect[0] < old.x0
+        up = rect[1] < old.y0
+        x0 = old.x0 - w if left else old.x0
+        y0 = old.y0 - h if up else old.y0
+        root = _Node(x0, y0, x0 + 2 * w, y0 + 2 * h)
+        root.split()
+        root.children[(1 if left else 0) + (2 if up else 0)] = old
+        self.root = root
+
+    def query_point(self, x, y):
+        """Keys whose rect contains (x, y)."""
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for key, r in node.items.items():
+                if r[0] <= x <= r[2] and r[1] <= y <= r[3]:
+                    found.append(key)
+            if node.children is not None:
+                for child in node.children:
+                    if child.x0 <= x <= child.x1 and child.y0 <= y <= child.y1:
+                        stack.append(child)
+        return found
+
+    def query_rect(self, rect):
+        """Keys whose rect intersects rect (x0, y0, x1, y1)."""
+        x0, y0, x1, y1 = rect
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if x0 <= node.x0 and y0 <= node.y0 and node.x1 <= x1 and node.y1 <= y1:
+                # Node inside the query: take its whole subtree untested
+                self._collect(node, found)
+                continue
+            for key, r in node.items.items():
+                if r[0] <= x1 and x0 <= r[2] and r[1] <= y1 and y0 <= r[3]:
+                    found.append(key)
+            if node.children is not None:
+                for child in node.children:
+                    if child.x0 <= x1 and x0 <= child.x1 and child.y0 <= y1 and y0 <= child.y1:
+                        stack.append(child)
+        return found
+
+    @staticmethod
+    def _collect(node, found):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            found.extend(node.items)
+            if node.children is not None:
+                stack.extend(node.children)
@@ -1,8 +1,50 @@
-import copy
+"""
+Undoable editor commands and the history that holds them.
+
+Commands keep deltas, not snapshots. Values are shared when immutable (numbers, strings),
+flat lists are kept as tuples and anything nested as compact JSON text; each is turned
+back into a fresh list or dict every time it is applied. Objects a command takes out of the scene (deleted objects, removed components)
+are kept as they are rather than copied: history is linear, so nothing edits them while
+they are out, and undo puts the same dicts back. Later commands that reference them stay
+valid.
+
+UndoStack keeps its history in a deque trimmed to a byte budget (Command.size()), and
+can write it to text (dumps/loads) so EditorState can keep it next to the saved scene.
+"""
+import json
 from abc import ABC, abstractmethod
-from dataclasses import asdict
+from collections import deque
+from itertools import islice
+
+from editor.scene_index import parent_of
+
+DEFAULT_HISTORY_BYTES = 64 * 1024 * 1024
+COMMAND_OVERHEAD = 200 # Rough bytes of a command object and its attributes
+
+class _Json(str):
+    """A nested list or dict value held as compact JSON text."""
+    __slots__ = ()
+
+def pack(value):
+    if isinstance(value, (list, tuple)) and not any(isinstance(v, (list, tuple, dict)) for v in value):
+        return tuple(value) # Positions, sizes, colours: shares the numbers, no parsing to restore
+    if isinstance(value, (list, tuple, dict)):
+        return _Json(json.dumps(value, separators=(",", ":")))
+    return value
+
+def unpack(value):
+    if isinstance(value, tuple):
+        return list(value)
+    return json.loads(value) if isinstance(value, _Json) else value
+
+def packed_size(value):
+    if isinstance(value, tuple):
+        return 56 + 8 * len(value)
+    return len(value) if isinstance(value, str) else 16
 
 class Command(ABC):
+    saved_line = None # to_data() as JSON text, cached by UndoStack.history_lines(); a merge clears it
+
     @abstractmethod
     def undo(self):
         pass
@@ -18,38 +60,75 @@ class Command(ABC):
         """
         return False
 
+    def touched_ids(self):
+        """Ids of the scene objects this command changes (for change tracking)."""
+        return []
+
+    def update_index(self, index):
+        """Brings a SceneIndex in line with this command's current state (done or undone)."""
+        for obj_id in self.touched_ids():
+            index.refresh(obj_id)
+
+    def size(self) -> int:
+        """Approximate bytes the command keeps alive (history budget)."""
+        return COMMAND_OVERHEAD
+
+    def to_data(self):
+        """JSON-ready record of the command in its done state, or None if it cannot be saved."""
+        return None
+
 class UndoStack:
-    def __init__(self):
-        self._history = []
+    def __init__(self, max_bytes=DEFAULT_HISTORY_BYTES):
+        self._history = deque()
         self._redo_stack = []
-        self.max_history = 50
+        self.max_bytes = max_bytes # Oldest commands are dropped beyond this (the newest is always kept)
+        self.history_bytes = 0 # Sum of size() over _history and _redo_stack
+        self.listeners = [] # Called with each command pushed, undone or redone, after it has run
+
+    def _notify(self, command):
+        for listener in self.listeners:
+            listener(command)
 
     def push(self, command: Command):
+        """Records a command that has just been executed (redo() first, then push)."""
         # Try to merge with top of stack
+        self._notify(command)
         if self._history:
-            if self._history[-1].merge_with(command):
+            top = self._history[-1]
+            before = top.size()
+            if top.merge_with(command):
+                self.history_bytes += top.size() - before
+                top.saved_line = None
                 return # Merged successfully, no need to push or clear redo
-        
+
         self._history.append(command)
+        self.history_bytes += command.size()
+        for cmd in self._redo_stack:
+            self.history_bytes -= cmd.size()
         self._redo_stack.clear()
-        if len(self._history) > self.max_history:
-            self._history.pop(0)
+        self._trim()
+
+    def _trim(self):
+        while self.history_bytes > self.max_bytes and len(self._history) > 1:
+            self.history_bytes -= self._history.popleft().size()
 
     def undo(self):
         if not self._history:
             return
-        
+
         cmd = self._history.pop()
         cmd.undo()
         self._redo_stack.append(cmd)
+        self._notify(cmd)
 
     def redo(self):
         if not self._redo_stack:
             return
-            
+
         cmd = self._redo_stack.pop()
         cmd.redo()
         self._history.append(cmd)
+        self._notify(cmd)
 
     def can_undo(self):
         return len(self._history) > 0
@@ -57,86 +136,243 @@ class UndoStack:
     def can_redo(self):
         return len(self._redo_stack) > 0
 
+    def clear(self):
+        self._history.clear()
+        self._redo_stack.clear()
+        self.history_bytes = 0
+
+    def history_lines(self):
+        """
+        The undo history as JSON lines, oldest first. Redo steps are not kept, and neither is
+        anything older than a command that cannot be saved. Each command is serialised once
+        (saved_line), so a save only pays for the commands added or merged since the last one.
+        """
+        lines = []
+        for cmd in reversed(self._history):
+            if cmd.saved_line is None:
+                data = cmd.to_data()
+                if data is None:
+                    break
+                cmd.saved_line = json.dumps(data, separators=(",", ":"))
+            lines.append(cmd.saved_line)
+        lines.reverse()
+        return lines
+
+    def dumps(self) -> str:
+        return "\n".join(self.history_lines())
+
+    def loads(self, text, scene):
+        """
+        Replaces the history with one written by dumps() for the scene as it is now (its
+        commands are all done). Returns the number of commands restored.
+        """
+        self.clear()
+        # Newest first: a delete brings its objects back for the commands before it
+        objects = {obj.get("id"): obj for obj in scene.objects}
+        commands = []
+        for line in reversed([line for line in text.splitlines() if line.strip()]):
+            try:
+                cmd = command_from_data(json.loads(line), scene, objects)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Undo history stops at an unreadable entry: {e}")
+                break
+            cmd.saved_line = line
+            commands.append(cmd)
+        for cmd in reversed(commands):
+            self._history.append(cmd)
+            self.history_bytes += cmd.size()
+        self._trim()
+        return len(self._history)
+
+def command_from_data(data, scene, objects):
+    """Rebuilds a command from to_data(). objects (id -> dict) is updated to the scene before it."""
+    kind = data["type"]
+    if kind == "compound":
+        # Children were recorded in order; resolve them newest first as well
+        children = [command_from_data(child, scene, objects) for child in reversed(data["commands"])]
+        return CompoundCommand(reversed(children))
+    if kind == "create":
+        cmd = CreateObjectCommand(scene, data["object"], data.get("index"))
+        cmd.created_obj = objects.pop(data["object"]["id"])
+        cmd.done = True
+        return cmd
+    if kind == "delete":
+        cmd = DeleteObjectsCommand(scene, [], {})
+        cmd.target_ids = data["targets"]
+        cmd.objects_to_delete = [(index, obj) for index, obj in data["objects"]]
+        for _, obj in cmd.objects_to_delete:
+            objects[obj["id"]] = obj
+        return cmd
+
+    # Built from the record alone: the object is in its latest state, which may lack what the
+    # command touched (e.g. a component a newer command removed)
+    obj = objects[data["id"]]
+    if kind == "change":
+        cmd = ChangeComponentCommand.__new__(ChangeComponentCommand)
+        cmd.obj = obj
+        cmd.comp_name = data["component"]
+        cmd.key = data["key"]
+        cmd._new = pack(data["new"])
+        cmd._old = pack(data["old"])
+    elif kind == "rename":
+        cmd = RenameObjectCommand.__new__(RenameObjectCommand)
+        cmd.obj = obj
+        cmd.new_name = data["new"]
+        cmd.old_name = data["old"]
+    elif kind == "add_component":
+        cmd = AddComponentCommand.__new__(AddComponentCommand)
+        cmd.obj = obj
+        cmd.comp_name = data["component"]
+        cmd._data = pack(data["data"])
+    elif kind == "remove_component":
+        cmd = RemoveComponentCommand.__new__(RemoveComponentCommand)
+        cmd.obj = obj
+        cmd.comp_name = data["component"]
+        cmd.old_data = data["data"]
+        cmd._size = COMMAND_OVERHEAD + len(json.dumps(cmd.old_data))
+    elif kind == "script_property":
+        cmd = SetScriptPropertyCommand.__new__(SetScriptPropertyCommand)
+        cmd.obj = obj
+        cmd.key = data["key"]
+        cmd._new = pack(data["new"])
+        cmd._old = pack(data["old"])
+        cmd.was_set = data["was_set"]
+        cmd.had_properties = data["had_properties"]
+    elif kind == "reparent":
+        cmd = ReparentCommand.__new__(ReparentCommand)
+        cmd.scene = scene
+        cmd.obj_data = obj
+        cmd.new_parent_id = data["new"]
+        cmd.old_parent_id = data["old"]
+    else:
+        raise ValueError(f"unknown command type {kind!r}")
+    return cmd
+
 class CreateObjectCommand(Command):
     def __init__(self, scene, obj_data, index=None):
         self.scene = scene
-        # Deepcopy to ensure the template is isolated from future edits
-        self.obj_data = copy.deepcopy(obj_data)
+        # Snapshot (JSON text) isolates the command from later edits to the template
+        self.snapshot = pack(obj_data)
+        self.obj_id = obj_data.get("id")
         self.index = index
-        self.created_obj = None
+        self.created_obj = None # Built on the first redo, then re-inserted as is
+        self.done = False
+
+    @property
+    def obj_data(self):
+        return unpack(self.snapshot)
 
     def redo(self):
-        # Create a FRESH copy each time to ensure isolation
-        self.created_obj = copy.deepcopy(self.obj_data)
+        if self.created_obj is None:
+            self.created_obj = self.obj_data
         if self.index is not None:
             self.scene.objects.insert(self.index, self.created_obj)
         else:
             self.scene.objects.append(self.created_obj)
+        self.done = True
 
     def undo(self):
-        if self.created_obj in self.scene.objects:
-            self.scene.objects.remove(self.created_obj)
+        # By identity: another object may hold equal data
+        objects = self.scene.objects
+        i = self.index if self.index is not None else len(objects) - 1
+        if not (0 <= i < len(objects) and objects[i] is self.created_obj):
+            i = next((j for j, obj in enumerate(objects) if obj is self.created_obj), None)
+        if i is not None:
+            objects.pop(i)
+        self.done = False
+
+    def touched_ids(self):
+        return [self.obj_id]
+
+    def update_index(self, index):
+        if self.done:
+            index.add(self.created_obj)
+        else:
+            index.remove(self.created_obj)
 
-class DeleteObjectCommand(Command):
-    def __init__(self, scene, target_id):
+    def size(self):
+        return COMMAND_OVERHEAD + len(self.snapshot)
+
+    def to_data(self):
+        return {"type": "create", "object": self.obj_data, "index": self.index}
+
+class DeleteObjectsCommand(Command):
+    """
+    Deletes objects and all their descendants as one step.
+
+    The subtrees are walked through a parent id -> children map (SceneIndex.children, or one
+    built from Transform.parent_id in a single pass), so collecting them is linear in the
+    scene size however many objects are deleted. redo() filters the object list once and
+    undo() merges the objects back at their recorded positions, both O(scene + deleted):
+    history is linear, so the scene is in the same state each time either runs.
+    """
+    def __init__(self, scene, target_ids, children=None):
         self.scene = scene
-        self.target_id = target_id
-        # We store the objects themselves (dicts) to be able to restore them.
-        # We must capture the WHOLE subtree at init time.
-        self.objects_to_delete = [] # List of (index, object_dict)
-        
-        # 1. Find all descendants recursively
-        to_check = [target_id]
-        ids_to_delete = set()
-        
-        # Build set of all IDs in subtree
-        while to_check:
-            current_id = to_check.pop(0)
-            ids_to_delete.add(current_id)
-            # Find children
-            for obj in self.scene.objects:
-                if obj.get("parent") == current_id:
-                    to_check.append(obj.get("id"))
-        
-        # 2. Store them with their original indices
-        
-        # Find all objects to delete
-        for i, obj in enumerate(self.scene.objects):
-            if obj.get("id") in ids_to_delete:
-                # DEEPCOPY to save state exactly as it was at deletion time
-                self.objects_to_delete.append((i, copy.deepcopy(obj)))
-        
-        # Sort by index descending so we can pop without invalidating lower indices
-        self.objects_to_delete.sort(key=lambda x: x[0], reverse=True)
+        self.target_ids = list(target_ids)
+        self.restored = [] # Objects put back by the last undo
+        self._size = None
+
+        if children is None:
+            children = {}
+            for obj in scene.objects:
+                children.setdefault(parent_of(obj), {})[obj.get("id")] = obj
+
+        # Ids of every object in the subtrees (targets may overlap or contain each other)
+        ids = set()
+        stack = list(self.target_ids)
+        while stack:
+            obj_id = stack.pop()
+            if obj_id in ids:
+                continue
+            ids.add(obj_id)
+            stack.extend(children.get(obj_id, ()))
+
+        # (position in scene.objects, object), ascending. Kept, not copied: out of the scene
+        # nothing edits them, and undo restores these same dicts
+        self.objects_to_delete = [(i, obj) for i, obj in enumerate(scene.objects) if obj.get("id") in ids]
 
     def redo(self):
-        # Delete from highest index to lowest
-        # We need to find objects by ID or assume index integrity?
-        # If other commands ran, indices might shift. 
-        # But Undo/Redo is linear.
-        # Wait, if I undo Delete, then I add valid commands, Redo Stack is cleared.
-        # So indices should match unless I have a bug.
-        for index, obj_snap in self.objects_to_delete:
-            # We search for the object with matching ID at the expected index or nearby?
-            # Or just blindly pop index? Safest for simple lists.
-            # But if we assume linear history:
-            if 0 <= index < len(self.scene.objects):
-                 # Verify ID match if possible?
-                 if self.scene.objects[index]["id"] == obj_snap["id"]:
-                     self.scene.objects.pop(index)
-                 else:
-                     # Fallback: search by ID
-                     for j, o in enumerate(self.scene.objects):
-                         if o["id"] == obj_snap["id"]:
-                             self.scene.objects.pop(j)
-                             break
+        self.restored = []
+        doomed = set(id(obj) for _, obj in self.objects_to_delete)
+        # In place: other views hold on to the list
+        self.scene.objects[:] = [obj for obj in self.scene.objects if id(obj) not in doomed]
 
     def undo(self):
-        # Restore in original order (ascending index)
-        to_restore = sorted(self.objects_to_delete, key=lambda x: x[0])
-        for index, obj_snap in to_restore:
-            # Insert a COPY to ensure multiple undo/redos don't link states
-            self.scene.objects.insert(index, copy.deepcopy(obj_snap))
+        remaining = iter(self.scene.objects)
+        merged = []
+        for index, obj in self.objects_to_delete:
+            merged.extend(islice(remaining, index - len(merged)))
+            merged.append(obj)
+        merged.extend(remaining)
+        self.scene.objects[:] = merged
+        self.restored = [obj for _, obj in self.objects_to_delete]
+
+    def touched_ids(self):
+        return [obj.get("id") for _, obj in self.objects_to_delete]
+
+    def update_index(self, index):
+        if self.restored:
+            for obj in self.restored:
+                index.add(obj)
+        else:
+            for _, obj in self.objects_to_delete:
+                index.remove(obj)
+
+    def size(self):
+        if self._size is None:
+            # Measured once: the deleted objects do not change while the command is in history
+            self._size = COMMAND_OVERHEAD + len(json.dumps([obj for _, obj in self.objects_to_delete], separators=(",", ":")))
+        return self._size
+
+    def to_data(self):
+        return {"type": "delete", "targets": self.target_ids,
+                "objects": [[index, obj] for index, obj in self.objects_to_delete]}
+
+class DeleteObjectCommand(DeleteObjectsCommand):
+    """Deletes one object and its descendants."""
+    def __init__(self, scene, target_id, children=None):
+        super().__init__(scene, [target_id], children)
+        self.target_id = target_id
 
 class RenameObjectCommand(Command):
     def __init__(self, obj, new_name):
@@ -150,62 +386,164 @@ class RenameObjectCommand(Command):
     def undo(self):
         self.obj["name"] = self.old_name
 
+    def touched_ids(self):
+        return [self.obj.get("id")]
+
+    def size(self):
+        return COMMAND_OVERHEAD + len(self.new_name) + len(self.old_name)
+
+    def to_data(self):
+        return {"type": "rename", "id": self.obj.get("id"), "old": self.old_name, "new": self.new_name}
+
 class ChangeComponentCommand(Command):
     def __init__(self, obj, comp_name, key, new_value):
         self.obj = obj
         self.comp_name = comp_name
         self.key = key
-        # DEEPCOPY values to prevent reference pollution
-        self.new_value = copy.deepcopy(new_value)
-        
-        val = obj["components"][comp_name].get(key)
-        self.old_value = copy.deepcopy(val)
+        # Packed (JSON text for lists/dicts): isolated from the object and from each other
+        self._new = pack(new_value)
+        self._old = pack(obj["components"][comp_name].get(key))
+
+    # Read as fresh copies, so callers can never edit the recorded values in place
+    @property
+    def new_value(self):
+        return unpack(self._new)
+
+    @new_value.setter
+    def new_value(self, value):
+        self._new = pack(value)
+
+    @property
+    def old_value(self):
+        return unpack(self._old)
+
+    @old_value.setter
+    def old_value(self, value):
+        self._old = pack(value)
 
     def redo(self):
-        # Deepcopy on assignment too? 
-        # Usually self.new_value is isolated enough, but inserting it into obj
-        # means obj holds ref to it.
-        # If obj modifies it, self.new_value is modified?
-        # YES. So we must put deepcopy(self.new_value) into obj.
-        self.obj["components"][self.comp_name][self.key] = copy.deepcopy(self.new_value)
+        self.obj["components"][self.comp_name][self.key] = unpack(self._new)
 
     def undo(self):
-        self.obj["components"][self.comp_name][self.key] = copy.deepcopy(self.old_value)
+        self.obj["components"][self.comp_name][self.key] = unpack(self._old)
+
+    def touched_ids(self):
+        return [self.obj.get("id")]
+
+    def same_target(self, other) -> bool:
+        """True if other edits the exact same property on the exact same object."""
+        return (isinstance(other, ChangeComponentCommand) and
+                self.obj["id"] == other.obj["id"] and
+                self.comp_name == other.comp_name and
+                self.key == other.key)
 
     def merge_with(self, other) -> bool:
         if not isinstance(other, ChangeComponentCommand):
             return False
-        
-        # Check if it's the exact same property on the exact same object
-        if (self.obj["id"] == other.obj["id"] and 
-            self.comp_name == other.comp_name and 
-            self.key == other.key):
-            
+
+        if self.same_target(other):
             # Merge: Keep MY old_value (start of drag) and take THEIR new_value (current drag pos)
-            self.new_value = copy.deepcopy(other.new_value)
+            self._new = other._new
+            return True
+
+        return False
+
+    def size(self):
+        return COMMAND_OVERHEAD + packed_size(self._new) + packed_size(self._old)
+
+    def to_data(self):
+        return {"type": "change", "id": self.obj.get("id"), "component": self.comp_name, "key": self.key,
+                "old": self.old_value, "new": self.new_value}
+
+class SetScriptPropertyCommand(Command):
+    """Sets Script.properties[key]. Undo restores the old value, or removes the key if it was unset (script default)."""
+    def __init__(self, obj, key, new_value):
+        self.obj = obj
+        self.key = key
+        self._new = pack(new_value)
+        script = obj["components"]["Script"]
+        props = script.get("properties") or {}
+        self.was_set = key in props
+        self._old = pack(props.get(key))
+        self.had_properties = bool(props) # Else undo drops the properties entry redo adds
+
+    @property
+    def old_value(self):
+        return unpack(self._old)
+
+    @old_value.setter
+    def old_value(self, value):
+        self._old = pack(value)
+
+    def _properties(self):
+        script = self.obj["components"]["Script"]
+        if not script.get("properties"):
+            script["properties"] = {} # Missing or null
+        return script["properties"]
+
+    def redo(self):
+        self._properties()[self.key] = unpack(self._new)
+
+    def undo(self):
+        if self.was_set:
+            self._properties()[self.key] = unpack(self._old)
+            return
+        props = self._properties()
+        props.pop(self.key, None)
+        if not props and not self.had_properties:
+            del self.obj["components"]["Script"]["properties"]
+
+    def touched_ids(self):
+        return [self.obj.get("id")]
+
+    def merge_with(self, other) -> bool:
+        if (isinstance(other, SetScriptPropertyCommand) and self.obj["id"] == other.obj["id"]
+                and self.key == other.key):
+            self._new = other._new
             return True
-            
         return False
 
+    def size(self):
+        return COMMAND_OVERHEAD + packed_size(self._new) + packed_size(self._old)
+
+    def to_data(self):
+        return {"type": "script_property", "id": self.obj.get("id"), "key": self.key,
+                "old": self.old_value, "new": unpack(self._new), "was_set": self.was_set,
+                "had_properties": self.had_properties}
+
 class AddComponentCommand(Command):
     def __init__(self, obj, comp_name, data):
         self.obj = obj
         self.comp_name = comp_name
-        self.data = copy.deepcopy(data)
+        self._data = pack(data)
+
+    @property
+    def data(self):
+        return unpack(self._data)
 
     def redo(self):
-        self.obj["components"][self.comp_name] = copy.deepcopy(self.data)
+        self.obj["components"][self.comp_name] = self.data
 
     def undo(self):
         if self.comp_name in self.obj["components"]:
             del self.obj["components"][self.comp_name]
 
+    def touched_ids(self):
+        return [self.obj.get("id")]
+
+    def size(self):
+        return COMMAND_OVERHEAD + packed_size(self._data)
+
+    def to_data(self):
+        return {"type": "add_component", "id": self.obj.get("id"), "component": self.comp_name, "data": self.data}
+
 class RemoveComponentCommand(Command):
     def __init__(self, obj, comp_name):
         self.obj = obj
         self.comp_name = comp_name
-        data = obj["components"].get(comp_name)
-        self.old_data = copy.deepcopy(data)
+        # Kept, not copied: undo puts this same dict back
+        self.old_data = obj["components"].get(comp_name)
+        self._size = COMMAND_OVERHEAD + len(json.dumps(self.old_data))
 
     def redo(self):
         if self.comp_name in self.obj["components"]:
@@ -213,22 +551,83 @@ class RemoveComponentCommand(Command):
 
     def undo(self):
         if self.old_data:
-            self.obj["components"][self.comp_name] = copy.deepcopy(self.old_data)
+            self.obj["components"][self.comp_name] = self.old_data
+
+    def touched_ids(self):
+        return [self.obj.get("id")]
+
+    def size(self):
+        return self._size
+
+    def to_data(self):
+        return {"type": "remove_component", "id": self.obj.get("id"), "component": self.comp_name, "data": self.old_data}
 
 class ReparentCommand(Command):
     def __init__(self, scene, obj_data, new_parent_id):
         self.scene = scene
         self.obj_data = obj_data # The dict from scene.objects
         self.new_parent_id = new_parent_id
-        
+
         # Helper to safely get/set
         if "Transform" not in self.obj_data["components"]:
              self.obj_data["components"]["Transform"] = {}
-             
+
         self.old_parent_id = self.obj_data["components"]["Transform"].get("parent_id")
-    
+
     def redo(self):
         self.obj_data["components"]["Transform"]["parent_id"] = self.new_parent_id
-        
+
     def undo(self):
         self.obj_data["components"]["Transform"]["parent_id"] = self.old_parent_id
+
+    def touched_ids(self):
+        return [self.obj_data.get("id")]
+
+    def to_data(self):
+        return {"type": "reparent", "id": self.obj_data.get("id"), "old": self.old_parent_id, "new": self.new_parent_id}
+
+class CompoundCommand(Command):
+    """
+    Several commands undone and redone as one step (an edit applied to a multi-selection).
+    The stack notifies its listeners once for the whole group.
+    """
+    def __init__(self, commands):
+        self.commands = list(commands)
+
+    def redo(self):
+        for cmd in self.commands:
+            cmd.redo()
+
+    def undo(self):
+        for cmd in reversed(self.commands):
+            cmd.undo()
+
+    def touched_ids(self):
+        ids = []
+        for cmd in self.commands:
+            ids.extend(cmd.touched_ids())
+        return list(dict.fromkeys(ids))
+
+    def update_index(self, index):
+        for cmd in self.commands:
+            cmd.update_index(index)
+
+    def merge_with(self, other) -> bool:
+        # A group drag or a field edited repeatedly on the same objects stays one step
+        if not isinstance(other, CompoundCommand) or len(other.commands) != len(self.commands):
+            return False
+        pairs = list(zip(self.commands, other.commands))
+        if not all(isinstance(mine, ChangeComponentCommand) and mine.same_target(theirs) for mine, theirs in pairs):
+            return False
+        for mine, theirs in pairs:
+            mine.merge_with(theirs)
+        return True
+
+    def size(self):
+        return COMMAND_OVERHEAD + sum(cmd.size() for cmd in self.commands)
+
+    def to_data(self):
+        children = [cmd.to_data() for cmd in self.commands]
+        if any(child is None for child in children):
+            return None
+        return {"type": "compound", "commands": children}
@@ -1,5 +1,6 @@
 
 import pygame
+from runtime.coroutines import wait, wait_until, next_fixed_step
 
 class Input:
     """Static helper for input."""
@@ -28,6 +29,10 @@ class GameObject:
         # Hierarchy
         self.parent = None
         self.children = []
+        
+        # Scene membership: None = the main scene, else the path of the additive scene it came from
+        self.scene = None
+        self.persistent = False # Survives scene changes (see Script.make_persistent)
 
     @property
     def world_position(self):
@@ -71,6 +76,9 @@ class GameObject:
 
 class Script:
     """Base class for all user scripts."""
+    # Seconds between update() calls. 0 = every rendered frame, 0.1 = throttle to 10 Hz.
+    update_interval = 0.0
+    
     def __init__(self):
         self.game_object = None  # Injected by runtime
         self.transform = None    # Helper to access transform
@@ -79,8 +87,16 @@ class Script:
         """Called when the scene starts."""
         pass
 
+    def fixed_update(self, dt):
+        """Called at the fixed logic rate (120 Hz) before each physics step. dt is constant."""
+        pass
+
     def update(self, dt):
-        """Called every frame. dt is delta time in seconds."""
+        """Called once per rendered frame. dt is the time since the last update() in seconds."""
+        pass
+
+    def late_update(self, dt):
+        """Called once per rendered frame, after physics and all update() calls (e.g. cameras)."""
         pass
 
     def on_collision_enter(self, other):
@@ -100,12 +116,38 @@ class Script:
         print("Warning: destroy called outside runtime")
 
     def load_scene(self, scene_name):
-        """Loads a new scene."""
+        """
+        Switches to a new scene. It is built in the background while the current scene keeps
+        running, then replaces every non-persistent object in one step.
+        """
         # This will be monkey-patched by the runtime
         print("Warning: load_scene called outside runtime")
+
+    def load_scene_additive(self, scene_name):
+        """Adds a scene's objects to the running world (built in the background). Undo with unload_scene."""
+        # This will be monkey-patched by the runtime
+        print("Warning: load_scene_additive called outside runtime")
+
+    def unload_scene(self, scene_name):
+        """Removes the objects of an additively loaded scene (or cancels its preload)."""
+        # This will be monkey-patched by the runtime
+        print("Warning: unload_scene called outside runtime")
+
+    def preload_scene(self, scene_name):
+        """Starts building a scene in the background so a later load_scene/load_scene_additive is instant."""
+        # This will be monkey-patched by the runtime
+        print("Warning: preload_scene called outside runtime")
+
+    def make_persistent(self, game_object=None):
+        """Keeps an object (default: this script's object) and its children alive across load_scene."""
+        # This will be monkey-patched by the runtime
+        print("Warning: make_persistent called outside runtime")
         
-    def play_sound(self, sound_path):
-        """Plays a sound one-shot."""
+    def play_sound(self, sound_path, volume=1.0, priority=0):
+        """
+        Plays a sound one-shot. Higher priority sounds may take over channels from lower ones
+        when all are busy. Rapid repeats of the same sound are rate limited by the runtime.
+        """
         # API hook
         pass
 
@@ -114,6 +156,26 @@ class Script:
         # API hook
         return None
 
+    def start_coroutine(self, generator):
+        """
+        Runs a generator as a coroutine, e.g. self.start_coroutine(self.spawn_waves()).
+        Inside it, yield wait(seconds), wait_until(condition), next_fixed_step
+        or another coroutine handle. Returns a handle for stop_coroutine.
+        """
+        # This will be monkey-patched by the runtime
+        print("Warning: start_coroutine called outside runtime")
+        return None
+
+    def stop_coroutine(self, coroutine):
+        """Stops a coroutine started with start_coroutine."""
+        if coroutine:
+            coroutine.stop()
+
+    def stop_all_coroutines(self):
+        """Stops every coroutine started by this script."""
+        # API hook
+        pass
+
 class KeyCode:
     """Mapping to Pygame keys."""
     W = pygame.K_w
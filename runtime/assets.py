@@ -0,0 +1,297 @@
+import os
+import json
+import queue
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+
+import pygame
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tga", ".webp")
+SOUND_EXTS = (".wav", ".ogg", ".mp3", ".flac")
+PREFAB_EXTS = (".prefab", ".json")
+
+def _decode(kind, full_path):
+    """Runs on a worker thread. File I/O and decoding release the GIL."""
+    if not os.path.exists(full_path):
+        raise FileNotFoundError(full_path)
+    if kind == "image":
+        return pygame.image.load(full_path)
+    if kind == "sound":
+        return pygame.mixer.Sound(full_path)
+    with open(full_path, "r") as f:
+        return json.load(f)
+
+class AssetManager:
+    """
+    Loads images, sounds and prefabs on a thread pool.
+
+    Workers only read and decode. Anything touching the display (convert_alpha) and
+    every cache write happens on the main thread in pump(), so the caches need no locks.
+    request() returns a Future that resolves on the main thread with the finished asset
+    (None if it is missing or fails to decode).
+
+    Lifetime: every asset used by a scene holds one reference from that scene. On a scene
+    change the new scene acquires its assets before the old scene's references are released,
+    so shared assets are never reloaded. Unreferenced assets are kept for reuse until they
+    exceed unused_budget_mb, then evicted least recently released first.
+    """
+    def __init__(self, project_root, workers=4, unused_budget_mb=64):
+        self.project_root = project_root
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="AssetLoader")
+
+        self.images = {} # full path -> converted Surface (None if missing)
+        self.sounds = {} # full path -> pygame.mixer.Sound (None if missing)
+        self.prefabs = {} # full path -> parsed prefab dict (None if missing)
+        self._stores = {"image": self.images, "sound": self.sounds, "prefab": self.prefabs}
+
+        self._futures = {} # full path -> Future handed out by request()
+        self._decoded = queue.SimpleQueue() # (kind, full path, worker future) from the pool
+        self._resolved = {} # path as written in the scene -> normalised full path
+        self._in_flight = 0
+
+        # Texture atlas: sprite full path -> (page full path, (x, y, w, h))
+        self.atlas_regions = {}
+        self._subsurfaces = {} # sprite full path -> subsurface of its loaded page
+
+        # Reference counting across scenes
+        self._refs = {} # full path -> number of scenes using it
+        self._scope = set() # full paths used by the current scene
+        self._unused = OrderedDict() # full path -> None, unreferenced assets still in memory (oldest first)
+        self.unused_budget = unused_budget_mb * 1024 * 1024
+
+        # Progress counters (reset_progress() at the start of each scene load)
+        self.requested = 0
+        self.completed = 0
+
+    def resolve(self, path):
+        full = self._resolved.get(path)
+        if full is None:
+            # Scenes saved on Windows use backslashes
+            full = os.path.normpath(os.path.join(self.project_root, path.replace("\\", "/")))
+            self._resolved[path] = full
+        return full
+
+    @staticmethod
+    def kind_of(path):
+        ext = os.path.splitext(path)[1].lower()
+        if ext in SOUND_EXTS:
+            return "sound"
+        if ext in PREFAB_EXTS:
+            return "prefab"
+        return "image"
+
+    def set_atlas(self, index):
+        """Uses an atlas index (shared.atlas.load_index) so packed sprites load as one page each."""
+        self.atlas_regions = {}
+        self._subsurfaces.clear()
+        if not index:
+            return
+        pages = [self.resolve(p) for p in index.get("pages", [])]
+        for key, region in index.get("regions", {}).items():
+            self.atlas_regions[self.resolve(key)] = (pages[region["page"]], tuple(region["rect"]))
+
+    def request(self, path, kind=None):
+        """
+        Starts loading path in the background (no-op if already requested). Returns a Future.
+        Sprites packed in the atlas request their page instead.
+        """
+        full = self.resolve(path)
+        region = self.atlas_regions.get(full)
+        if region is not None and kind != "sound" and kind != "prefab":
+            return self.request(region[0], "image")
+        if full not in self._scope:
+            self._use(full)
+        fut = self._futures.get(full)
+        if fut is not None:
+            return fut
+
+        kind = kind or self.kind_of(full)
+        fut = Future()
+        self._futures[full] = fut
+        self.requested += 1
+        self._in_flight += 1
+        worker = self._executor.submit(_decode, kind, full)
+        worker.add_done_callback(lambda w, k=kind, p=full: self._decoded.put((k, p, w)))
+        return fut
+
+    def preload(self, paths):
+        """Requests every path of a preload manifest. Returns the futures."""
+        return [self.request(p) for p in paths if p]
+
+    def get_image(self, path):
+        """Non-blocking: the converted Surface, or None while it is still loading (or missing)."""
+        full = self.resolve(path)
+        if full in self.images:
+            if full not in self._scope:
+                self._use(full)
+            return self.images[full]
+
+        region = self.atlas_regions.get(full)
+        if region is not None:
+            page = self.get_image(region[0])
+            if page is None:
+                return None
+            sub = self._subsurfaces.get(full)
+            if sub is None:
+                # Shares the page's pixels: no per-sprite copy
+                sub = page.subsurface(region[1])
+                self._subsurfaces[full] = sub
+            return sub
+
+        self.request(path, "image")
+        return None
+
+    def load(self, path, kind=None):
+        """Blocking load on the main thread (finishes other decoded assets while waiting)."""
+        fut = self.request(path, kind)
+        while not fut.done():
+            self._finish(*self._decoded.get())
+        return fut.result()
+
+    def busy(self):
+        return self._in_flight > 0
+
+    def progress(self):
+        return self.completed / self.requested if self.requested else 1.0
+
+    def reset_progress(self):
+        self.requested = self._in_flight
+        self.completed = 0
+
+    def pump(self, deadline=None):
+        """Main thread: finishes decoded assets (surface conversion) until deadline (perf_counter time)."""
+        while True:
+            try:
+                item = self._decoded.get_nowait()
+            except queue.Empty:
+                return
+            self._finish(*item)
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+
+    def wait_all(self):
+        """Blocks until every requested asset is finished."""
+        while self._in_flight:
+            self._finish(*self._decoded.get())
+
+    # --- Lifetime ---
+    def _use(self, full):
+        self._scope.add(full)
+        self._refs[full] = self._refs.get(full, 0) + 1
+        self._unused.pop(full, None)
+
+    def begin_scene(self):
+        """Starts reference tracking for a new scene. Returns the previous scene's assets for release_scene()."""
+        return self.swap_scope(set())
+
+    def swap_scope(self, scope):
+        """Makes scope (a set from begin_scene/swap_scope) receive new references. Returns the previous scope."""
+        previous = self._scope
+        self._scope = scope
+        return previous
+
+    def release_scene(self, previous):
+        """Drops a previous scene's references once the new scene has acquired its own, then trims."""
+        for full in previous:
+            count = self._refs.get(full, 0) - 1
+            if count > 0:
+                self._refs[full] = count
+            else:
+                self._refs.pop(full, None)
+                self._unused[full] = None
+        self.trim()
+
+    def trim(self, budget=None):
+        """Evicts unreferenced assets, oldest first, until they fit in budget bytes (default unused_budget)."""
+        budget = self.unused_budget if budget is None else budget
+        unused_bytes = sum(self.size_of(full) for full in self._unused)
+        while self._unused and unused_bytes > budget:
+            full, _ = self._unused.popitem(last=False)
+            unused_bytes -= self.size_of(full)
+            self.unload(full)
+
+    def size_of(self, full):
+        """Approximate memory used by a loaded asset, in bytes."""
+        img = self.images.get(full)
+        if img is not None:
+            return img.get_width() * img.get_height() * img.get_bytesize()
+        sound = self.sounds.get(full)
+        if sound is not None:
+            init = pygame.mixer.get_init()
+            if init:
+                freq, size, channels = init
+                return int(sound.get_length() * freq * channels * (abs(size) // 8))
+        return 0
+
+    def resident_texture_bytes(self):
+        return sum(self.size_of(full) for full, img in self.images.items() if img is not None)
+
+    def memory_report(self):
+        textures = [f for f, img in self.images.items() if img is not None]
+        sounds = [f for f, snd in self.sounds.items() if snd is not None]
+        sound_bytes = sum(self.size_of(f) for f in sounds)
+        unused_bytes = sum(self.size_of(f) for f in self._unused)
+        mb = 1024 * 1024
+        return (f"Assets: {len(textures)} textures ({self.resident_texture_bytes() / mb:.1f} MB), "
+                f"{len(sounds)} sounds ({sound_bytes / mb:.1f} MB), "
+                f"{len(self._unused)} unused kept ({unused_bytes / mb:.1f} MB)")
+
+    def unload(self, path):
+        """
+        Forgets one asset so the next request reloads it from disk.
+        Assets still referenced by the current scene are kept; returns False in that case.
+        """
+        full = self.resolve(path)
+        if self._refs.get(full, 0) > 0:
+            return False
+        self._unused.pop(full, None)
+        if full in self.images:
+            self._subsurfaces.clear() # May point into this page
+        for store in self._stores.values():
+            store.pop(full, None)
+        fut = self._futures.get(full)
+        if fut is not None and fut.done():
+            del self._futures[full]
+        return True
+
+    def clear(self):
+        """Drops every cached asset and reference. Loads still in flight are discarded when they finish."""
+        for store in self._stores.values():
+            store.clear()
+        self._subsurfaces.clear()
+        self._futures.clear()
+        self._refs.clear()
+        self._scope.clear()
+        self._unused.clear()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, kind, full, worker):
+        self._in_flight -= 1
+        fut = self._futures.get(full)
+        if fut is None or fut.done():
+            return # Cleared while decoding
+
+        result = None
+        try:
+            result = worker.result()
+            if kind == "image":
+                # Needs the display, so it cannot run on a worker
+                result = result.convert_alpha()
+        except Exception as e:
+            print(f"Warning: Could not load {kind} {full}: {e}")
+            result = None
+
+        self._stores[kind][full] = result
+        self.completed += 1
+        fut.set_result(result)
+
+        # Prefabs pull in their own sprites so the first spawn does not hitch
+        if kind == "prefab" and result:
+            comps = result.get("components", {})
+            for comp_name in ("SpriteRenderer", "Background"):
+                sprite_path = comps.get(comp_name, {}).get("sprite_path")
+                if sprite_path:
+                    self.request(sprite_path, "image")
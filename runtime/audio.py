@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+
+import pygame
+
+class AudioMixer:
+    """
+    Sound playback for scripts.
+
+    Decoded sounds are cached per path (LRU, at most cache_size entries), so repeated
+    play_sound calls never touch the disk. Voices are played on a fixed channel pool:
+    - each sound may play at most max_voices_per_sound times at once (the oldest voice is restarted),
+    - a sound replayed within min_interval seconds is skipped (collision spam),
+    - when every channel is busy, the oldest voice with priority <= the new one is stolen.
+    """
+    def __init__(self, assets, channels=16, cache_size=32, max_voices_per_sound=4, min_interval=0.05):
+        self.assets = assets
+        self.cache_size = cache_size
+        self.max_voices_per_sound = max_voices_per_sound
+        self.min_interval = min_interval
+
+        self._cache = OrderedDict() # full path -> Sound, least recently used first
+        self._last_play = {} # full path -> perf_counter time of the last accepted play
+        self._voices = {} # channel index -> (full path, priority, start time)
+        self.set_channels(channels)
+
+    def set_channels(self, count):
+        pygame.mixer.set_num_channels(count)
+        self.channels = [pygame.mixer.Channel(i) for i in range(count)]
+        self._voices.clear()
+
+    def configure(self, settings):
+        """Applies scene settings["audio"] (channels, cache_size, max_voices_per_sound, min_interval_ms)."""
+        audio = settings.get("audio", {})
+        if "channels" in audio and audio["channels"] != len(self.channels):
+            self.set_channels(audio["channels"])
+        self.cache_size = audio.get("cache_size", self.cache_size)
+        self.max_voices_per_sound = audio.get("max_voices_per_sound", self.max_voices_per_sound)
+        if "min_interval_ms" in audio:
+            self.min_interval = audio["min_interval_ms"] / 1000.0
+
+    def get_sound(self, path):
+        full = self.assets.resolve(path)
+        sound = self._cache.get(full)
+        if sound is not None:
+            self._cache.move_to_end(full)
+            return sound
+
+        # First use: blocks unless the scene preloaded it. Missing files are cached as None by the asset manager.
+        sound = self.assets.load(path, "sound")
+        if sound is None:
+            return None
+        self._cache[full] = sound
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._stop_path(evicted)
+            self.assets.unload(evicted)
+        return sound
+
+    def play(self, path, volume=1.0, priority=0, loops=0):
+        """Plays a sound. Returns the pygame Channel, or None if the play was skipped."""
+        sound = self.get_sound(path)
+        if sound is None:
+            return None
+        full = self.assets.resolve(path)
+
+        now = time.perf_counter()
+        last = self._last_play.get(full)
+        if last is not None and now - last < self.min_interval:
+            return None
+
+        index = self._pick_channel(full, priority)
+        if index is None:
+            return None # Every channel is playing something more important
+
+        channel = self.channels[index]
+        channel.stop()
+        channel.set_volume(volume)
+        channel.play(sound, loops=loops)
+        self._voices[index] = (full, priority, now)
+        self._last_play[full] = now
+        return channel
+
+    def stop_all(self):
+        for channel in self.channels:
+            channel.stop()
+        self._voices.clear()
+
+    def clear(self):
+        """Drops cached sounds (scene change). Playing voices are stopped."""
+        self.stop_all()
+        self._cache.clear()
+        self._last_play.clear()
+
+    def _active_voices(self):
+        active = []
+        for index, voice in list(self._voices.items()):
+            if self.channels[index].get_busy():
+                active.append((index, voice))
+            else:
+                del self._voices[index]
+        return active
+
+    def _pick_channel(self, full, priority):
+        active = self._active_voices()
+
+        # Voice limit per sound: restart the oldest instance of the same sound
+        same = [(voice[2], index) for index, voice in active if voice[0] == full]
+        if len(same) >= self.max_voices_per_sound:
+            return min(same)[1]
+
+        busy = set(index for index, _ in active)
+        for index, channel in enumerate(self.channels):
+            if index not in busy and not channel.get_busy():
+                return index
+
+        # Pool full: steal the oldest voice that is not more important than this one
+        candidates = [(voice[1], voice[2], index) for index, voice in active if voice[1] <= priority]
+        if not candidates:
+            return None
+        return min(candidates)[2]
+
+    def _stop_path(self, full):
+        for index, voice in list(self._voices.items()):
+            if voice[0] == full:
+                self.channels[index].stop()
+                del self._voices[index]
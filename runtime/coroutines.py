@@ -0,0 +1,150 @@
+import heapq
+
+class wait:
+    """Yield from a coroutine to sleep for `seconds` of game time."""
+    __slots__ = ("seconds",)
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+class wait_until:
+    """Yield from a coroutine to resume once condition() returns True (checked every fixed step)."""
+    __slots__ = ("condition",)
+
+    def __init__(self, condition):
+        self.condition = condition
+
+class _NextFixedStep:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "next_fixed_step"
+
+# Yield to resume on the next fixed step. A bare `yield` does the same.
+next_fixed_step = _NextFixedStep()
+
+class Coroutine:
+    """Handle returned by start_coroutine. Yielding a handle waits for that coroutine to finish."""
+    __slots__ = ("generator", "owner", "done")
+
+    def __init__(self, generator, owner=None):
+        self.generator = generator
+        self.owner = owner
+        self.done = False
+
+    def stop(self):
+        # Lazily dropped by the scheduler; a stopped coroutine is never resumed again
+        self.done = True
+
+class CoroutineScheduler:
+    """
+    Drives generator coroutines from the fixed-step loop.
+    Sleeping coroutines live in a timer heap keyed by wake time, so they cost nothing
+    per tick until they are due. Only wait_until conditions are polled.
+    """
+    def __init__(self):
+        self.time = 0.0 # Game time in seconds, advanced by tick()
+        self._timers = [] # heap of (wake_time, seq, Coroutine)
+        self._conditions = [] # (condition, Coroutine)
+        self._next_step = [] # Coroutines to resume on the next tick
+        self._by_owner = {} # owner -> list of Coroutines
+        self._seq = 0 # Tie-breaker so equal wake times resume in start order
+
+    def start(self, generator, owner=None):
+        """Starts a coroutine. It runs immediately up to its first yield."""
+        co = Coroutine(generator, owner)
+        if owner is not None:
+            self._by_owner.setdefault(owner, []).append(co)
+        self._resume(co)
+        return co
+
+    def stop_all(self, owner):
+        """Stops every coroutine started by owner (e.g. when its script is destroyed)."""
+        for co in self._by_owner.pop(owner, []):
+            co.done = True
+
+    def clear(self):
+        self._timers.clear()
+        self._conditions.clear()
+        self._next_step.clear()
+        self._by_owner.clear()
+
+    def pending_count(self):
+        return len(self._timers) + len(self._conditions) + len(self._next_step)
+
+    def tick(self, dt):
+        self.time += dt
+
+        ready = self._next_step
+        self._next_step = []
+
+        timers = self._timers
+        while timers and timers[0][0] <= self.time:
+            ready.append(heapq.heappop(timers)[2])
+
+        if self._conditions:
+            waiting = []
+            for condition, co in self._conditions:
+                if co.done:
+                    self._finish(co)
+                    continue
+                try:
+                    met = condition()
+                except Exception as e:
+                    self._fail(co, e)
+                    continue
+                if met:
+                    ready.append(co)
+                else:
+                    waiting.append((condition, co))
+            self._conditions = waiting
+
+        for co in ready:
+            if co.done:
+                self._finish(co) # Stopped while waiting
+            else:
+                self._resume(co)
+
+    def _resume(self, co):
+        try:
+            instruction = next(co.generator)
+        except StopIteration:
+            self._finish(co)
+            return
+        except Exception as e:
+            self._fail(co, e)
+            return
+
+        if instruction is None or instruction is next_fixed_step:
+            self._next_step.append(co)
+        elif isinstance(instruction, wait):
+            self._seq += 1
+            heapq.heappush(self._timers, (self.time + instruction.seconds, self._seq, co))
+        elif isinstance(instruction, wait_until):
+            self._conditions.append((instruction.condition, co))
+        elif isinstance(instruction, Coroutine):
+            other = instruction
+            self._conditions.append((lambda: other.done, co))
+        else:
+            self._fail(co, TypeError(f"Coroutine yielded unsupported value {instruction!r}"))
+
+    def _finish(self, co):
+        co.done = True
+        if co.owner is not None:
+            owned = self._by_owner.get(co.owner)
+            if owned:
+                try:
+                    owned.remove(co)
+                except ValueError:
+                    pass
+                if not owned:
+                    del self._by_owner[co.owner]
+
+    def _fail(self, co, error):
+        owner = co.owner
+        if owner is not None and getattr(owner, "game_object", None) is not None:
+            where = f"'{type(owner).__name__}' on '{owner.game_object.name}'"
+        else:
+            where = repr(owner)
+        print(f"CRASH: Coroutine of {where} failed: {error}")
+        self._finish(co)
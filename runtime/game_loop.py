@@ -5,6 +5,9 @@ import json
 import importlib.util
 import inspect
 import math
+import time
+import copy
+import uuid
 
 # Add project root to path
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -15,32 +18,72 @@ from shared.scene_loader import load_scene
 from runtime.api import GameObject, Script, Input, Time
 
 from runtime.physics import PhysicsSystem
+from runtime.hot_reload import ScriptReloader
+from runtime.profiler import ScriptProfiler
+from runtime.coroutines import CoroutineScheduler
+from runtime.systems import BatchSystem, SystemRegistry
+from shared.scene_stream import SceneStream
+from runtime.assets import AssetManager
+from shared.atlas import load_index
+from runtime.audio import AudioMixer
+from runtime.world_streaming import ChunkStreamer, StagedLoad
+from shared.scene_chunks import WORLD_SUFFIX, load_manifest
+
+# Components copied from scene data onto runtime GameObjects
+RUNTIME_COMPONENTS = ("SpriteRenderer", "Background", "TextRenderer", "Script",
+                      "RigidBody", "BoxCollider", "CircleCollider", "Camera")
 
 class GameRuntime:
-    def __init__(self, scene_path, width=800, height=600):
+    FIXED_DT = 1.0 / 120.0 # 120 Hz fixed logic update (Sub-stepping)
+    
+    def __init__(self, scene_path, width=800, height=600, script_budget_ms=None, budget_action="log", load_budget_ms=12):
         pygame.init()
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Aspis Engine Runtime")
         self.clock = pygame.time.Clock()
         self.running = True
+        self._accumulator = 0.0 # Frame time not yet consumed by fixed steps
         
         self.scene_path = scene_path
         self.active_scripts = [] # List of instantiated Script objects
-        self.sprites = {} # path -> surface
+        self.assets = AssetManager(PROJECT_ROOT) # Images, sounds and prefabs decoded on worker threads
+        self.assets.set_atlas(load_index(PROJECT_ROOT)) # Packed sprites (python -m shared.atlas)
         self.objects = [] # List of runtime GameObject instances
         
         self.physics = PhysicsSystem()
         
+        # Hot Reload (watches loaded script files)
+        self.script_reloader = ScriptReloader(base_classes=(Script, BatchSystem))
+        
+        # Script Timing (per-script budgets, report at shutdown)
+        self.profiler = ScriptProfiler(script_budget_ms, budget_action)
+        self._phase_cache = {} # Script class -> set of overridden phase names
+        
+        # Coroutines (resumed from the fixed-step loop)
+        self.scheduler = CoroutineScheduler()
+        
+        # Batch Systems (one instance per class, operating on NumPy arrays of all members)
+        self.systems = SystemRegistry()
+        
         # Lifecycle Queues
         self.instantiate_queue = [] # List of (prefab, pos, rot)
         self.destroy_queue = [] # List of GameObjects
         self.next_scene_path = None
         
-        # Audio
+        # Audio (cached sounds, pooled channels)
         pygame.mixer.init()
+        self.audio = AudioMixer(self.assets)
         
-        self.load_level()
-        self.start_scripts()
+        # Scene Streaming (objects are built across frames, load_budget_ms per frame)
+        self.load_budget_ms = load_budget_ms
+        self.loading = False
+        self.scene_settings = {}
+        self.world = None # ChunkStreamer when the scene is a chunked world (*.world.json)
+        
+        # Background / additive scenes
+        self.scene_loads = {} # scene path -> StagedLoad being built (or built and waiting)
+        self.additive_scenes = {} # scene path -> asset scope of an additively loaded scene
+        self.begin_level_load()
 
     def _inject_api(self, script_instance):
         """Injects runtime methods into the script instance."""
@@ -53,12 +96,14 @@ class GameRuntime:
         def load(name):
             # Assume name is path relative to PROJECT_ROOT or simple name?
             # Let's assume full path or relative to project
-            self.next_scene_path = os.path.join(PROJECT_ROOT, name)
+            self.next_scene_path = self._scene_full_path(name)
+        
+        def persist(obj=None):
+            self.make_persistent(obj or script_instance.game_object)
             
-        def play_snd(path):
-            full_path = os.path.join(PROJECT_ROOT, path)
-            if os.path.exists(full_path):
-                pygame.mixer.Sound(full_path).play()
+        def play_snd(path, volume=1.0, priority=0):
+            # Cached after the first play (list sounds in settings["preload"] to avoid even that)
+            return self.audio.play(path, volume, priority)
         
         def find_obj(name):
             for obj in self.objects:
@@ -69,16 +114,25 @@ class GameRuntime:
         script_instance.instantiate = inst
         script_instance.destroy = dest
         script_instance.load_scene = load
+        script_instance.load_scene_additive = self.load_scene_additive
+        script_instance.unload_scene = self.unload_scene
+        script_instance.preload_scene = self.preload_scene
+        script_instance.make_persistent = persist
+        def start_co(generator):
+            return self.scheduler.start(generator, owner=script_instance)
+        
+        def stop_all_co():
+            self.scheduler.stop_all(script_instance)
+        
         script_instance.play_sound = play_snd
         script_instance.find_object = find_obj
+        script_instance.start_coroutine = start_co
+        script_instance.stop_all_coroutines = stop_all_co
 
 
 
 
     def run(self):
-        FIXED_DT = 1.0 / 120.0 # 120 Hz fixed logic update (Sub-stepping)
-        accumulator = 0.0
-        
         while self.running:
             # 1. Frame time measurement
             frame_time = self.clock.tick(60) / 1000.0
@@ -86,32 +140,66 @@ class GameRuntime:
             
             self.handle_events()
             
-            # 2. Accumulate time
-            accumulator += frame_time
+            # Finish assets decoded by the loader threads (surface conversion must happen here)
+            self.assets.pump(time.perf_counter() + 0.002)
             
-            # 3. Fixed Update Loop (Physics + Scripts)
-            while accumulator >= FIXED_DT:
-                Time.dt = FIXED_DT
-                
-                # Physics Step
-                events = self.physics.update(FIXED_DT, self.objects)
-                self.dispatch_collision_events(events)
-                
-                # Scripts Step (Fixed Update)
-                self.update_scripts(FIXED_DT)
-                
-                # Processing Queued Lifecycle Events
-                self.process_lifecycle_events()
-                
-                accumulator -= FIXED_DT
+            # Scene still streaming in: build more objects, draw what exists so far, no simulation yet
+            if self.loading:
+                self.continue_level_load(self.load_budget_ms / 1000.0)
+                self.draw()
+                continue
             
-            # 4. Rendering (Variable rate)
+            self.step(frame_time)
+            
+            # 5. Rendering (Variable rate)
             # Future: Interpolate (alpha = accumulator / FIXED_DT)
             self.draw()
         
+        print(self.profiler.report())
+        self.assets.shutdown()
         pygame.quit()
         sys.exit()
 
+    def step(self, frame_time):
+        """Simulates one frame: as many fixed steps as frame_time allows, then update and late_update."""
+        # Background scene loads and world chunks share the per-frame build budget
+        if self.scene_loads or self.world:
+            deadline = time.perf_counter() + self.load_budget_ms / 1000.0
+            self.update_scene_loads(deadline)
+            if self.world:
+                self.world.update(max(0.0, deadline - time.perf_counter()))
+        
+        # Pick up edited scripts without restarting the scene
+        self.script_reloader.poll(frame_time, self.active_scripts + self.systems.instances())
+        
+        # 2. Accumulate time
+        self._accumulator += frame_time
+        
+        # 3. Fixed Update Loop (Scripts + Physics)
+        while self._accumulator >= self.FIXED_DT:
+            Time.dt = self.FIXED_DT
+        
+            # Scripts Step (Fixed Update + Coroutines)
+            self.fixed_update_scripts(self.FIXED_DT)
+            self.run_systems("fixed_update", self.FIXED_DT)
+            self.scheduler.tick(self.FIXED_DT)
+        
+            # Physics Step
+            events = self.physics.update(self.FIXED_DT, self.objects)
+            self.dispatch_collision_events(events)
+        
+            # Processing Queued Lifecycle Events
+            self.process_lifecycle_events()
+        
+            self._accumulator -= self.FIXED_DT
+        
+        # 4. Per-frame Scripts (Variable rate)
+        Time.dt = frame_time
+        self.update_scripts(frame_time)
+        self.run_systems("update", frame_time)
+        self.late_update_scripts(frame_time)
+        self.process_lifecycle_events()
+
     def process_lifecycle_events(self):
         # 1. Instantiate
         while self.instantiate_queue:
@@ -128,47 +216,140 @@ class GameRuntime:
             # Recursive destroy logic? For now, flat.
             # Actually, we need to handle children too if we support hierarchy destroy.
             # Let's assume user passes root.
-            
-            # Remove from Objects List
-            self.objects = [obj for obj in self.objects if obj.id not in ids_to_destroy]
-            
-            # Remove Scripts
-            self.active_scripts = [s for s in self.active_scripts if s.game_object.id not in ids_to_destroy]
-            
-            # Remove Physics
-            for obj_id in ids_to_destroy:
-                if obj_id in self.physics.bodies:
-                    body = self.physics.bodies[obj_id]
-                    self.physics.space.remove(body, *body.shapes)
-                    del self.physics.bodies[obj_id]
+            self._remove_objects(ids_to_destroy)
             
             self.destroy_queue.clear()
 
-        # 3. Scene Load
+        # 3. Scene Load: built in the background, swapped in by update_scene_loads() once ready
         if self.next_scene_path:
-            self.scene_path = self.next_scene_path
+            path = self.next_scene_path
             self.next_scene_path = None
-            # Reset everything
-            self.active_scripts.clear()
-            self.objects.clear()
-            self.physics = PhysicsSystem() # Reset physics world
-            self.sprites.clear()
-            self.load_level()
-            self.start_scripts()
+            for other, load in list(self.scene_loads.items()):
+                if load.mode == "switch" and other != path:
+                    self._cancel_scene_load(other) # Superseded by this load_scene call
+            load = self.preload_scene(path)
+            if load:
+                load.mode = "switch"
+
+    def _scene_full_path(self, name):
+        return os.path.normpath(os.path.join(PROJECT_ROOT, name))
+
+    def preload_scene(self, name):
+        """Starts building a scene off-world (no-op if already loading). Returns its StagedLoad, or None."""
+        path = self._scene_full_path(name)
+        load = self.scene_loads.get(path)
+        if load is None:
+            try:
+                # Chunked worlds stage their base scene; chunks stream in after the switch
+                source = load_manifest(path)["base"] if path.endswith(WORLD_SUFFIX) else path
+                load = StagedLoad(path, source)
+            except Exception as e:
+                print(f"Failed to load scene {path}: {e}")
+                return None
+            self.scene_loads[path] = load
+        return load
+
+    def load_scene_additive(self, name):
+        """Merges a scene into the running world once it is built (see update_scene_loads)."""
+        path = self._scene_full_path(name)
+        if path in self.additive_scenes or path == os.path.normpath(self.scene_path):
+            print(f"Scene already loaded: {path}")
+            return
+        load = self.preload_scene(path)
+        if load:
+            load.mode = "additive"
+
+    def unload_scene(self, name):
+        """Removes an additive scene's objects (persistent ones stay) or cancels its background load."""
+        path = self._scene_full_path(name)
+        if path in self.scene_loads:
+            self._cancel_scene_load(path)
+        elif path in self.additive_scenes:
+            ids = set(obj.id for obj in self.objects if obj.scene == path and not obj.persistent)
+            self._remove_objects(ids)
+            self.assets.release_scene(self.additive_scenes.pop(path))
+            print(f"Unloaded scene {path} ({len(ids)} objects)")
+        else:
+            print(f"Scene not loaded: {path}")
+
+    def make_persistent(self, game_object):
+        """Keeps game_object and its children through scene changes."""
+        stack = [game_object]
+        while stack:
+            obj = stack.pop()
+            obj.persistent = True
+            stack.extend(obj.children)
+
+    def _cancel_scene_load(self, path):
+        self.assets.release_scene(self.scene_loads.pop(path).cancel())
+
+    def update_scene_loads(self, deadline):
+        """Builds staged scenes until deadline, then merges finished additive loads and performs a pending switch."""
+        for path, load in list(self.scene_loads.items()):
+            if not load.step(self, deadline):
+                return
+            if load.failed:
+                # A partly built scene is never merged or switched to: the current one keeps running
+                del self.scene_loads[path]
+                self.assets.release_scene(load.assets)
+                print(f"Kept the current scene, {path} could not be loaded")
+            elif load.mode == "additive":
+                del self.scene_loads[path]
+                for go in load.objects:
+                    go.scene = path
+                self._add_objects(load.objects, load.scripts, load.parents)
+                self.additive_scenes[path] = load.assets
+                print(f"Loaded scene {path} additively ({len(load.objects)} objects)")
+            elif load.mode == "switch" and not self.assets.busy():
+                # Waiting for textures keeps the swap free of pop-in; the current scene runs meanwhile
+                del self.scene_loads[path]
+                self._switch_scene(load)
+
+    def _switch_scene(self, load):
+        """Replaces every non-persistent object with a staged scene in one step."""
+        started = time.perf_counter()
+        old_scopes = [self.assets.swap_scope(load.assets)] + list(self.additive_scenes.values())
+        self.additive_scenes.clear()
+        if self.world:
+            old_scopes += self.world.detach()
+            self.world = None
+        
+        self._remove_objects(set(obj.id for obj in self.objects if not obj.persistent))
+        for obj in self.objects:
+            obj.scene = None
+            # Persistent objects re-acquire their textures before the old scene lets go of them
+            self._request_object_assets(obj.components)
+        
+        self.scene_path = load.key
+        self.scene_stream = load.stream
+        self._apply_scene_header()
+        self._add_objects(load.objects, load.scripts, load.parents)
+        
+        if load.key.endswith(WORLD_SUFFIX):
+            self.world = ChunkStreamer(self, load.key)
+            self.world.configure(self.scene_settings)
+            self.world.update(None) # Chunks under the camera before the first step
+        
+        for scope in old_scopes:
+            self.assets.release_scene(scope)
+        print(f"Switched to {load.key}: {len(self.objects)} objects, swap took {(time.perf_counter() - started) * 1000:.1f} ms")
+        print(self.assets.memory_report())
 
     def _perform_instantiate(self, prefab_path, pos, rot):
-        full_path = os.path.join(PROJECT_ROOT, prefab_path)
-        if not os.path.exists(full_path):
+        # Parsed once and cached; preloaded prefabs are already in memory
+        prefab = self.assets.load(prefab_path, "prefab")
+        if prefab is None:
             print(f"Error: Prefab not found {prefab_path}")
             return None
             
         try:
-            with open(full_path, 'r') as f:
-                data = json.load(f)
+            data = copy.deepcopy(prefab)
             
             # Assign new ID
             import uuid
             data["id"] = str(uuid.uuid4())
+            data.setdefault("name", "Clone")
+            data.pop("parent", None)
             
             # Override Transform
             if "components" not in data: data["components"] = {}
@@ -177,44 +358,17 @@ class GameRuntime:
             data["components"]["Transform"]["position"] = list(pos)
             data["components"]["Transform"]["rotation"] = rot
             
-            # Create GameObject (Parsing logic reused? Should extract 'create_game_object' from load_level...)
-            # For MVP, duping the creation logic quickly
-            comps = data["components"]
-            transform = comps["Transform"]
-            scale = transform.get("scale", [1, 1])
-            
-            go = GameObject(data["id"], data.get("name", "Clone"), list(pos), rot, scale)
+            first_new_script = len(self.active_scripts)
+            go = self._build_object(data)
             
-            # Components
-            if "SpriteRenderer" in comps: go.components["SpriteRenderer"] = comps["SpriteRenderer"].copy()
-            if "Script" in comps: go.components["Script"] = comps["Script"].copy()
-            if "RigidBody" in comps: go.components["RigidBody"] = comps["RigidBody"].copy()
-            if "BoxCollider" in comps: go.components["BoxCollider"] = comps["BoxCollider"].copy()
-            if "CircleCollider" in comps: go.components["CircleCollider"] = comps["CircleCollider"].copy()
-            
-            self.objects.append(go)
-            
-            # Load Assets
-            if "SpriteRenderer" in comps:
-                path = comps["SpriteRenderer"].get("sprite_path")
-                if path:
-                    fp = os.path.join(PROJECT_ROOT, path)
-                    if fp not in self.sprites and os.path.exists(fp):
-                        self.sprites[fp] = pygame.image.load(fp).convert_alpha()
-
-            # Init Script
-            if "Script" in comps:
-                self.load_script(comps["Script"].get("script_path"), go)
-                # Verify start() is called for new scripts? 
-                # Yes, we need to call start() on just this new script.
-                # Find the last added script
-                if self.active_scripts and self.active_scripts[-1].game_object == go:
-                    try:
-                        self.active_scripts[-1].start()
-                        # Inject methods
-                        self._inject_api(self.active_scripts[-1])
-                    except Exception as e:
-                        print(f"Error starting instantiated script: {e}")
+            # Start only the scripts attached to the new object
+            for script in self.active_scripts[first_new_script:]:
+                try:
+                    # Inject methods first so start() can use the API (coroutines, find_object...)
+                    self._inject_api(script)
+                    script.start()
+                except Exception as e:
+                    print(f"Error starting instantiated script: {e}")
             
             return go
             
@@ -222,6 +376,59 @@ class GameRuntime:
             print(f"Error instantiating {prefab_path}: {e}")
             return None
 
+    def _add_objects(self, objects, scripts, parents):
+        """Adds objects built off-scene (a streamed chunk) in one step, linking parents and starting scripts."""
+        new_ids = {go.id: go for go in objects}
+        existing = {obj.id: obj for obj in self.objects}
+        for child, parent_id in parents:
+            parent = new_ids.get(parent_id) or existing.get(parent_id)
+            if parent:
+                child.parent = parent
+                parent.children.append(child)
+        
+        # Ids key physics bodies and removal: objects whose id is already live (the same scene
+        # loaded twice, copied scenes) get a fresh one. Parents are linked above, so nothing breaks.
+        for go in objects:
+            if go.id in existing:
+                go.id = str(uuid.uuid4())
+        
+        self.objects.extend(objects)
+        self.active_scripts.extend(scripts)
+        # While the scene itself is loading, start_scripts() starts these with the rest
+        if not self.loading:
+            for script in scripts:
+                self._start_script(script)
+
+    def _remove_objects(self, ids):
+        """Removes objects (a set of ids) from rendering, scripts, coroutines, batch systems and physics."""
+        kept = []
+        for obj in self.objects:
+            if obj.id not in ids:
+                if obj.parent is not None and obj.parent.id in ids:
+                    # Kept child of a removed parent (e.g. persistent): becomes a root where it is
+                    obj.position = list(obj.world_position)
+                    obj.rotation = obj.world_rotation
+                    obj.scale = list(obj.world_scale)
+                    obj.parent = None
+                kept.append(obj)
+            elif obj.parent is not None and obj.parent.id not in ids:
+                obj.parent.children = [c for c in obj.parent.children if c is not obj]
+        self.objects = kept
+        
+        # Remove Scripts (and any coroutines they started)
+        remaining = []
+        for s in self.active_scripts:
+            if s.game_object.id in ids:
+                self.scheduler.stop_all(s)
+                self.profiler.forget(s)
+            else:
+                remaining.append(s)
+        self.active_scripts = remaining
+        self.systems.remove_objects(ids)
+        
+        # Remove Physics
+        self.physics.remove_bodies(ids)
+
     def dispatch_collision_events(self, events):
         for obj, other in events:
             # Find script attached to obj
@@ -229,29 +436,86 @@ class GameRuntime:
             # Dispatch happens? scripts don't usually self-destruct in collision but catch errors anyway
             for script in self.active_scripts[:]: # Copy list for safety
                 if script.game_object == obj:
-                    try:
-                        script.on_collision_enter(other)
-                    except Exception as e:
-                        print(f"CRASH: Script '{type(script).__name__}' on '{obj.name}' failed in on_collision_enter: {e}")
-                        self._disable_crashing_script(script)
+                    self._call_script(script, "on_collision_enter", other)
 
-    def update_scripts(self, dt):
+    def _call_script(self, script, phase, *args):
+        """Runs one script callback with timing and crash sandboxing."""
+        try:
+            start = time.perf_counter()
+            getattr(script, phase)(*args)
+            if self.profiler.record(script, phase, time.perf_counter() - start):
+                self._disable_crashing_script(script, "exceeding its time budget")
+        except Exception as e:
+            print(f"CRASH: Script '{type(script).__name__}' on '{script.game_object.name}' failed in {phase}: {e}")
+            self._disable_crashing_script(script)
+
+    def _script_phases(self, script):
+        """Returns the per-tick phases a script's class actually overrides, so empty ones are never called."""
+        cls = type(script)
+        phases = self._phase_cache.get(cls)
+        if phases is None:
+            phases = set()
+            for name in ("fixed_update", "update", "late_update"):
+                if getattr(cls, name) is not getattr(Script, name):
+                    phases.add(name)
+            self._phase_cache[cls] = phases
+        return phases
+
+    def fixed_update_scripts(self, dt):
         # We iterate a copy because we might remove scripts if they crash
         for script in self.active_scripts[:]:
+            if "fixed_update" in self._script_phases(script):
+                self._call_script(script, "fixed_update", dt)
+
+    def update_scripts(self, dt):
+        for script in self.active_scripts[:]:
+            if "update" not in self._script_phases(script):
+                continue
+            
+            # Throttled scripts accumulate time and receive it all in one call
+            interval = script.update_interval
+            if interval > 0:
+                elapsed = getattr(script, "_update_elapsed", 0.0) + dt
+                if elapsed < interval:
+                    script._update_elapsed = elapsed
+                    continue
+                script._update_elapsed = 0.0
+                self._call_script(script, "update", elapsed)
+            else:
+                self._call_script(script, "update", dt)
+
+    def late_update_scripts(self, dt):
+        for script in self.active_scripts[:]:
+            if "late_update" in self._script_phases(script):
+                self._call_script(script, "late_update", dt)
+
+    def run_systems(self, phase, dt):
+        """Runs every batch system implementing phase: gather arrays, one call, scatter results."""
+        for system, batch in self.systems.for_phase(phase):
             try:
-                script.update(dt)
+                batch.gather()
+                start = time.perf_counter()
+                getattr(system, phase)(dt, batch)
+                over_budget = self.profiler.record(system, phase, time.perf_counter() - start)
+                batch.scatter(system.writes)
             except Exception as e:
-                print(f"CRASH: Script '{type(script).__name__}' on '{script.game_object.name}' failed in update: {e}")
-                self._disable_crashing_script(script)
-
-    def _disable_crashing_script(self, script):
-        """Safely removes a crashing script to keep the engine stable."""
+                print(f"CRASH: System '{type(system).__name__}' failed in {phase}: {e}")
+                over_budget = True
+            if over_budget:
+                self.systems.remove_system(system)
+                self.profiler.forget(system)
+                print(f"SANDBOX: Disabled system '{type(system).__name__}' ({len(batch)} objects).")
+
+    def _disable_crashing_script(self, script, reason="error"):
+        """Safely removes a crashing (or too slow) script to keep the engine stable."""
         if script in self.active_scripts:
             self.active_scripts.remove(script)
-            print(f"SANDBOX: Disabled script '{type(script).__name__}' on '{script.game_object.name}' due to error.")
+            self.profiler.forget(script)
+            self.scheduler.stop_all(script)
+            print(f"SANDBOX: Disabled script '{type(script).__name__}' on '{script.game_object.name}' due to {reason}.")
 
-    def load_script(self, script_path, game_object):
-        """Dynamically load a script file and instantiate its Script class."""
+    def load_script(self, script_path, game_object, scripts=None):
+        """Dynamically load a script file and instantiate its Script class (appended to scripts, default active_scripts)."""
         try:
             full_path = os.path.join(PROJECT_ROOT, script_path)
             if not os.path.exists(full_path):
@@ -259,10 +523,28 @@ class GameRuntime:
                 return
 
             module_name = os.path.splitext(os.path.basename(script_path))[0]
-            spec = importlib.util.spec_from_file_location(module_name, full_path)
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
+            
+            # Execute each script file once, not once per object or per scene using it.
+            # Hot reload replaces the sys.modules entry, so new objects still get the latest code.
+            tracked = self.script_reloader.tracked.get(module_name)
+            module = sys.modules.get(module_name) if tracked and tracked[0] == full_path else None
+            if module is None:
+                spec = importlib.util.spec_from_file_location(module_name, full_path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+                self.script_reloader.track(module_name, full_path)
+
+            # Batch systems: the object joins the shared system instance instead of getting its own script
+            for name, obj in inspect.getmembers(module):
+                if inspect.isclass(obj) and issubclass(obj, BatchSystem) and obj is not BatchSystem:
+                    system, created = self.systems.add(obj, (module_name, name), game_object)
+                    if created and system is not None:
+                        try:
+                            system.start()
+                        except Exception as e:
+                            print(f"Error in Start() of system {name}: {e}")
+                    return
 
             # Find class inheriting from Script
             for name, obj in inspect.getmembers(module):
@@ -278,7 +560,7 @@ class GameRuntime:
                         for key, value in props.items():
                             setattr(instance, key, value)
                             
-                    self.active_scripts.append(instance)
+                    (self.active_scripts if scripts is None else scripts).append(instance)
                     print(f"Attached script {name} to {game_object.name}")
                     return
 
@@ -286,122 +568,187 @@ class GameRuntime:
             print(f"Error loading script {script_path}: {e}")
 
     def load_level(self):
+        """Loads the whole scene synchronously (the run loop streams it instead, see begin_level_load)."""
+        self.begin_level_load()
+        self.continue_level_load(None)
+
+    def begin_level_load(self):
+        """Opens the scene as a stream. Objects are then built by continue_level_load() across frames."""
+        print(f"Loading scene: {self.scene_path}")
+        self._load_started = time.perf_counter()
         try:
-            print(f"Loading scene: {self.scene_path}")
-            data = load_scene(self.scene_path)
-            self.scene_settings = data.get("settings", {})
-            
-            # Sort objects for rendering order
-            raw_objects = data.get("objects", [])
-            raw_objects.sort(key=lambda o: 
-                o.get("components", {}).get("SpriteRenderer", {}).get("layer", 0))
-            
-            for obj_data in raw_objects:
-                if not obj_data.get("active", True):
-                    continue
-                
-                # Create Runtime GameObject
-                comps = obj_data.get("components", {})
-                transform = comps.get("Transform", {})
-                
-                pos = transform.get("position", [0, 0])
-                rot = transform.get("rotation", 0)
-                scale = transform.get("scale", [1, 1])
-                
-                go = GameObject(
-                    obj_data["id"], 
-                    obj_data["name"], 
-                    pos, rot, scale
-                )
-                
-                # Load Sprite
-                if "SpriteRenderer" in comps:
-                    sprite_data = comps["SpriteRenderer"]
-                    go.components["SpriteRenderer"] = sprite_data
-                    
-                    if sprite_data.get("visible", True):
-                        path = sprite_data.get("sprite_path")
-                        if path:
-                            full_path = os.path.join(PROJECT_ROOT, path)
-                            if full_path not in self.sprites:
-                                if os.path.exists(full_path):
-                                    self.sprites[full_path] = pygame.image.load(full_path).convert_alpha()
-                                else:
-                                    print(f"Warning: Sprite not found: {full_path}")
-                                    self.sprites[full_path] = None
-                
-                # Load Background
-                if "Background" in comps:
-                    bg_data = comps["Background"]
-                    go.components["Background"] = bg_data
-                    # Load Sprite if needed
-                    path = bg_data.get("sprite_path")
-                    if path:
-                        full_path = os.path.join(PROJECT_ROOT, path)
-                        if full_path not in self.sprites:
-                             if os.path.exists(full_path):
-                                 self.sprites[full_path] = pygame.image.load(full_path).convert_alpha()
-                             else:
-                                 # print(f"Warning: Background Sprite not found: {full_path}")
-                                 pass 
-
-                # Load Script
-                if "Script" in comps:
-                    go.components["Script"] = comps["Script"] # Store for access
-                    script_path = comps["Script"].get("script_path")
-                    if script_path:
-                        self.load_script(script_path, go)
-
-                    self.load_script(script_path, go)
-
-                # Load Physics Components
-                if "RigidBody" in comps:
-                    go.components["RigidBody"] = comps["RigidBody"]
-                
-                if "BoxCollider" in comps:
-                    go.components["BoxCollider"] = comps["BoxCollider"]
-                
-                if "CircleCollider" in comps:
-                    go.components["CircleCollider"] = comps["CircleCollider"]
-                
-                if "Camera" in comps:
-                    go.components["Camera"] = comps["Camera"]
-
-                self.objects.append(go)
-
-            # 2nd Pass: Link Hierarchy
-            obj_map = {obj.id: obj for obj in self.objects}
-            for obj_data in raw_objects:
-                obj_id = obj_data["id"]
-                parent_id = obj_data.get("parent")
-                
-                if obj_id in obj_map and parent_id and parent_id in obj_map:
-                    child = obj_map[obj_id]
-                    parent = obj_map[parent_id]
-                    
-                    child.parent = parent
-                    parent.children.append(child)
-                            
+            stream_path = self.scene_path
+            self.world = None
+            if self.scene_path.endswith(WORLD_SUFFIX):
+                # The base scene holds the header and always-loaded objects; chunks follow the camera
+                self.world = ChunkStreamer(self, self.scene_path)
+                stream_path = self.world.base_path
+            self.scene_stream = SceneStream(stream_path)
+            self._load_iter = self.scene_stream.objects()
+        except Exception as e:
+            print(f"Failed to load scene: {e}")
+            self.running = False
+            return
+        
+        self.loading = True
+        self._pending_parents = [] # (child GameObject, parent id), linked once every object exists
+        self.assets.reset_progress()
+        self._apply_scene_header() # Binary scenes have their settings before the first object
+
+    def continue_level_load(self, budget):
+        """
+        Builds streamed objects until `budget` seconds have passed (None = until done).
+        Returns True once the scene is fully loaded and its scripts have started.
+        """
+        if not self.loading:
+            return True
+        
+        deadline = None if budget is None else time.perf_counter() + budget
+        try:
+            for obj_data in self._load_iter:
+                if obj_data.get("active", True):
+                    self._build_object(obj_data)
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return False
         except Exception as e:
             print(f"Failed to load scene: {e}")
+            self.loading = False
             self.running = False
+            return True
+        
+        # JSON scenes store settings (and the preload manifest) after the objects
+        self._apply_scene_header()
+        
+        # Chunked worlds: the chunks around the camera are part of the initial load
+        if self.world:
+            self._link_parents()
+            remaining = None if budget is None else max(0.0, deadline - time.perf_counter())
+            if not self.world.update(remaining):
+                return False
+        
+        # Scripts start only once every requested texture/sound/prefab is ready
+        if budget is None:
+            self.assets.wait_all()
+        else:
+            self.assets.pump(deadline)
+            if self.assets.busy():
+                return False
+        
+        self._finish_level_load()
+        return True
+
+    def _apply_scene_header(self):
+        self.scene_settings = self.scene_stream.header.get("settings", {})
+        self.profiler.configure(self.scene_settings)
+        self.audio.configure(self.scene_settings)
+        # Preload manifest: sprites, sounds and prefabs the scene will need later (e.g. for spawning)
+        self.assets.preload(self.scene_settings.get("preload", []))
+        if self.world:
+            self.world.configure(self.scene_settings)
+
+    def _finish_level_load(self):
+        self.loading = False
+        self._load_iter = None
+        self._link_parents()
+        
+        # Rendering order (stable, so file order is kept within a layer)
+        self.objects.sort(key=lambda o: o.components.get("SpriteRenderer", {}).get("layer", 0))
+        
+        print(f"Loaded {len(self.objects)} objects in {time.perf_counter() - self._load_started:.2f} s")
+        print(self.assets.memory_report())
+        self.start_scripts()
+
+    def _link_parents(self):
+        """Links the hierarchy of the objects built so far."""
+        if not self._pending_parents:
+            return
+        obj_map = {obj.id: obj for obj in self.objects}
+        for child, parent_id in self._pending_parents:
+            parent = obj_map.get(parent_id)
+            if parent:
+                child.parent = parent
+                parent.children.append(child)
+        self._pending_parents = []
+
+    def _build_object(self, obj_data, objects=None, scripts=None, parents=None):
+        """
+        Creates the runtime GameObject for one scene/prefab object dict, with its assets and scripts.
+        The object, its script and its parent link go to the given lists (default: the live scene).
+        """
+        comps = obj_data.get("components", {})
+        transform = comps.get("Transform", {})
+        
+        pos = transform.get("position", [0, 0])
+        rot = transform.get("rotation", 0)
+        scale = transform.get("scale", [1, 1])
+        
+        go = GameObject(
+            obj_data["id"], 
+            obj_data["name"], 
+            pos, rot, scale
+        )
+        
+        for name in RUNTIME_COMPONENTS:
+            if name in comps:
+                go.components[name] = comps[name]
+        go.persistent = bool(obj_data.get("persistent", False))
+        
+        # Start decoding sprites in the background while the rest of the scene is built
+        self._request_object_assets(comps)
+        
+        # Load Script
+        if "Script" in comps:
+            script_path = comps["Script"].get("script_path")
+            if script_path:
+                self.load_script(script_path, go, scripts)
+        
+        parent_id = obj_data.get("parent")
+        if parent_id:
+            (self._pending_parents if parents is None else parents).append((go, parent_id))
+        
+        (self.objects if objects is None else objects).append(go)
+        return go
+
+    def _request_object_assets(self, comps):
+        sprite_data = comps.get("SpriteRenderer")
+        if sprite_data and sprite_data.get("visible", True):
+            sprite_key = sprite_data.get("region") or sprite_data.get("sprite_path")
+            if sprite_key:
+                self.assets.request(sprite_key, "image")
+        
+        bg_data = comps.get("Background")
+        if bg_data and bg_data.get("sprite_path"):
+            self.assets.request(bg_data["sprite_path"], "image")
 
     def start_scripts(self):
         for script in self.active_scripts:
-            # Inject Runtime API
-            self._inject_api(script)
-            
-            try:
-                script.start()
-                
-                # Re-inject properties to override defaults set in start()
-                # This ensures Inspector values take precedence
-                if hasattr(script, "game_object") and "Script" in script.game_object.components:
-                    props = script.game_object.components["Script"].get("properties", {})
-                    for key, value in props.items():
-                         setattr(script, key, value)
-            except Exception as e:
-                print(f"Error in Start() of {script}: {e}")
+            self._start_script(script)
+
+    def _start_script(self, script):
+        # Inject Runtime API
+        self._inject_api(script)
+        
+        try:
+            start = time.perf_counter()
+            script.start()
+            self.profiler.record(script, "start", time.perf_counter() - start)
+            
+            # Re-inject properties to override defaults set in start()
+            # This ensures Inspector values take precedence
+            if hasattr(script, "game_object") and "Script" in script.game_object.components:
+                props = script.game_object.components["Script"].get("properties", {})
+                for key, value in props.items():
+                     setattr(script, key, value)
+        except Exception as e:
+            print(f"Error in Start() of {script}: {e}")
+
+    def main_camera(self):
+        """The first object with a main Camera, or None."""
+        for go in self.objects:
+            cam = go.components.get("Camera")
+            if cam and cam.get("is_main", True):
+                return go
+        return None
 
 
 
@@ -416,23 +763,10 @@ class GameRuntime:
         keys = pygame.key.get_pressed()
         Input._keys = keys
 
-    def update_scripts(self, dt):
-        for script in self.active_scripts:
-            try:
-                script.update(dt)
-            except Exception as e:
-                print(f"Error in Update() of {script}: {e}")
-
     def draw(self):
         # 1. Find Main Camera
-        camera_obj = None
-        camera_comp = None
-        for go in self.objects:
-            cam = go.components.get("Camera")
-            if cam and cam.get("is_main", True):
-                camera_obj = go
-                camera_comp = cam
-                break
+        camera_obj = self.main_camera()
+        camera_comp = camera_obj.components["Camera"] if camera_obj else None
         
         
         # Default settings if no camera
@@ -509,8 +843,9 @@ class GameRuntime:
                     draw_zoom = zoom
                     base_w, base_h = 100, 100 # Default size
                     
-                    if path and path in self.sprites:
-                        base_w, base_h = self.sprites[path].get_size()
+                    bg_img = self.assets.get_image(path) if path else None
+                    if bg_img:
+                        base_w, base_h = bg_img.get_size()
                     
                     w = base_w * scale[0] * draw_zoom
                     h = base_h * scale[1] * draw_zoom
@@ -522,8 +857,8 @@ class GameRuntime:
                     target_rect.center = (screen_x, screen_y)
 
                 # Fetch Image or Create Surface
-                if path and path in self.sprites:
-                    img = self.sprites[path]
+                img = self.assets.get_image(path) if path else None
+                if img:
                     # Scale image to target rect
                     if img.get_size() != target_rect.size:
                         img = pygame.transform.scale(img, target_rect.size)
@@ -566,7 +901,8 @@ class GameRuntime:
             # --- 1. Draw Sprite (if exists and visible) ---
             sprite_data = go.components.get("SpriteRenderer")
             if sprite_data and sprite_data.get("visible", True):
-                path = sprite_data.get("sprite_path")
+                # An atlas region name takes precedence; packed sprite paths resolve to regions by themselves
+                path = sprite_data.get("region") or sprite_data.get("sprite_path")
                 img = None
                 
                 if not path:
@@ -578,8 +914,8 @@ class GameRuntime:
                     else:
                         img = pygame.Surface((50, 50), pygame.SRCALPHA)
                         img.fill((255, 255, 255))
-                elif path in self.sprites:
-                    img = self.sprites[path]
+                else:
+                    img = self.assets.get_image(path) # None while still loading
                 
                 if img:
                     rot = go.world_rotation
@@ -642,8 +978,24 @@ class GameRuntime:
                     rect = surf.get_rect(center=(screen_x, screen_y))
                     self.screen.blit(surf, rect)
 
+        if self.loading:
+            self._draw_loading_overlay(screen_w, screen_h)
+
         pygame.display.flip()
 
+    def _draw_loading_overlay(self, screen_w, screen_h):
+        progress = (self.scene_stream.progress() + self.assets.progress()) / 2
+        bar_w, bar_h = screen_w // 2, 12
+        x, y = (screen_w - bar_w) // 2, screen_h - 60
+        pygame.draw.rect(self.screen, (60, 60, 60), (x, y, bar_w, bar_h))
+        pygame.draw.rect(self.screen, (220, 220, 220), (x, y, int(bar_w * progress), bar_h))
+        
+        if not hasattr(self, "_font_cache"): self._font_cache = {}
+        if 18 not in self._font_cache:
+            self._font_cache[18] = pygame.font.SysFont("Arial", 18)
+        label = self._font_cache[18].render(f"Loading... {int(progress * 100)}%", True, (220, 220, 220))
+        self.screen.blit(label, label.get_rect(midbottom=(screen_w // 2, y - 6)))
+
 if __name__ == "__main__":
     # DPI Awareness for Windows
     if sys.platform == "win32":
@@ -664,5 +1016,5 @@ if __name__ == "__main__":
             print("\nCRITICAL ERROR: Runtime crashed.")
             input("Press Enter to close window...")
     else:
-        print("Usage: python runtime/game_loop.py <path_to_scene_json>")
+        print("Usage: python runtime/game_loop.py <path_to_scene .scene.json or .scene.bin>")
         input("Press Enter to close...")
@@ -0,0 +1,108 @@
+import os
+import sys
+import importlib.util
+import inspect
+
+from runtime.api import Script
+
+class ScriptReloader:
+    """
+    Watches the script files loaded by the runtime and re-executes them when they
+    change on disk. Live Script instances are swapped to the new class in place,
+    so their __dict__ (state, game_object binding, injected API) is preserved.
+    """
+    def __init__(self, poll_interval=0.5, base_classes=(Script,)):
+        self.poll_interval = poll_interval # Seconds between mtime checks
+        self.base_classes = tuple(base_classes) # Classes whose subclasses count as reloadable scripts
+        self.tracked = {} # module_name -> [full_path, mtime]
+        self._time_since_poll = 0.0
+
+    def track(self, module_name, full_path):
+        """Registers a script module that was loaded from full_path."""
+        try:
+            mtime = os.path.getmtime(full_path)
+        except OSError:
+            return
+        self.tracked[module_name] = [full_path, mtime]
+
+    def clear(self):
+        self.tracked.clear()
+
+    def poll(self, dt, scripts):
+        """Called once per frame. Only touches the filesystem every poll_interval seconds."""
+        self._time_since_poll += dt
+        if self._time_since_poll < self.poll_interval:
+            return []
+        self._time_since_poll = 0.0
+        return self.check(scripts)
+
+    def check(self, scripts):
+        """Reloads every tracked module whose file changed. Returns the reloaded module names."""
+        reloaded = []
+        for module_name, entry in list(self.tracked.items()):
+            path, mtime = entry
+            try:
+                current = os.path.getmtime(path)
+            except OSError:
+                # File missing (editor mid-save?). Keep old code, try again next poll.
+                continue
+            if current == mtime:
+                continue
+            entry[1] = current
+            if self.reload(module_name, path, scripts):
+                reloaded.append(module_name)
+        return reloaded
+
+    @staticmethod
+    def _restore(module_name, old_module):
+        if old_module is not None:
+            sys.modules[module_name] = old_module
+        else:
+            sys.modules.pop(module_name, None)
+
+    def reload(self, module_name, path, scripts):
+        """
+        Re-executes the module and rebinds instances of its Script classes.
+        If the new module fails to import, the previous module stays active.
+        """
+        old_module = sys.modules.get(module_name)
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+        except Exception as e:
+            # Rollback: running instances still point at the old classes, only sys.modules needs restoring
+            self._restore(module_name, old_module)
+            print(f"HOT RELOAD: '{module_name}' failed to import, keeping previous version: {e}")
+            return False
+
+        # Same lookup rule as GameRuntime.load_script
+        new_classes = {}
+        for name, obj in inspect.getmembers(module):
+            if inspect.isclass(obj) and issubclass(obj, self.base_classes) and obj not in self.base_classes:
+                new_classes[name] = obj
+
+        if not new_classes:
+            self._restore(module_name, old_module)
+            print(f"HOT RELOAD: '{module_name}' no longer defines a Script class, keeping previous version.")
+            return False
+
+        fallback = next(iter(new_classes.values()))
+        swapped = 0
+        for script in scripts:
+            cls = type(script)
+            if cls.__module__ != module_name:
+                continue
+            new_cls = new_classes.get(cls.__name__, fallback)
+            try:
+                script.__class__ = new_cls
+                swapped += 1
+            except TypeError as e:
+                # Incompatible layout (e.g. __slots__ changed). Leave this instance on the old class.
+                owner = getattr(script, "game_object", None)
+                where = f" on '{owner.name}'" if owner is not None else ""
+                print(f"HOT RELOAD: Could not swap '{cls.__name__}'{where}: {e}")
+
+        print(f"HOT RELOAD: Reloaded '{module_name}' ({swapped} live instance(s))")
+        return True
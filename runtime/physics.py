@@ -106,6 +106,13 @@ class PhysicsSystem:
                         body.velocity = (script_vel[0], script_vel[1])
             
 
+    def remove_bodies(self, ids):
+        """Removes the bodies (and their shapes) of the given object ids from the space."""
+        for obj_id in ids:
+            body = self.bodies.pop(obj_id, None)
+            if body is not None:
+                self.space.remove(body, *body.shapes)
+
     def custom_velocity_func(self, body, gravity, damping, dt):
         """
         Custom velocity callback to handle:
@@ -0,0 +1,125 @@
+class ScriptStats:
+    """Timing totals for one script instance (or one class when aggregated)."""
+    def __init__(self, label):
+        self.label = label
+        self.calls = 0
+        self.total = 0.0 # seconds
+        self.max = 0.0 # seconds
+        self.over_budget = 0
+
+    def add(self, elapsed, over_budget):
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        if over_budget:
+            self.over_budget += 1
+
+class ScriptProfiler:
+    """
+    Collects per-script execution times so frame time can be attributed to user scripts.
+
+    Budgets are in milliseconds per call. A script exceeding its budget is either logged
+    (action="log") or reported for disabling (action="disable") once it has gone over
+    budget `strikes` times in a row.
+    Budget lookup order: Script.budget_ms attribute, per-class override, global default.
+    """
+    ACTION_LOG = "log"
+    ACTION_DISABLE = "disable"
+
+    def __init__(self, budget_ms=None, action=ACTION_LOG, strikes=3):
+        self.enabled = True
+        self.budget_ms = budget_ms
+        self.class_budgets = {} # class name -> ms
+        self.action = action
+        self.strikes = strikes
+
+        self.per_script = {} # script instance -> ScriptStats
+        self._strike_counts = {} # script instance -> consecutive over-budget calls
+
+    def configure(self, settings):
+        """Applies budget options from scene settings (script_budget_ms, script_budget_action, script_budgets)."""
+        if "script_budget_ms" in settings:
+            self.budget_ms = settings["script_budget_ms"]
+        if "script_budget_action" in settings:
+            self.action = settings["script_budget_action"]
+        self.class_budgets.update(settings.get("script_budgets", {}))
+
+    def budget_for(self, script):
+        budget = getattr(script, "budget_ms", None)
+        if budget is None:
+            budget = self.class_budgets.get(type(script).__name__, self.budget_ms)
+        return budget
+
+    def record(self, script, phase, elapsed):
+        """
+        Records one call. Returns True if the script should be disabled for exceeding its budget.
+        """
+        if not self.enabled:
+            return False
+
+        stats = self.per_script.get(script)
+        if stats is None:
+            owner = getattr(script, "game_object", None)
+            if owner is not None:
+                stats = ScriptStats(f"{type(script).__name__} on '{owner.name}'")
+            else:
+                # Batch systems have no single owner object
+                stats = ScriptStats(f"{type(script).__name__} (system)")
+            self.per_script[script] = stats
+
+        budget = self.budget_for(script)
+        over = budget is not None and elapsed * 1000.0 > budget
+        stats.add(elapsed, over)
+
+        if not over:
+            self._strike_counts.pop(script, None)
+            return False
+
+        strikes = self._strike_counts.get(script, 0) + 1
+        self._strike_counts[script] = strikes
+
+        if self.action == self.ACTION_DISABLE:
+            if strikes >= self.strikes:
+                print(f"BUDGET: {stats.label} took {elapsed * 1000.0:.2f} ms in {phase} (budget {budget} ms), {strikes} times in a row.")
+                return True
+        elif strikes == 1:
+            # Log only the first call of an over-budget streak to avoid flooding the console at 120 Hz
+            print(f"BUDGET: {stats.label} took {elapsed * 1000.0:.2f} ms in {phase} (budget {budget} ms)")
+        return False
+
+    def forget(self, script):
+        """Stops strike tracking for a removed script. Its totals are kept for the report."""
+        self._strike_counts.pop(script, None)
+
+    def class_totals(self):
+        totals = {}
+        for script, stats in self.per_script.items():
+            name = type(script).__name__
+            agg = totals.get(name)
+            if agg is None:
+                agg = ScriptStats(name)
+                totals[name] = agg
+            agg.calls += stats.calls
+            agg.total += stats.total
+            agg.max = max(agg.max, stats.max)
+            agg.over_budget += stats.over_budget
+        return totals
+
+    def report(self, top=10):
+        """Returns a printable timing summary, slowest classes first."""
+        if not self.per_script:
+            return "=== Script Timing Report ===\n(no script calls recorded)"
+
+        lines = ["=== Script Timing Report ==="]
+        lines.append(f"{'Class':<24}{'Calls':>10}{'Total ms':>12}{'Avg ms':>10}{'Max ms':>10}{'Over':>8}")
+        totals = sorted(self.class_totals().values(), key=lambda s: s.total, reverse=True)
+        for s in totals:
+            avg = (s.total / s.calls * 1000.0) if s.calls else 0.0
+            lines.append(f"{s.label:<24}{s.calls:>10}{s.total * 1000.0:>12.2f}{avg:>10.3f}{s.max * 1000.0:>10.3f}{s.over_budget:>8}")
+
+        lines.append(f"Slowest instances (top {top}):")
+        instances = sorted(self.per_script.values(), key=lambda s: s.total, reverse=True)[:top]
+        for s in instances:
+            lines.append(f"  {s.label}: total {s.total * 1000.0:.2f} ms, max {s.max * 1000.0:.3f} ms, {s.calls} calls")
+        return "\n".join(lines)
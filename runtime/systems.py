@@ -0,0 +1,148 @@
+import numpy as np
+
+class BatchSystem:
+    """
+    Base class for vectorised behaviours.
+
+    Attach the system file to objects exactly like a Script (Script component ->
+    script_path). Instead of one instance per object, the runtime creates ONE instance
+    per system class and passes a ComponentBatch holding NumPy arrays for every member
+    object. Whatever the system writes into the arrays is scattered back afterwards.
+    """
+    # Components every member must have. Listing "RigidBody" makes batch.velocities available.
+    requires = ()
+    # Arrays scattered back to the objects after each call. Keep this minimal for speed.
+    writes = ("positions", "rotations", "scales", "velocities")
+
+    def start(self):
+        """Called once, when the first member object is loaded."""
+        pass
+
+    def fixed_update(self, dt, batch):
+        """Called at the fixed logic rate (120 Hz) with all members."""
+        pass
+
+    def update(self, dt, batch):
+        """Called once per rendered frame with all members."""
+        pass
+
+class ComponentBatch:
+    """
+    Packed transform/velocity arrays for a fixed list of objects.
+    Row i of every array belongs to objects[i].
+    """
+    def __init__(self, objects, with_velocities):
+        self.objects = objects
+        n = len(objects)
+        self.positions = np.zeros((n, 2), dtype=np.float64)
+        self.rotations = np.zeros(n, dtype=np.float64)
+        self.scales = np.ones((n, 2), dtype=np.float64)
+        self.velocities = np.zeros((n, 2), dtype=np.float64) if with_velocities else None
+
+    def __len__(self):
+        return len(self.objects)
+
+    def gather(self):
+        objs = self.objects
+        self.positions[:] = [o.position for o in objs]
+        self.rotations[:] = [o.rotation for o in objs]
+        self.scales[:] = [o.scale for o in objs]
+        if self.velocities is not None:
+            self.velocities[:] = [o.components["RigidBody"].get("velocity", (0.0, 0.0)) for o in objs]
+
+    def scatter(self, writes):
+        objs = self.objects
+        # tolist() converts to Python floats in one C call, much cheaper than indexing arrays per object
+        if "positions" in writes:
+            for o, (x, y) in zip(objs, self.positions.tolist()):
+                # Mutate in place: scripts and physics may hold a reference to this list
+                p = o.position
+                p[0] = x
+                p[1] = y
+        if "rotations" in writes:
+            for o, r in zip(objs, self.rotations.tolist()):
+                o.rotation = r
+        if "scales" in writes:
+            for o, (sx, sy) in zip(objs, self.scales.tolist()):
+                s = o.scale
+                s[0] = sx
+                s[1] = sy
+        if "velocities" in writes and self.velocities is not None:
+            for o, v in zip(objs, self.velocities.tolist()):
+                o.components["RigidBody"]["velocity"] = v
+
+class SystemRegistry:
+    """Owns the BatchSystem instances of a scene and their member objects."""
+    PHASES = ("fixed_update", "update")
+
+    def __init__(self):
+        self.systems = {} # (module_name, class_name) -> BatchSystem instance
+        self.members = {} # BatchSystem -> list of GameObjects
+        self._batches = {} # BatchSystem -> ComponentBatch (dropped when membership changes)
+        self._phases = {} # BatchSystem class -> set of overridden phase names (per class so hot reload stays correct)
+
+    def add(self, system_cls, key, game_object):
+        """
+        Adds game_object to the system identified by key, creating it if needed.
+        Returns (system, created). system is None if the object lacks required components.
+        """
+        system = self.systems.get(key)
+        created = system is None
+        if created:
+            system = system_cls()
+            self.systems[key] = system
+            self.members[system] = []
+
+        missing = [c for c in system.requires if c not in game_object.components]
+        if missing:
+            print(f"Warning: '{game_object.name}' skipped by {type(system).__name__}, missing {missing}")
+            return (system if created else None), created
+
+        self.members[system].append(game_object)
+        self._batches.pop(system, None)
+        return system, created
+
+    def remove_objects(self, ids):
+        for system, objs in self.members.items():
+            kept = [o for o in objs if o.id not in ids]
+            if len(kept) != len(objs):
+                self.members[system] = kept
+                self._batches.pop(system, None)
+
+    def remove_system(self, system):
+        for key, s in list(self.systems.items()):
+            if s is system:
+                del self.systems[key]
+        self.members.pop(system, None)
+        self._batches.pop(system, None)
+
+    def clear(self):
+        self.systems.clear()
+        self.members.clear()
+        self._batches.clear()
+        self._phases.clear()
+
+    def instances(self):
+        return list(self.systems.values())
+
+    def _phases_of(self, cls):
+        phases = self._phases.get(cls)
+        if phases is None:
+            phases = set(name for name in self.PHASES
+                         if getattr(cls, name) is not getattr(BatchSystem, name))
+            self._phases[cls] = phases
+        return phases
+
+    def for_phase(self, phase):
+        """Yields (system, batch) for systems that implement phase and have members."""
+        for system in list(self.systems.values()):
+            if phase not in self._phases_of(type(system)):
+                continue
+            objs = self.members.get(system)
+            if not objs:
+                continue
+            batch = self._batches.get(system)
+            if batch is None:
+                batch = ComponentBatch(objs, "RigidBody" in system.requires)
+                self._batches[system] = batch
+            yield system, batch
@@ -0,0 +1,157 @@
+import time
+
+from shared.scene_chunks import load_manifest, chunk_coords
+from shared.scene_stream import SceneStream
+
+class StagedLoad:
+    """
+    A scene file (or world chunk) built across frames while the game keeps running.
+    Objects, scripts and parent links are collected off-scene; GameRuntime._add_objects()
+    joins them to the world in one step once done is set. Assets requested while building
+    are referenced from this load's own scope, so they can be released with it.
+    """
+    def __init__(self, key, path):
+        self.key = key
+        self.path = path
+        self.stream = SceneStream(path)
+        self.iterator = self.stream.objects()
+        self.objects = []
+        self.scripts = []
+        self.parents = [] # (child GameObject, parent id)
+        self.assets = set() # Asset scope (see AssetManager.swap_scope)
+        self.done = False
+        self.failed = False
+        self.mode = None # Set by GameRuntime: None = stay staged (preload), "additive" or "switch"
+
+    @property
+    def header(self):
+        return self.stream.header
+
+    def step(self, runtime, deadline):
+        """Builds objects until deadline (perf_counter time, None = until done). Returns done."""
+        if self.done:
+            return True
+        outer_scope = runtime.assets.swap_scope(self.assets)
+        try:
+            for obj_data in self.iterator:
+                if obj_data.get("active", True):
+                    runtime._build_object(obj_data, self.objects, self.scripts, self.parents)
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return False
+            # Preload manifest of the staged scene
+            runtime.assets.preload(self.header.get("settings", {}).get("preload", []))
+        except Exception as e:
+            print(f"Failed to load {self.path}: {e}")
+            self.failed = True
+        finally:
+            runtime.assets.swap_scope(outer_scope)
+        self.stream.close()
+        self.done = True
+        return True
+
+    def cancel(self):
+        """Stops building. Returns the asset scope for release."""
+        self.stream.close()
+        self.done = True
+        return self.assets
+
+class ChunkStreamer:
+    """
+    Streams the chunks of a split world (python -m shared.scene_chunks) around the main camera.
+
+    Chunks within load_radius cells of the camera's cell are loaded, nearest first, one at a
+    time within the frame budget. Loaded chunks farther than keep_radius cells are unloaded:
+    their objects, scripts, coroutines and physics bodies are removed and their assets released.
+    keep_radius > load_radius, so walking along a cell border does not load and unload the same
+    chunk every frame. At most (2 * keep_radius + 1)^2 chunks are resident, whatever the world size.
+    """
+    def __init__(self, runtime, manifest_path, load_radius=1, keep_radius=2):
+        self.runtime = runtime
+        manifest = load_manifest(manifest_path)
+        self.base_path = manifest["base"]
+        self.chunk_size = manifest["chunk_size"]
+        self.chunks = manifest["chunks"] # (cx, cy) -> chunk scene path
+        self.load_radius = load_radius
+        self.keep_radius = max(keep_radius, load_radius)
+
+        self.loaded = {} # (cx, cy) -> (object ids, asset scope)
+        self.failed = set() # Chunks that could not be read (not retried)
+        self._building = None
+
+    def configure(self, settings):
+        """Applies scene settings["streaming"] (load_radius, keep_radius)."""
+        streaming = settings.get("streaming", {})
+        self.load_radius = streaming.get("load_radius", self.load_radius)
+        self.keep_radius = max(streaming.get("keep_radius", self.keep_radius), self.load_radius)
+
+    def update(self, budget):
+        """
+        Unloads far chunks and builds near ones until `budget` seconds have passed (None = until done).
+        Returns True when every chunk around the camera is loaded.
+        """
+        camera = self.runtime.main_camera()
+        if camera is None:
+            return True
+        pos = camera.world_position
+        center = chunk_coords(pos[0], pos[1], self.chunk_size)
+
+        for coords in [c for c in self.loaded if self._distance(c, center) > self.keep_radius]:
+            self.unload(coords)
+
+        deadline = None if budget is None else time.perf_counter() + budget
+        while True:
+            if self._building is None:
+                coords = self._next_wanted(center)
+                if coords is None:
+                    return True
+                try:
+                    self._building = StagedLoad(coords, self.chunks[coords])
+                except Exception as e:
+                    print(f"Failed to stream chunk {coords}: {e}")
+                    self.failed.add(coords)
+                    continue
+            if not self._continue(deadline):
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return self._next_wanted(center) is None
+
+    @staticmethod
+    def _distance(a, b):
+        return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+    def _next_wanted(self, center):
+        best = None
+        r = self.load_radius
+        for dx in range(-r, r + 1):
+            for dy in range(-r, r + 1):
+                coords = (center[0] + dx, center[1] + dy)
+                if coords in self.chunks and coords not in self.loaded and coords not in self.failed:
+                    if best is None or abs(dx) + abs(dy) < best[0]:
+                        best = (abs(dx) + abs(dy), coords)
+        return best[1] if best else None
+
+    def _continue(self, deadline):
+        """Builds more of the current chunk. Returns True once it has joined the scene."""
+        load = self._building
+        if not load.step(self.runtime, deadline):
+            return False
+        if load.failed:
+            self.failed.add(load.key)
+        self._building = None
+        self.runtime._add_objects(load.objects, load.scripts, load.parents)
+        self.loaded[load.key] = (set(go.id for go in load.objects), load.assets)
+        return True
+
+    def unload(self, coords):
+        ids, scope = self.loaded.pop(coords)
+        self.runtime._remove_objects(ids)
+        self.runtime.assets.release_scene(scope)
+
+    def detach(self):
+        """Stops streaming (scene change). Returns the asset scopes of every chunk, for release by the next scene."""
+        scopes = [scope for _, scope in self.loaded.values()]
+        if self._building is not None:
+            scopes.append(self._building.cancel())
+            self._building = None
+        self.loaded.clear()
+        return scopes
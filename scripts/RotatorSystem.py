@@ -0,0 +1,9 @@
+from runtime.systems import BatchSystem
+
+class RotatorSystem(BatchSystem):
+    # Batch version of Rotator: one call rotates every member
+    writes = ("rotations",)
+
+    def update(self, dt, batch):
+        # Rotate 90 degrees per second
+        batch.rotations += 90 * dt
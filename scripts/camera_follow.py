@@ -20,7 +20,8 @@ class CameraFollow(Script):
         if not self.target:
             print(f"CameraFollow: Could not find target '{self.target_name}'")
 
-    def update(self, dt):
+    def late_update(self, dt):
+        # Runs after physics so the camera tracks the target's final position for this frame
         if not self.target:
             # Try finding it again (maybe spawned late)
             self.target = self.find_object(self.target_name)
@@ -0,0 +1,150 @@
+"""
+Texture atlases.
+
+The packer collects every image under assets/ and shelf-packs them into atlas pages
+(assets/atlases/atlas_<n>.png) plus an index (assets/atlases/atlas.json):
+
+    {
+      "version": 1,
+      "pages": ["assets/atlases/atlas_0.png", ...],
+      "regions": {"assets/sprites/robot.png": {"page": 0, "rect": [x, y, w, h]}, ...}
+    }
+
+Region names are the project-relative paths of the source images, so an existing
+SpriteRenderer.sprite_path resolves to its region automatically. SpriteRenderer.region
+can name a region explicitly.
+
+CLI:
+    python -m shared.atlas [--page-size 2048] [--padding 2]
+"""
+import json
+import os
+import sys
+from typing import Dict, Any, Optional, List, Tuple
+
+ATLAS_DIR = "assets/atlases"
+ATLAS_INDEX = ATLAS_DIR + "/atlas.json"
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tga", ".webp")
+
+def normalize_key(path: str) -> str:
+    """Region key for a project-relative path (forward slashes, no leading ./)."""
+    key = path.replace("\\", "/")
+    while key.startswith("./"):
+        key = key[2:]
+    return key
+
+def load_index(project_root: str, index_path: str = ATLAS_INDEX) -> Optional[Dict[str, Any]]:
+    """Returns the atlas index, or None if the project has no atlas."""
+    full_path = os.path.join(project_root, index_path)
+    if not os.path.exists(full_path):
+        return None
+    try:
+        with open(full_path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: Could not read atlas index {full_path}: {e}")
+        return None
+
+def find_region(index: Optional[Dict[str, Any]], path: str) -> Optional[Tuple[str, List[int]]]:
+    """Returns (page path, [x, y, w, h]) for a sprite path or region name, or None."""
+    if not index or not path:
+        return None
+    region = index.get("regions", {}).get(normalize_key(path))
+    if region is None:
+        return None
+    return index["pages"][region["page"]], region["rect"]
+
+def shelf_pack(sizes: List[Tuple[str, int, int]], page_size: int, padding: int):
+    """
+    Packs (name, w, h) rectangles into square pages with a shelf packer.
+    Returns ({name: (page, x, y)}, page_count, skipped names that do not fit a page).
+    Tallest first keeps shelves tight.
+    """
+    placements = {}
+    skipped = []
+    page = 0
+    x = y = shelf_h = 0
+    used_any = False
+
+    for name, w, h in sorted(sizes, key=lambda s: (s[2], s[1]), reverse=True):
+        pw, ph = w + padding, h + padding
+        if pw > page_size or ph > page_size:
+            skipped.append(name)
+            continue
+        if x + pw > page_size: # Next shelf
+            x = 0
+            y += shelf_h
+            shelf_h = 0
+        if y + ph > page_size: # Next page
+            page += 1
+            x = y = shelf_h = 0
+        placements[name] = (page, x, y)
+        used_any = True
+        x += pw
+        shelf_h = max(shelf_h, ph)
+
+    return placements, (page + 1 if used_any else 0), skipped
+
+def collect_images(project_root: str, assets_dir: str = "assets") -> List[str]:
+    """Project-relative paths of every image under assets_dir, excluding existing atlas pages."""
+    atlas_dir = os.path.normpath(os.path.join(project_root, ATLAS_DIR))
+    found = []
+    for dirpath, dirnames, filenames in os.walk(os.path.join(project_root, assets_dir)):
+        if os.path.normpath(dirpath).startswith(atlas_dir):
+            continue
+        for filename in filenames:
+            if filename.lower().endswith(IMAGE_EXTS):
+                rel = os.path.relpath(os.path.join(dirpath, filename), project_root)
+                found.append(normalize_key(rel))
+    return sorted(found)
+
+def build_atlas(project_root: str, page_size: int = 2048, padding: int = 2) -> Dict[str, Any]:
+    """Packs all project images into atlas pages and writes the index. Returns the index."""
+    import pygame # Only the packer needs pygame; load_index/find_region stay dependency free
+
+    images = {}
+    for rel in collect_images(project_root):
+        try:
+            images[rel] = pygame.image.load(os.path.join(project_root, rel))
+        except Exception as e:
+            print(f"Skipping {rel}: {e}")
+
+    sizes = [(rel, surf.get_width(), surf.get_height()) for rel, surf in images.items()]
+    placements, page_count, skipped = shelf_pack(sizes, page_size, padding)
+    for rel in skipped:
+        print(f"Skipping {rel}: larger than the {page_size}px atlas page")
+
+    out_dir = os.path.join(project_root, ATLAS_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    pages = [pygame.Surface((page_size, page_size), pygame.SRCALPHA) for _ in range(page_count)]
+    regions = {}
+    for rel, (page, x, y) in placements.items():
+        surf = images[rel]
+        pages[page].blit(surf, (x, y))
+        regions[rel] = {"page": page, "rect": [x, y, surf.get_width(), surf.get_height()]}
+
+    page_paths = []
+    for i, page_surf in enumerate(pages):
+        rel = f"{ATLAS_DIR}/atlas_{i}.png"
+        pygame.image.save(page_surf, os.path.join(project_root, rel))
+        page_paths.append(rel)
+
+    index = {"version": 1, "page_size": page_size, "padding": padding, "pages": page_paths, "regions": regions}
+    with open(os.path.join(project_root, ATLAS_INDEX), "w") as f:
+        json.dump(index, f, indent=2)
+    return index
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {"--page-size": 2048, "--padding": 2}
+    while args:
+        flag = args.pop(0)
+        if flag not in options or not args:
+            print("Usage: python -m shared.atlas [--page-size 2048] [--padding 2]")
+            sys.exit(1)
+        options[flag] = int(args.pop(0))
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    index = build_atlas(root, options["--page-size"], options["--padding"])
+    print(f"Packed {len(index['regions'])} sprites into {len(index['pages'])} page(s) -> {ATLAS_INDEX}")
@@ -23,6 +23,7 @@ class SpriteRenderer:
     layer: int = 0
     visible: bool = True
     tint: Tuple[int, int, int, int] = (255, 255, 255, 255)
+    region: str = "" # Atlas region name (see shared/atlas.py). Empty = use sprite_path
 
 @dataclass
 class BoxCollider:
@@ -68,6 +69,13 @@ class Background:
     fixed: bool = True # If True, follows camera (UI space). If False, world space.
     layer: int = -100
 
+@dataclass
+class TextRenderer:
+    text: str = "Text"
+    font_size: int = 24
+    color: List[int] = field(default_factory=lambda: [255, 255, 255])
+    layer: int = 100 # Drawn over sprites by default
+
 @dataclass
 class Camera:
     width: float = 800.0
@@ -84,5 +92,7 @@ COMPONENT_MAP = {
     "CircleCollider": CircleCollider,
     "LightSource": LightSource,
     COMPONENT_SCRIPT: Script,
+    "Background": Background,
+    "TextRenderer": TextRenderer,
     "Camera": Camera,
 }
@@ -0,0 +1,326 @@
+"""
+Compact binary scene format (.scene.bin).
+
+Objects in a scene mostly share the same structure (same components, same keys), so
+the format stores each distinct structure once as a "template" and every object as
+a template index followed by its leaf values packed with struct. Every string (ids,
+names, asset paths) is stored once in a string table and referenced by index.
+
+Layout (varint = unsigned LEB128):
+    b"ASPS" u8 version
+    strings:   varint count, u32 character length per string, varint byte length, utf-8 blob
+    templates: varint byte length, JSON list of object skeletons
+    root:      varint byte length, JSON of the scene dict with "objects": []
+    objects:   varint count, then (varint template index, packed leaves) per object
+
+Decoding compiles one builder function per template, so an object is rebuilt with a
+single struct.unpack_from call and one nested dict/list literal. Conversion to and
+from JSON is lossless (types and key order included).
+
+CLI:
+    python -m shared.scene_binary to-bin  scenes/level.scene.json [out.scene.bin]
+    python -m shared.scene_binary to-json scenes/level.scene.bin  [out.scene.json]
+"""
+import gc
+import json
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Dict, Any, List
+
+MAGIC = b"ASPS"
+VERSION = 1
+BINARY_EXT = ".scene.bin"
+JSON_EXT = ".scene.json"
+
+# Skeleton leaves: "n" None (no data), "?" bool, "i" int32, "q" int64, "d" float64,
+# "s" string index, "big" int too large for int64 (stored as a string index).
+# Containers: ["l", item...] for lists, ["o", key, value, key, value...] for dicts.
+_LEAF_CODES = {"?": "?", "i": "i", "q": "q", "d": "d", "s": "I", "big": "I"}
+_INT32 = (-2 ** 31, 2 ** 31)
+_INT64 = (-2 ** 63, 2 ** 63)
+
+def is_binary_scene(raw: bytes) -> bool:
+    return raw[:4] == MAGIC
+
+def _write_varint(out: bytearray, n: int):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _read_varint(buf, pos: int):
+    b = buf[pos]
+    pos += 1
+    if b < 0x80:
+        return b, pos
+    result = b & 0x7F
+    shift = 7
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+class _Encoder:
+    def __init__(self):
+        self.strings = {} # str -> index
+        self.templates = {} # skeleton -> (index, struct.Struct)
+
+    def intern(self, s: str) -> int:
+        idx = self.strings.get(s)
+        if idx is None:
+            idx = len(self.strings)
+            self.strings[s] = idx
+        return idx
+
+    def skeleton(self, v, codes: List[str], values: list):
+        """Returns the hashable skeleton of v and appends its leaves to codes/values."""
+        if v is None:
+            return "n"
+        if v is True or v is False:
+            codes.append("?")
+            values.append(v)
+            return "?"
+        t = type(v)
+        if t is int:
+            if _INT32[0] <= v < _INT32[1]:
+                code = "i"
+            elif _INT64[0] <= v < _INT64[1]:
+                code = "q"
+            else:
+                codes.append("I")
+                values.append(self.intern(str(v)))
+                return "big"
+            codes.append(code)
+            values.append(v)
+            return code
+        if t is float:
+            codes.append("d")
+            values.append(v)
+            return "d"
+        if t is str:
+            codes.append("I")
+            values.append(self.intern(v))
+            return "s"
+        if t is list or t is tuple:
+            return ("l",) + tuple(self.skeleton(item, codes, values) for item in v)
+        if t is dict:
+            node = ["o"]
+            for key, value in v.items():
+                if type(key) is not str:
+                    raise TypeError(f"Scene dict keys must be strings, got {key!r}")
+                node.append(key)
+                node.append(self.skeleton(value, codes, values))
+            return tuple(node)
+        raise TypeError(f"Cannot encode {t.__name__} in a scene")
+
+    def write_object(self, out: bytearray, obj):
+        codes = []
+        values = []
+        skel = self.skeleton(obj, codes, values)
+        entry = self.templates.get(skel)
+        if entry is None:
+            entry = (len(self.templates), struct.Struct("<" + "".join(codes)))
+            self.templates[skel] = entry
+        _write_varint(out, entry[0])
+        out += entry[1].pack(*values)
+
+def dumps(scene_data: Dict[str, Any]) -> bytes:
+    """Encodes a scene dict to the binary format."""
+    enc = _Encoder()
+    objects = scene_data.get("objects", [])
+
+    body = bytearray()
+    _write_varint(body, len(objects))
+    for obj in objects:
+        enc.write_object(body, obj)
+
+    root = dict(scene_data)
+    if "objects" in root:
+        root["objects"] = [] # Keeps the key position; the objects follow in binary
+    root_json = json.dumps(root, separators=(",", ":")).encode("utf-8")
+    templates_json = json.dumps(list(enc.templates), separators=(",", ":")).encode("utf-8")
+
+    # Tables go first so readers can decode objects as they arrive
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    _write_varint(out, len(enc.strings))
+    lengths = array("I", [len(s) for s in enc.strings])
+    if sys.byteorder != "little":
+        lengths.byteswap()
+    out += lengths.tobytes()
+    blob = "".join(enc.strings).encode("utf-8")
+    _write_varint(out, len(blob))
+    out += blob
+    _write_varint(out, len(templates_json))
+    out += templates_json
+    _write_varint(out, len(root_json))
+    out += root_json
+    out += body
+    return bytes(out)
+
+def _compile_template(skel):
+    """Builds (struct.Struct, builder) for a skeleton read from a file."""
+    codes = []
+
+    # Only repr()'d keys and fixed tokens reach the generated source, never raw file data
+    def expr(node):
+        if isinstance(node, str):
+            if node == "n":
+                return "None"
+            code = _LEAF_CODES.get(node)
+            if code is None:
+                raise ValueError(f"Corrupt binary scene: unknown leaf {node!r}")
+            i = len(codes)
+            codes.append(code)
+            if node == "s":
+                return f"S[v[{i}]]"
+            if node == "big":
+                return f"int(S[v[{i}]])"
+            return f"v[{i}]"
+        if isinstance(node, list) and node:
+            if node[0] == "l":
+                return "[" + ", ".join(expr(n) for n in node[1:]) + "]"
+            if node[0] == "o" and len(node) % 2 == 1:
+                parts = []
+                for k in range(1, len(node), 2):
+                    key = node[k]
+                    if not isinstance(key, str):
+                        raise ValueError("Corrupt binary scene: non-string key in template")
+                    parts.append(f"{key!r}: {expr(node[k + 1])}")
+                return "{" + ", ".join(parts) + "}"
+        raise ValueError(f"Corrupt binary scene: bad template node {node!r}")
+
+    body = expr(skel)
+    namespace = {}
+    exec(f"def build(v, S):\n    return {body}\n", namespace)
+    return struct.Struct("<" + "".join(codes)), namespace["build"]
+
+class BinarySceneReader:
+    """
+    Decodes a binary scene. read_header() parses the tables and the root dict,
+    read_object() then decodes one object at a time (used by the streaming loader).
+    """
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+        self.strings: List[str] = []
+        self.templates = [] # (struct.Struct, builder)
+        self.object_count = 0
+        self.objects_read = 0
+
+    def read_header(self) -> Dict[str, Any]:
+        """Parses tables and root dict. Returns the root dict with an empty objects list."""
+        buf = self.buf
+        if bytes(buf[:4]) != MAGIC:
+            raise ValueError("Not a binary scene file")
+        version = buf[4]
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary scene version {version}")
+        pos = 5
+
+        # One utf-8 decode for the whole table, then slicing by character lengths
+        count, pos = _read_varint(buf, pos)
+        lengths = array("I")
+        lengths.frombytes(bytes(buf[pos:pos + 4 * count]))
+        if sys.byteorder != "little":
+            lengths.byteswap()
+        pos += 4 * count
+        length, pos = _read_varint(buf, pos)
+        text = str(buf[pos:pos + length], "utf-8")
+        pos += length
+        ends = list(accumulate(lengths))
+        self.strings = [text[end - n:end] for n, end in zip(lengths, ends)]
+
+        length, pos = _read_varint(buf, pos)
+        self.templates = [_compile_template(s) for s in json.loads(bytes(buf[pos:pos + length]))]
+        pos += length
+
+        length, pos = _read_varint(buf, pos)
+        root = json.loads(bytes(buf[pos:pos + length]))
+        pos += length
+
+        self.object_count, pos = _read_varint(buf, pos)
+        self.pos = pos
+        return root
+
+    def read_object(self) -> Dict[str, Any]:
+        idx, pos = _read_varint(self.buf, self.pos)
+        layout, build = self.templates[idx]
+        obj = build(layout.unpack_from(self.buf, pos), self.strings)
+        self.pos = pos + layout.size
+        self.objects_read += 1
+        return obj
+
+    def read_objects(self) -> List[Dict[str, Any]]:
+        """Decodes all remaining objects."""
+        buf = self.buf
+        strings = self.strings
+        templates = self.templates
+        pos = self.pos
+        objects = []
+        append = objects.append
+        # Only new acyclic containers are created here; the cyclic GC would just rescan them repeatedly
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(self.object_count - self.objects_read):
+                idx = buf[pos]
+                if idx < 0x80:
+                    pos += 1
+                else:
+                    idx, pos = _read_varint(buf, pos)
+                layout, build = templates[idx]
+                append(build(layout.unpack_from(buf, pos), strings))
+                pos += layout.size
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self.pos = pos
+        self.objects_read = self.object_count
+        return objects
+
+def loads(buf) -> Dict[str, Any]:
+    """Decodes a complete binary scene into the same dict json.load would return."""
+    reader = BinarySceneReader(buf)
+    root = reader.read_header()
+    objects = reader.read_objects()
+    if "objects" in root:
+        root["objects"] = objects
+    return root
+
+def convert(src: str, dst: str = None) -> str:
+    """Converts between .scene.json and .scene.bin based on the source file contents."""
+    with open(src, "rb") as f:
+        raw = f.read()
+
+    if is_binary_scene(raw):
+        if dst is None:
+            dst = (src[:-len(BINARY_EXT)] if src.endswith(BINARY_EXT) else src) + JSON_EXT
+        with open(dst, "w") as f:
+            json.dump(loads(raw), f, indent=2)
+    else:
+        if dst is None:
+            dst = (src[:-len(JSON_EXT)] if src.endswith(JSON_EXT) else src) + BINARY_EXT
+        with open(dst, "wb") as f:
+            f.write(dumps(json.loads(raw)))
+    return dst
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("to-bin", "to-json"):
+        print("Usage: python -m shared.scene_binary to-bin|to-json <scene file> [output]")
+        sys.exit(1)
+
+    src = sys.argv[2]
+    with open(src, "rb") as f:
+        is_bin = is_binary_scene(f.read(4))
+    if is_bin == (sys.argv[1] == "to-bin"):
+        print(f"{src} is already in the requested format.")
+        sys.exit(1)
+
+    out = convert(src, sys.argv[3] if len(sys.argv) > 3 else None)
+    print(f"Wrote {out}")
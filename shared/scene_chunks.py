@@ -0,0 +1,146 @@
+"""
+Spatial chunks for large worlds.
+
+The split tool cuts a scene into a grid of square cells and writes one scene file per
+non-empty cell, plus a base scene and a manifest:
+
+    scenes/<name>_world/
+        <name>.world.json           manifest (run this with the runtime)
+        base.scene.json             header (metadata, prefabs, settings) + always-loaded objects
+        chunk_<x>_<y>.scene.json    objects whose root lies in cell (x, y)
+
+    {
+      "version": 1,
+      "chunk_size": 1024,
+      "base": "base.scene.json",
+      "chunks": {"0,-1": {"path": "chunk_0_-1.scene.json", "objects": 42}, ...}
+    }
+
+Paths in the manifest are relative to the manifest. Hierarchies stay together: every
+object goes to the cell of its root's position. Always loaded (base scene): cameras,
+backgrounds, text, objects with "stream": false (e.g. the player) and their hierarchies.
+
+CLI:
+    python -m shared.scene_chunks <scene file> [--chunk-size 1024] [--binary] [--out DIR]
+"""
+import json
+import math
+import os
+import sys
+from typing import Dict, Any, List, Tuple
+
+from shared.scene_loader import load_scene, save_scene
+from shared import scene_binary
+
+WORLD_SUFFIX = ".world.json"
+ALWAYS_LOADED_COMPONENTS = ("Camera", "Background", "TextRenderer")
+
+def chunk_coords(x: float, y: float, chunk_size: float) -> Tuple[int, int]:
+    return math.floor(x / chunk_size), math.floor(y / chunk_size)
+
+def chunk_key(coords: Tuple[int, int]) -> str:
+    return f"{coords[0]},{coords[1]}"
+
+def parse_chunk_key(key: str) -> Tuple[int, int]:
+    x, y = key.split(",")
+    return int(x), int(y)
+
+def _parent_of(obj):
+    # The runtime reads "parent"; the editor writes Transform.parent_id
+    return obj.get("parent") or obj.get("components", {}).get("Transform", {}).get("parent_id")
+
+def split_scene(scene_data: Dict[str, Any], chunk_size: float):
+    """Returns (base scene dict, {(cx, cy): [objects]}). Object order within a file is kept."""
+    objects = scene_data.get("objects", [])
+    by_id = {obj.get("id"): obj for obj in objects}
+
+    def root_of(obj):
+        seen = set()
+        while True:
+            parent = by_id.get(_parent_of(obj))
+            if parent is None or id(parent) in seen:
+                return obj
+            seen.add(id(obj))
+            obj = parent
+
+    # Hierarchies containing an always-loaded object stay in the base scene
+    pinned_roots = set()
+    for obj in objects:
+        comps = obj.get("components", {})
+        if obj.get("stream") is False or any(name in comps for name in ALWAYS_LOADED_COMPONENTS):
+            pinned_roots.add(id(root_of(obj)))
+
+    base_objects = []
+    chunks = {}
+    for obj in objects:
+        root = root_of(obj)
+        if id(root) in pinned_roots:
+            base_objects.append(obj)
+            continue
+        pos = root.get("components", {}).get("Transform", {}).get("position", [0.0, 0.0])
+        chunks.setdefault(chunk_coords(pos[0], pos[1], chunk_size), []).append(obj)
+
+    base = {key: value for key, value in scene_data.items() if key != "objects"}
+    base["objects"] = base_objects
+    return base, chunks
+
+def write_world(scene_path: str, out_dir: str = None, chunk_size: float = 1024, binary: bool = False) -> str:
+    """Splits a scene file into a chunked world. Returns the manifest path."""
+    scene_data = load_scene(scene_path)
+    name = os.path.basename(scene_path)
+    for suffix in (scene_binary.BINARY_EXT, scene_binary.JSON_EXT):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    if out_dir is None:
+        out_dir = os.path.join(os.path.dirname(scene_path), f"{name}_world")
+    os.makedirs(out_dir, exist_ok=True)
+
+    ext = scene_binary.BINARY_EXT if binary else scene_binary.JSON_EXT
+    base, chunks = split_scene(scene_data, chunk_size)
+    save_scene(base, os.path.join(out_dir, "base" + ext))
+
+    manifest = {"version": 1, "chunk_size": chunk_size, "base": "base" + ext, "chunks": {}}
+    for coords in sorted(chunks):
+        filename = f"chunk_{coords[0]}_{coords[1]}{ext}"
+        save_scene({"objects": chunks[coords]}, os.path.join(out_dir, filename))
+        manifest["chunks"][chunk_key(coords)] = {"path": filename, "objects": len(chunks[coords])}
+
+    manifest_path = os.path.join(out_dir, name + WORLD_SUFFIX)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Reads a world manifest. Base and chunk paths are returned absolute."""
+    with open(path, "r") as f:
+        manifest = json.load(f)
+    root = os.path.dirname(os.path.abspath(path))
+    manifest["base"] = os.path.join(root, manifest["base"])
+    manifest["chunks"] = {parse_chunk_key(key): os.path.join(root, chunk["path"])
+                          for key, chunk in manifest.get("chunks", {}).items()}
+    return manifest
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    source = None
+    options = {"--chunk-size": 1024.0, "--out": None, "--binary": False}
+    while args:
+        arg = args.pop(0)
+        if arg == "--binary":
+            options[arg] = True
+        elif arg in ("--chunk-size", "--out") and args:
+            value = args.pop(0)
+            options[arg] = float(value) if arg == "--chunk-size" else value
+        elif source is None:
+            source = arg
+        else:
+            source = None
+            break
+
+    if source is None:
+        print("Usage: python -m shared.scene_chunks <scene file> [--chunk-size 1024] [--binary] [--out DIR]")
+        sys.exit(1)
+
+    manifest_path = write_world(source, options["--out"], options["--chunk-size"], options["--binary"])
+    manifest = load_manifest(manifest_path)
+    print(f"Wrote {len(manifest['chunks'])} chunk(s) -> {manifest_path}")
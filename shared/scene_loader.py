@@ -2,24 +2,33 @@ import json
 import os
 from typing import Dict, Any
 
+from shared import scene_binary
+
 def save_scene(scene_data: Dict[str, Any], path: str):
-    """Saves scene data dictionary to a JSON file."""
+    """Saves scene data dictionary to a JSON file, or to the binary format for .scene.bin paths."""
     try:
-        with open(path, 'w') as f:
-            json.dump(scene_data, f, indent=2)
+        if path.endswith(scene_binary.BINARY_EXT):
+            data = scene_binary.dumps(scene_data)
+            with open(path, 'wb') as f:
+                f.write(data)
+        else:
+            with open(path, 'w') as f:
+                json.dump(scene_data, f, indent=2)
     except Exception as e:
         print(f"Error saving scene to {path}: {e}")
         raise
 
 def load_scene(path: str) -> Dict[str, Any]:
-    """Loads scene data from a JSON file."""
+    """Loads scene data from a JSON or binary scene file (detected from the file header)."""
     if not os.path.exists(path):
         raise FileNotFoundError(f"Scene file not found: {path}")
-    
+
     try:
-        with open(path, 'r') as f:
-            data = json.load(f)
-            return data
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if scene_binary.is_binary_scene(raw):
+            return scene_binary.loads(raw)
+        return json.loads(raw)
     except Exception as e:
         print(f"Error loading scene from {path}: {e}")
         raise
@@ -0,0 +1,171 @@
+"""
+Incremental scene reading. SceneStream yields scene objects one at a time without
+materialising the whole document, so a loader can build them across frames.
+
+JSON scenes are read in chunks and each object is decoded with JSONDecoder.raw_decode
+as soon as it is complete. Binary scenes (.scene.bin) are memory-mapped and decoded
+object by object.
+"""
+import codecs
+import json
+import mmap
+import os
+from typing import Dict, Any, Iterator
+
+from shared import scene_binary
+
+_WHITESPACE = " \t\n\r"
+
+class SceneStream:
+    """
+    Usage:
+        stream = SceneStream(path)
+        for obj in stream.objects():
+            ...
+        stream.header # every top-level key except "objects"
+
+    For binary scenes the header is complete before the first object. For JSON scenes
+    keys stored after "objects" (usually prefabs and settings) appear once iteration ends.
+    """
+    def __init__(self, path: str, chunk_size: int = 1 << 16):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Scene file not found: {path}")
+        self.path = path
+        self.chunk_size = chunk_size
+        self.header: Dict[str, Any] = {}
+        self.done = False
+
+        self._size = os.path.getsize(path)
+        self._bytes_read = 0
+        self._binary = None
+
+        with open(path, "rb") as f:
+            self.is_binary = scene_binary.is_binary_scene(f.read(4))
+
+        if self.is_binary:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._binary = scene_binary.BinarySceneReader(self._map)
+            self.header = self._binary.read_header()
+            self.header.pop("objects", None)
+
+    def progress(self) -> float:
+        """Fraction of the file consumed so far (0..1)."""
+        if self.done:
+            return 1.0
+        if self._binary is not None:
+            total = self._binary.object_count
+            return self._binary.objects_read / total if total else 1.0
+        return self._bytes_read / self._size if self._size else 1.0
+
+    def objects(self) -> Iterator[Dict[str, Any]]:
+        if self._binary is not None:
+            return self._iter_binary()
+        return self._iter_json()
+
+    def close(self):
+        if self._binary is not None:
+            self._binary = None
+            self._map.close()
+        self.done = True
+
+    # --- Binary ---
+    def _iter_binary(self):
+        reader = self._binary
+        try:
+            while reader.objects_read < reader.object_count:
+                yield reader.read_object()
+        finally:
+            self.close()
+
+    # --- JSON ---
+    def _iter_json(self):
+        self._file = open(self.path, "rb")
+        self._utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+        try:
+            yield from self._parse_top_level()
+        finally:
+            self._file.close()
+            self.done = True
+
+    def _fill(self, size=None) -> bool:
+        """Appends the next chunk to the buffer. Returns False at end of file."""
+        if self._eof:
+            return False
+        data = self._file.read(size or self.chunk_size)
+        self._bytes_read += len(data)
+        if not data:
+            self._eof = True
+            self._buf += self._utf8.decode(b"", final=True)
+            return False
+        # Drop consumed text so memory stays bounded by the largest single object
+        if self._pos > self.chunk_size:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += self._utf8.decode(data)
+        return True
+
+    def _peek(self) -> str:
+        """Skips whitespace and returns the next character ('' at end of file)."""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            n = len(buf)
+            while pos < n and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < n:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        ch = self._peek()
+        if not ch or ch not in chars:
+            raise json.JSONDecodeError(f"Expected one of {chars!r}", self._buf, self._pos)
+        self._pos += 1
+        return ch
+
+    def _value(self):
+        """Decodes one complete JSON value, reading more of the file as needed."""
+        self._peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A number ending exactly at the buffer end may continue in the next chunk
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Value spans past the buffer: read more. Doubling keeps huge values linear overall.
+            self._fill(read_size)
+            read_size *= 2
+
+    def _parse_top_level(self):
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == "objects" and self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._expect(",]") == "]":
+                            break
+            else:
+                self.header[key] = self._value()
+            if self._expect(",}") == "}":
+                return
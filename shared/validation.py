@@ -1,55 +1,336 @@
+"""
+Scene validation.
+
+SceneValidator checks a scene for:
+- duplicate / missing object ids,
+- missing sprite, script, sound and prefab files (including prefabs referenced from
+  Script properties and the settings["preload"] manifest) and unknown atlas regions,
+- broken hierarchies (unknown parents, cycles),
+- component names not in COMPONENT_MAP,
+- numeric sanity (NaN/inf values, negative mass, non-positive sizes, radii, zoom; zero scale).
+  Zero mass is valid: it marks a static body.
+
+Filesystem lookups are cached for the validator's lifetime: each directory is listed
+once and each referenced prefab is parsed and checked once, however many objects and
+scenes use it. Create a new validator (or call clear_cache()) after assets change.
+
+CLI (validates scene files in parallel, exit code 1 if any scene has errors):
+    python -m shared.validation [--jobs N] [--root PROJECT_DIR] [--quiet] <scene files or directories>...
+"""
+import json
+import math
 import os
-from typing import List, Dict, Any
-from shared.component_defs import COMPONENT_SPRITE_RENDERER, COMPONENT_SCRIPT
+import sys
+from typing import List, Dict, Any, Optional
+
+from shared.component_defs import COMPONENT_SPRITE_RENDERER, COMPONENT_SCRIPT, COMPONENT_MAP
+
+ASSET_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tga", ".webp",
+              ".wav", ".ogg", ".mp3", ".flac", ".prefab")
+SCENE_SUFFIXES = (".scene.json", ".scene.bin")
+
+# Numeric fields that must be > 0: component -> keys
+POSITIVE_FIELDS = {
+    "CircleCollider": ("radius",),
+    "Camera": ("width", "height", "zoom"),
+    "TextRenderer": ("font_size",),
+}
+
+def _finite(value) -> bool:
+    if isinstance(value, bool):
+        return True
+    if isinstance(value, float):
+        return math.isfinite(value)
+    if isinstance(value, (list, tuple)):
+        return all(_finite(v) for v in value)
+    return True
+
+class SceneValidator:
+    def __init__(self, project_root: str):
+        self.project_root = os.path.abspath(project_root)
+        self.clear_cache()
+
+    def clear_cache(self):
+        self._listings = {} # directory -> set of entry names
+        self._exists = {} # path as written -> bool
+        self._prefab_errors = {} # prefab path -> list of errors inside the prefab
+        self._atlas = None
+
+    # --- Cached filesystem ---
+    def exists(self, path: str) -> bool:
+        """Whether a project-relative (or absolute) path exists. One directory listing per directory."""
+        cached = self._exists.get(path)
+        if cached is not None:
+            return cached
+
+        full = os.path.normpath(os.path.join(self.project_root, path.replace("\\", "/")))
+        directory, name = os.path.split(full)
+        listing = self._listings.get(directory)
+        if listing is None:
+            try:
+                listing = set(os.listdir(directory))
+            except OSError:
+                listing = set()
+            self._listings[directory] = listing
+        # Case-insensitive filesystems may still find a name the listing spells differently
+        found = name in listing or (bool(listing) and os.path.exists(full))
+        self._exists[path] = found
+        return found
+
+    def _atlas_regions(self):
+        if self._atlas is None:
+            from shared.atlas import load_index
+            index = load_index(self.project_root)
+            self._atlas = index.get("regions", {}) if index else {}
+        return self._atlas
+
+    def _check_prefab(self, path: str) -> List[str]:
+        """Errors inside a referenced prefab file (parsed once per validator)."""
+        errors = self._prefab_errors.get(path)
+        if errors is not None:
+            return errors
+        errors = []
+        self._prefab_errors[path] = errors # Guards against prefabs that reference themselves
+        try:
+            with open(os.path.join(self.project_root, path.replace("\\", "/")), "r") as f:
+                prefab = json.load(f)
+        except Exception as e:
+            errors.append(f"Prefab '{path}' could not be read: {e}")
+            return errors
+        self._check_object(prefab, f"prefab '{path}'", errors)
+        return errors
+
+    # --- Checks ---
+    def _check_ref(self, path, kind, where, errors):
+        if not path:
+            return
+        if not self.exists(path):
+            errors.append(f"Missing {kind}: '{path}' in {where}")
+        elif path.lower().endswith(".prefab"):
+            errors.extend(self._check_prefab(path))
+
+    def _check_object(self, obj: Dict[str, Any], where: str, errors: List[str]):
+        components = obj.get("components", {})
+        if not isinstance(components, dict):
+            errors.append(f"Components of {where} must be an object")
+            return
+
+        for comp_name, comp in components.items():
+            if comp_name not in COMPONENT_MAP:
+                errors.append(f"Unknown component '{comp_name}' in {where}")
+                continue
+            if not isinstance(comp, dict):
+                errors.append(f"Component '{comp_name}' in {where} must be an object")
+                continue
+            for key, value in comp.items():
+                if not _finite(value):
+                    errors.append(f"Non-finite {comp_name}.{key} in {where}: {value}")
+            for key in POSITIVE_FIELDS.get(comp_name, ()):
+                value = comp.get(key)
+                if isinstance(value, (int, float)) and not value > 0:
+                    errors.append(f"{comp_name}.{key} must be positive in {where}: {value}")
+
+        rigidbody = components.get("RigidBody")
+        if isinstance(rigidbody, dict):
+            mass = rigidbody.get("mass", 1.0)
+            if isinstance(mass, (int, float)) and mass < 0: # 0 = static body
+                errors.append(f"Negative RigidBody.mass in {where}: {mass}")
+
+        transform = components.get("Transform")
+        if isinstance(transform, dict):
+            scale = transform.get("scale")
+            if isinstance(scale, (list, tuple)) and any(s == 0 for s in scale):
+                errors.append(f"Zero Transform.scale in {where}: {scale}")
+
+        box = components.get("BoxCollider")
+        if isinstance(box, dict):
+            size = box.get("size")
+            if isinstance(size, (list, tuple)) and any(isinstance(s, (int, float)) and not s > 0 for s in size):
+                errors.append(f"BoxCollider.size must be positive in {where}: {size}")
+
+        # File references
+        sprite = components.get(COMPONENT_SPRITE_RENDERER)
+        if isinstance(sprite, dict):
+            self._check_ref(sprite.get("sprite_path"), "sprite asset", where, errors)
+            region = sprite.get("region")
+            if region and region.replace("\\", "/") not in self._atlas_regions():
+                errors.append(f"Unknown atlas region: '{region}' in {where}")
+        background = components.get("Background")
+        if isinstance(background, dict):
+            self._check_ref(background.get("sprite_path"), "background image", where, errors)
+        script = components.get(COMPONENT_SCRIPT)
+        if isinstance(script, dict):
+            self._check_ref(script.get("script_path"), "script file", where, errors)
+            # Prefabs, sprites and sounds passed to scripts as properties
+            for key, value in (script.get("properties") or {}).items():
+                if isinstance(value, str) and value.lower().endswith(ASSET_EXTS):
+                    self._check_ref(value, f"asset (property '{key}')", where, errors)
+
+    @staticmethod
+    def _parent_of(obj):
+        # The runtime reads "parent"; the editor writes Transform.parent_id
+        parent = obj.get("parent")
+        if not parent:
+            transform = obj.get("components", {}).get("Transform")
+            if isinstance(transform, dict):
+                parent = transform.get("parent_id")
+        return parent
 
-def validate_scene(scene_data: Dict[str, Any], project_root: str) -> List[str]:
+    def _check_hierarchy(self, objects, by_id, errors):
+        parents = {}
+        for obj in objects:
+            obj_id = obj.get("id")
+            parent = self._parent_of(obj)
+            if not obj_id or not parent:
+                continue
+            if parent not in by_id:
+                errors.append(f"Unknown parent '{parent}' on '{obj.get('name')}'")
+            else:
+                parents[obj_id] = parent
+
+        # Walk each chain once; ids already proven acyclic stop the walk early
+        done = set()
+        for start in parents:
+            path = []
+            on_path = set()
+            node = start
+            while node in parents and node not in done:
+                if node in on_path:
+                    cycle = path[path.index(node):]
+                    names = " -> ".join(str(by_id[i].get("name", i)) for i in cycle + [node])
+                    errors.append(f"Hierarchy cycle: {names}")
+                    break
+                on_path.add(node)
+                path.append(node)
+                node = parents[node]
+            done.update(path)
+
+    def validate(self, scene_data: Dict[str, Any]) -> List[str]:
+        """Returns a list of error messages. Empty list means valid."""
+        errors = []
+
+        # Check structure
+        if "objects" not in scene_data:
+            errors.append("Scene missing 'objects' list.")
+            return errors
+
+        objects = scene_data.get("objects", [])
+        by_id = {}
+
+        for obj in objects:
+            # Check ID
+            obj_id = obj.get("id")
+            if not obj_id:
+                errors.append(f"Object missing ID: {obj.get('name', 'Unknown')}")
+            elif obj_id in by_id:
+                errors.append(f"Duplicate Object ID found: {obj_id} on '{obj.get('name')}'")
+            else:
+                by_id[obj_id] = obj
+
+            self._check_object(obj, f"object '{obj.get('name')}'", errors)
+
+        self._check_hierarchy(objects, by_id, errors)
+
+        # Prefabs stored in the scene: inline definitions or paths
+        for name, prefab in (scene_data.get("prefabs") or {}).items():
+            if isinstance(prefab, str):
+                self._check_ref(prefab, "prefab", f"scene prefab '{name}'", errors)
+            elif isinstance(prefab, dict):
+                self._check_object(prefab, f"scene prefab '{name}'", errors)
+
+        for path in (scene_data.get("settings") or {}).get("preload", []):
+            self._check_ref(path, "preloaded asset", "settings.preload", errors)
+
+        return errors
+
+    def validate_file(self, path: str) -> List[str]:
+        from shared.scene_loader import load_scene
+        try:
+            scene_data = load_scene(path)
+        except Exception as e:
+            return [f"Could not load scene: {e}"]
+        return self.validate(scene_data)
+
+def validate_scene(scene_data: Dict[str, Any], project_root: str, validator: Optional[SceneValidator] = None) -> List[str]:
     """
     Validates the scene data.
     Returns a list of error messages. Empty list means valid.
+    Pass a SceneValidator to reuse its filesystem cache across scenes.
     """
-    errors = []
-    
-    # Check structure
-    if "objects" not in scene_data:
-        errors.append("Scene missing 'objects' list.")
-        return errors
+    if validator is None:
+        validator = SceneValidator(project_root)
+    return validator.validate(scene_data)
 
-    objects = scene_data.get("objects", [])
-    seen_ids = set()
+# --- Parallel CLI ---
+_worker_validator = None
 
-    for obj in objects:
-        # Check ID
-        obj_id = obj.get("id")
-        if not obj_id:
-            errors.append(f"Object missing ID: {obj.get('name', 'Unknown')}")
-        elif obj_id in seen_ids:
-            errors.append(f"Duplicate Object ID found: {obj_id} on '{obj.get('name')}'")
+def _init_worker(project_root):
+    global _worker_validator
+    _worker_validator = SceneValidator(project_root)
+
+def _validate_worker(path):
+    return path, _worker_validator.validate_file(path)
+
+def collect_scene_files(paths: List[str]) -> List[str]:
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(SCENE_SUFFIXES):
+                        found.append(os.path.join(dirpath, filename))
         else:
-            seen_ids.add(obj_id)
+            found.append(path)
+    return found
 
-        # Check Components
-        components = obj.get("components", {})
-        
-        # SpriteRenderer Validation
-        if COMPONENT_SPRITE_RENDERER in components:
-            comp = components[COMPONENT_SPRITE_RENDERER]
-            path = comp.get("sprite_path")
-            if path:
-                # Resolve path relative to valid asset dirs or project root
-                # Assuming path is relative to 'assets' or absolute
-                # The user said "Assets referenced by relative path"
-                # Let's assume relative to project_root
-                full_path = os.path.join(project_root, path)
-                if not os.path.exists(full_path):
-                    errors.append(f"Missing sprite asset: '{path}' in object '{obj.get('name')}'")
-
-        # Script Validation
-        if COMPONENT_SCRIPT in components:
-            comp = components[COMPONENT_SCRIPT]
-            path = comp.get("script_path")
-            if path:
-                full_path = os.path.join(project_root, path)
-                if not os.path.exists(full_path):
-                    errors.append(f"Missing script file: '{path}' in object '{obj.get('name')}'")
-
-    return errors
+def validate_files(paths: List[str], project_root: str, jobs: Optional[int] = None):
+    """Validates scene files on a process pool. Yields (path, errors) in input order."""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(paths) < 2:
+        validator = SceneValidator(project_root)
+        for path in paths:
+            yield path, validator.validate_file(path)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    # Big chunks amortise process round trips; each worker keeps its own cache
+    chunksize = max(1, len(paths) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(project_root,)) as pool:
+        yield from pool.map(_validate_worker, paths, chunksize=chunksize)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    jobs = None
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    quiet = False
+    targets = []
+    while args:
+        arg = args.pop(0)
+        if arg in ("--jobs", "--root") and args:
+            value = args.pop(0)
+            if arg == "--jobs":
+                jobs = int(value)
+            else:
+                root = os.path.abspath(value)
+        elif arg == "--quiet":
+            quiet = True
+        else:
+            targets.append(arg)
+
+    if not targets:
+        print("Usage: python -m shared.validation [--jobs N] [--root PROJECT_DIR] [--quiet] <scene files or directories>...")
+        sys.exit(2)
+
+    files = collect_scene_files(targets)
+    failed = 0
+    for path, errors in validate_files(files, root, jobs):
+        if errors:
+            failed += 1
+            print(f"FAIL {path}")
+            for error in errors:
+                print(f"   [x] {error}")
+        elif not quiet:
+            print(f"ok   {path}")
+    print(f"{len(files) - failed}/{len(files)} scenes valid")
+    sys.exit(1 if failed else 0)
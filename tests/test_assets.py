@@ -0,0 +1,145 @@
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from runtime.assets import AssetManager
+
+class TestAssetLifetime(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for name in ("shared.prefab", "old.prefab", "new.prefab"):
+            with open(os.path.join(self.root, name), "w") as f:
+                json.dump({"name": name, "components": {}}, f)
+        self.assets = AssetManager(self.root, workers=2)
+
+    def tearDown(self):
+        self.assets.shutdown()
+        shutil.rmtree(self.root)
+
+    def test_shared_assets_survive_scene_change(self):
+        """Assets used by both scenes stay loaded; the old scene's other assets become unused."""
+        self.assets.load("shared.prefab")
+        self.assets.load("old.prefab")
+        shared = self.assets.prefabs[self.assets.resolve("shared.prefab")]
+
+        previous = self.assets.begin_scene()
+        self.assets.load("shared.prefab")
+        self.assets.load("new.prefab")
+        self.assets.release_scene(previous)
+
+        # Same object: not reloaded from disk
+        self.assertIs(self.assets.prefabs[self.assets.resolve("shared.prefab")], shared)
+        # Unused but within budget: kept for reuse
+        self.assertIn(self.assets.resolve("old.prefab"), self.assets.prefabs)
+
+        self.assets.trim(budget=-1)
+        self.assertNotIn(self.assets.resolve("old.prefab"), self.assets.prefabs)
+        self.assertIn(self.assets.resolve("shared.prefab"), self.assets.prefabs)
+        self.assertFalse(self.assets.unload("new.prefab")) # Still referenced by the current scene
+
+class TestAtlas(unittest.TestCase):
+    def test_build_atlas_regions_match_sources(self):
+        """Packed regions do not overlap and hold the source pixels; sprite paths resolve to regions."""
+        import pygame
+        from shared.atlas import build_atlas, find_region
+
+        root = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(root, "assets", "sprites"))
+            colors = {}
+            for i, (w, h) in enumerate([(40, 30), (64, 64), (10, 50), (70, 20), (33, 33)]):
+                surf = pygame.Surface((w, h), pygame.SRCALPHA)
+                colors[f"assets/sprites/s{i}.png"] = (i * 40, 255 - i * 40, 7, 255)
+                surf.fill(colors[f"assets/sprites/s{i}.png"])
+                pygame.image.save(surf, os.path.join(root, "assets", "sprites", f"s{i}.png"))
+
+            index = build_atlas(root, page_size=80, padding=1)
+            self.assertEqual(set(index["regions"]), set(colors))
+            self.assertGreater(len(index["pages"]), 1) # 80px pages cannot hold everything
+
+            pages = [pygame.image.load(os.path.join(root, p)) for p in index["pages"]]
+            rects = {}
+            for key, color in colors.items():
+                page_path, (x, y, w, h) = find_region(index, key.replace("/", "\\"))
+                page = pages[index["pages"].index(page_path)]
+                self.assertEqual(tuple(page.get_at((x + w // 2, y + h // 2))), color)
+                rects.setdefault(page_path, []).append(pygame.Rect(x, y, w, h))
+            for page_rects in rects.values():
+                for i, r in enumerate(page_rects):
+                    self.assertEqual(r.collidelist(page_rects[i + 1:]), -1)
+        finally:
+            shutil.rmtree(root)
+
+class TestAudioMixer(unittest.TestCase):
+    def setUp(self):
+        import wave
+        import pygame
+        from runtime.audio import AudioMixer
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy") # Channels still play (and report busy) without a device
+        pygame.mixer.init()
+        self.root = tempfile.mkdtemp()
+        for name in ("a", "b", "c", "d"):
+            with wave.open(os.path.join(self.root, f"{name}.wav"), "wb") as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(22050)
+                f.writeframes(b"\0\0" * 22050 * 5) # Long enough to stay busy during the test
+        self.assets = AssetManager(self.root, workers=1)
+        self.mixer = AudioMixer(self.assets, channels=3, cache_size=8, max_voices_per_sound=2, min_interval=0)
+
+    def tearDown(self):
+        import pygame
+        self.mixer.stop_all()
+        self.assets.shutdown()
+        pygame.mixer.quit()
+        shutil.rmtree(self.root)
+
+    def _channel(self, path, **kwargs):
+        channel = self.mixer.play(path, **kwargs)
+        return None if channel is None else self.mixer.channels.index(channel)
+
+    def test_voice_limit_and_priority_stealing(self):
+        """A sound restarts its own oldest voice at its limit; a full pool gives up its oldest unimportant voice."""
+        self.assertEqual(self._channel("a.wav"), 0)
+        self.assertEqual(self._channel("a.wav"), 1)
+        self.assertEqual(self._channel("a.wav"), 0) # Third "a": its oldest voice is restarted
+        self.assertEqual(self._channel("b.wav", priority=5), 2)
+
+        # Pool full: "b" (priority 5) is never taken by priority 0 sounds, the oldest "a" voice is
+        self.assertIsNone(self._channel("c.wav", priority=-1))
+        self.assertEqual(self._channel("c.wav"), 1)
+        self.assertEqual(self._channel("d.wav"), 0)
+        self.assertEqual(self._channel("d.wav", priority=9), 1) # Oldest of the priority 0 voices ("c")
+        self.assertEqual([v[0] for _, v in sorted(self.mixer._voices.items())],
+                         [self.assets.resolve(p) for p in ("d.wav", "d.wav", "b.wav")])
+
+    def test_replay_within_min_interval_is_skipped(self):
+        self.mixer.min_interval = 60.0
+        self.assertEqual(self._channel("a.wav"), 0)
+        self.assertIsNone(self._channel("a.wav"))
+        self.assertEqual(self._channel("b.wav"), 1) # Other sounds are not affected
+
+    def test_lru_eviction_stops_and_unloads(self):
+        """Sounds beyond cache_size are dropped, least recently used first, once no scene references them."""
+        self.mixer.cache_size = 2
+        self.assertEqual(self._channel("a.wav"), 0)
+        self._channel("b.wav")
+        self.mixer.get_sound("a.wav") # "b" is now the least recently used
+        self.assets.release_scene(self.assets.begin_scene()) # The scene that used them is gone
+
+        self._channel("c.wav")
+        self.assertEqual(list(self.mixer._cache), [self.assets.resolve("a.wav"), self.assets.resolve("c.wav")])
+        self.assertNotIn(self.assets.resolve("b.wav"), self.assets.sounds)
+        self.assertIn(self.assets.resolve("a.wav"), self.assets.sounds)
+        self.assertEqual([v[0] for v in self.mixer._voices.values()],
+                         [self.assets.resolve("a.wav"), self.assets.resolve("c.wav")]) # "b" was stopped
+
+if __name__ == "__main__":
+    unittest.main()
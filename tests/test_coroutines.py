@@ -0,0 +1,89 @@
+
+import unittest
+import sys
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from runtime.coroutines import CoroutineScheduler, wait, wait_until, next_fixed_step
+
+class TestCoroutines(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = CoroutineScheduler()
+        self.log = []
+
+    def test_wait_seconds(self):
+        """Coroutine sleeps for game time and resumes once its wake time is reached."""
+        def routine():
+            self.log.append("start")
+            yield wait(0.5)
+            self.log.append("woke")
+
+        self.scheduler.start(routine())
+        self.assertEqual(self.log, ["start"]) # Runs up to first yield immediately
+
+        for _ in range(4):
+            self.scheduler.tick(0.1)
+        self.assertEqual(self.log, ["start"])
+
+        self.scheduler.tick(0.1)
+        self.assertEqual(self.log, ["start", "woke"])
+        self.assertEqual(self.scheduler.pending_count(), 0)
+
+    def test_next_fixed_step_and_wait_until(self):
+        """next_fixed_step resumes every tick; wait_until resumes when the condition holds."""
+        flag = {"ready": False}
+
+        def routine():
+            yield next_fixed_step
+            self.log.append(1)
+            yield
+            self.log.append(2)
+            yield wait_until(lambda: flag["ready"])
+            self.log.append(3)
+
+        self.scheduler.start(routine())
+        self.scheduler.tick(0.01)
+        self.scheduler.tick(0.01)
+        self.assertEqual(self.log, [1, 2])
+
+        self.scheduler.tick(0.01)
+        self.assertEqual(self.log, [1, 2])
+
+        flag["ready"] = True
+        self.scheduler.tick(0.01)
+        self.assertEqual(self.log, [1, 2, 3])
+
+    def test_stop_all_by_owner(self):
+        """Stopping an owner's coroutines prevents them from resuming."""
+        owner = object()
+
+        def routine():
+            yield wait(0.1)
+            self.log.append("should not run")
+
+        co = self.scheduler.start(routine(), owner=owner)
+        self.scheduler.stop_all(owner)
+        self.scheduler.tick(1.0)
+        self.assertTrue(co.done)
+        self.assertEqual(self.log, [])
+
+    def test_crashing_coroutine_is_dropped(self):
+        """An exception inside a coroutine stops it without affecting others."""
+        def bad():
+            yield next_fixed_step
+            raise RuntimeError("boom")
+
+        def good():
+            yield next_fixed_step
+            self.log.append("good")
+
+        bad_co = self.scheduler.start(bad())
+        self.scheduler.start(good())
+        self.scheduler.tick(0.01)
+        self.assertTrue(bad_co.done)
+        self.assertEqual(self.log, ["good"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -107,5 +107,175 @@ class TestSerialization(unittest.TestCase):
         if os.path.exists(test_path):
             os.remove(test_path)
 
+class TestBinaryScene(unittest.TestCase):
+    def test_binary_round_trip_is_lossless(self):
+        """JSON -> binary -> JSON keeps values, types and key order, and load_scene detects the format."""
+        from shared import scene_binary
+        with open(os.path.join(PROJECT_ROOT, "scenes", "stress_1_tower.scene.json"), "r") as f:
+            scene_json = json.load(f)
+        # Edge cases the real scenes may not contain
+        scene_json["objects"].append({
+            "id": "edge", "name": "Ünïcode ✓", "active": False, "parent": None,
+            "components": {"Custom": {"big": 2 ** 70, "neg": -5, "pair": [1.5, -0.0],
+                                      "ints": [1, 2], "rgba": [0, 128, 255, 255], "flags": [True, False, None],
+                                      "nested": [[]], "empty": {}}}
+        })
+
+        raw = scene_binary.dumps(scene_json)
+        decoded = scene_binary.loads(raw)
+        self.assertEqual(json.dumps(decoded), json.dumps(scene_json))
+        self.assertLess(len(raw), len(json.dumps(scene_json, indent=2)) // 2)
+
+        test_path = "tests/temp_test_scene.scene.bin"
+        try:
+            save_scene(scene_json, test_path)
+            with open(test_path, "rb") as f:
+                self.assertEqual(f.read(4), scene_binary.MAGIC)
+            self.assertEqual(json.dumps(load_scene(test_path)), json.dumps(scene_json))
+        finally:
+            if os.path.exists(test_path):
+                os.remove(test_path)
+
+    def test_stream_matches_full_load(self):
+        """SceneStream yields the same objects and header as load_scene, for JSON and binary files."""
+        from shared import scene_binary
+        from shared.scene_stream import SceneStream
+        source = os.path.join(PROJECT_ROOT, "scenes", "pong.scene.json")
+        expected = load_scene(source)
+        header = {k: v for k, v in expected.items() if k != "objects"}
+
+        bin_path = "tests/temp_stream.scene.bin"
+        with open(bin_path, "wb") as f:
+            f.write(scene_binary.dumps(expected))
+        try:
+            # Tiny chunks force values to span many reads
+            for path in (source, bin_path):
+                stream = SceneStream(path, chunk_size=7)
+                objects = list(stream.objects())
+                self.assertEqual(objects, expected["objects"])
+                self.assertEqual(stream.header, header)
+                self.assertEqual(stream.progress(), 1.0)
+        finally:
+            os.remove(bin_path)
+
+class TestIncrementalSave(unittest.TestCase):
+    def test_incremental_save_and_journal_recovery(self):
+        """Cached fragments give the same file as a full json.dump; the journal replays unsaved edits."""
+        from dataclasses import asdict
+        import copy
+        import tempfile
+        import shutil
+        from editor.scene_writer import SceneWriter
+
+        data = load_scene(os.path.join(PROJECT_ROOT, "scenes", "pong.scene.json"))
+        scene = Scene(metadata=data["metadata"], objects=data["objects"],
+                      prefabs=data.get("prefabs", {}), settings=data.get("settings", {}))
+        writer = SceneWriter()
+        writer.reset(scene)
+        self.assertEqual(writer.serialize(scene), json.dumps(asdict(scene), indent=2))
+
+        root = tempfile.mkdtemp()
+        path = os.path.join(root, "test.scene.json")
+        try:
+            self.assertEqual(writer.save(scene, path).result(), "")
+            self.assertEqual(load_scene(path), asdict(scene))
+            self.assertFalse(os.path.exists(path + ".tmp"))
+            saved = load_scene(path)
+
+            # Edits after the save: a tracked change, a delete, an untracked add and a settings change
+            scene.objects[0]["name"] = "Renamed"
+            writer.mark_dirty(scene.objects[0]["id"])
+            removed = scene.objects.pop(1)
+            added = copy.deepcopy(scene.objects[-1])
+            added["id"] = "added"
+            scene.objects.insert(0, added)
+            scene.settings["background_color"] = [1, 2, 3, 255]
+
+            self.assertGreater(writer.append_journal(scene, path), 0)
+            writer.flush()
+            self.assertEqual(writer.append_journal(scene, path), 0) # Nothing new
+            recovered = SceneWriter.replay_journal(path, saved)
+            self.assertEqual(recovered, asdict(scene))
+            self.assertNotIn(removed["id"], [o["id"] for o in recovered["objects"]])
+
+            self.assertEqual(writer.serialize(scene), json.dumps(asdict(scene), indent=2))
+            writer.save(scene, path).result()
+            self.assertFalse(SceneWriter.has_journal(path)) # A save truncates the journal
+
+            # A save that fails leaves its edits to the journal
+            scene.objects[0]["name"] = "Renamed again"
+            writer.mark_dirty(scene.objects[0]["id"])
+            os.mkdir(path + ".tmp") # write_atomic cannot open its temporary file
+            self.assertNotEqual(writer.save(scene, path).result(), "")
+            os.rmdir(path + ".tmp")
+            self.assertGreater(writer.append_journal(scene, path), 0)
+            writer.flush()
+            self.assertEqual(SceneWriter.replay_journal(path, load_scene(path)), asdict(scene))
+        finally:
+            writer.shutdown()
+            shutil.rmtree(root)
+
+    def test_late_save_does_not_mark_next_scene_saved(self):
+        """A save that finishes after another scene was opened leaves that scene's modified state alone."""
+        import tempfile
+        import shutil
+        import threading
+        from PySide6.QtCore import QCoreApplication
+        from editor.editor_state import EditorState
+
+        app = QCoreApplication.instance() or QCoreApplication([])
+        state = EditorState()
+        root = tempfile.mkdtemp()
+        path = os.path.join(root, "a.scene.json")
+        done = []
+        try:
+            state.load_scene(Scene.create_empty("A"))
+            for _ in range(3):
+                state.mark_dirty()
+            gate = threading.Event()
+            state.scene_writer._executor.submit(gate.wait) # Holds the write until B is open
+            future = state.save(path, lambda p, e: done.append((p, e)))
+            state.load_scene(Scene.create_empty("B"))
+            gate.set()
+            future.result()
+            app.processEvents() # The save's bookkeeping runs here, on this thread
+            self.assertEqual(done, [(path, "")])
+            self.assertFalse(state.is_modified())
+            for _ in range(3):
+                state.mark_dirty()
+            self.assertTrue(state.is_modified())
+
+            state.save(path).result()
+            app.processEvents()
+            self.assertFalse(state.is_modified())
+        finally:
+            state.scene_writer.shutdown()
+            shutil.rmtree(root)
+
+class TestSceneChunks(unittest.TestCase):
+    def test_split_keeps_hierarchies_and_pins_cameras(self):
+        """Objects go to their root's cell; cameras and stream=false hierarchies stay in the base scene."""
+        from shared.scene_chunks import split_scene
+
+        def obj(obj_id, x, y, parent=None, **components):
+            components["Transform"] = {"position": [x, y], "rotation": 0, "scale": [1, 1]}
+            return {"id": obj_id, "name": obj_id, "parent": parent, "components": components}
+
+        scene = {"metadata": {"name": "World"}, "settings": {"preload": []}, "objects": [
+            obj("cam", 5000, 5000, Camera={"is_main": True}),
+            obj("rock", 150, 50),
+            obj("rock_child", 9000, 9000, parent="rock"), # Local offset: follows its root
+            obj("far", -10, 2500),
+            obj("player", 700, 700),
+            obj("player_gun", 0, 0, parent="player"),
+        ]}
+        scene["objects"][4]["stream"] = False
+
+        base, chunks = split_scene(scene, 100)
+        self.assertEqual([o["id"] for o in base["objects"]], ["cam", "player", "player_gun"])
+        self.assertEqual(base["metadata"], scene["metadata"])
+        self.assertEqual({k: [o["id"] for o in v] for k, v in chunks.items()},
+                         {(1, 0): ["rock", "rock_child"], (-1, 25): ["far"]})
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,65 @@
+
+import unittest
+import sys
+import os
+import random
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from shared.scene_schema import Scene
+from editor.scene_index import SceneIndex, parent_of
+from editor.undo_redo import UndoStack, CreateObjectCommand, DeleteObjectCommand, DeleteObjectsCommand, ReparentCommand, CompoundCommand
+
+def make_obj(obj_id, parent=None):
+    return {"id": obj_id, "name": obj_id, "active": True,
+            "components": {"Transform": {"position": [0.0, 0.0], "rotation": 0.0, "scale": [1.0, 1.0], "parent_id": parent}}}
+
+class TestSceneIndex(unittest.TestCase):
+    def assertMatchesScene(self, index, scene):
+        self.assertEqual(index.objects, {obj["id"]: obj for obj in scene.objects})
+        for obj in scene.objects:
+            self.assertIs(index.get(obj["id"]), obj)
+        for parent_id in [None] + [obj["id"] for obj in scene.objects]:
+            expected = [obj["id"] for obj in scene.objects if parent_of(obj) == parent_id]
+            self.assertEqual(sorted(o["id"] for o in index.get_children(parent_id)), sorted(expected))
+
+    def test_commands_keep_index_consistent(self):
+        """Create, delete and reparent (alone or grouped), with undo and redo, leave the index matching a full scan."""
+        rng = random.Random(3)
+        scene = Scene(objects=[make_obj(f"o{i}") for i in range(20)])
+        index = SceneIndex()
+        index.rebuild(scene)
+        stack = UndoStack()
+        stack.listeners.append(lambda command: command.update_index(index))
+
+        next_id = 20
+        for _ in range(300):
+            ids = [obj["id"] for obj in scene.objects]
+            op = rng.random()
+            if op < 0.25 or not ids:
+                cmd = CreateObjectCommand(scene, make_obj(f"o{next_id}", rng.choice(ids) if ids else None))
+                next_id += 1
+            elif op < 0.35:
+                cmd = DeleteObjectCommand(scene, rng.choice(ids))
+            elif op < 0.4:
+                cmd = DeleteObjectsCommand(scene, rng.sample(ids, min(4, len(ids))), index.children)
+            elif op < 0.6:
+                cmd = ReparentCommand(scene, index.get(rng.choice(ids)), rng.choice(ids + [None]))
+            elif op < 0.7:
+                cmd = CompoundCommand([ReparentCommand(scene, index.get(obj_id), rng.choice(ids + [None]))
+                                       for obj_id in rng.sample(ids, min(3, len(ids)))])
+            elif op < 0.85:
+                stack.undo()
+                self.assertMatchesScene(index, scene)
+                continue
+            else:
+                stack.redo()
+                self.assertMatchesScene(index, scene)
+                continue
+            cmd.redo()
+            stack.push(cmd)
+            self.assertMatchesScene(index, scene)
+
+if __name__ == "__main__":
+    unittest.main()
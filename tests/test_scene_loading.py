@@ -0,0 +1,152 @@
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+# Headless: no window or sound device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from runtime.game_loop import GameRuntime
+
+class TestSceneLoads(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.sprite = os.path.join(self.root, "sprite.png")
+        pygame.image.save(pygame.Surface((4, 4)), self.sprite)
+        self.main = self._scene("main.scene.json", ["player", "wall"])
+        self.runtime = GameRuntime(self.main, 64, 64)
+        self.runtime.continue_level_load(None)
+
+    def tearDown(self):
+        self.runtime.assets.shutdown()
+        pygame.quit()
+        shutil.rmtree(self.root)
+
+    def _scene(self, name, ids, extra=None):
+        objects = [{"id": obj_id, "name": obj_id, "active": True, "parent": None,
+                    "components": {"Transform": {"position": [0, 0], "rotation": 0, "scale": [1, 1]},
+                                   "SpriteRenderer": {"sprite_path": self.sprite}}}
+                   for obj_id in ids]
+        path = os.path.join(self.root, name)
+        with open(path, "w") as f:
+            json.dump({"metadata": {"name": name}, "settings": {}, "objects": objects + (extra or [])}, f)
+        return path
+
+    def _ids(self):
+        return [obj.id for obj in self.runtime.objects]
+
+    def test_switch_keeps_persistent_objects(self):
+        level = self._scene("level.scene.json", ["enemy"])
+        self.runtime.make_persistent(self.runtime.objects[0])
+        self.runtime.next_scene_path = level
+        self.runtime.process_lifecycle_events()
+        self.runtime.assets.wait_all()
+        self.runtime.update_scene_loads(None)
+
+        self.assertEqual(self._ids(), ["player", "enemy"])
+        self.assertEqual(self.runtime.scene_path, level)
+        self.assertEqual(self.runtime.scene_loads, {})
+
+    def test_additive_load_and_unload(self):
+        extra = self._scene("extra.scene.json", ["player", "crate"]) # "player" clashes with a live id
+        self.runtime.load_scene_additive(extra)
+        self.runtime.update_scene_loads(None)
+        self.assertEqual(len(self.runtime.objects), 4)
+        self.assertEqual(len(set(self._ids())), 4)
+        self.assertIn(extra, self.runtime.additive_scenes)
+
+        self.runtime.unload_scene(extra)
+        self.assertEqual(self._ids(), ["player", "wall"])
+        self.assertEqual(self.runtime.additive_scenes, {})
+        self.assertEqual(self.runtime.scene_path, self.main)
+
+    def test_failed_switch_keeps_current_scene(self):
+        """A scene that breaks halfway is dropped with its assets; the running scene is untouched."""
+        other = os.path.join(self.root, "other.png")
+        pygame.image.save(pygame.Surface((4, 4)), other)
+        broken = self._scene("broken.scene.json", [], [
+            {"id": "ok", "name": "ok", "components": {"SpriteRenderer": {"sprite_path": other}}},
+            {"id": "nameless", "components": {}}, # KeyError while building
+        ])
+        self.runtime.next_scene_path = broken
+        self.runtime.process_lifecycle_events()
+        self.runtime.assets.wait_all()
+        self.runtime.update_scene_loads(None)
+
+        self.assertEqual(self._ids(), ["player", "wall"])
+        self.assertEqual(self.runtime.scene_path, self.main)
+        self.assertEqual(self.runtime.scene_loads, {})
+        self.assertTrue(self.runtime.assets.unload(other)) # No scene references it any more
+        self.assertFalse(self.runtime.assets.unload(self.sprite))
+
+class TestChunkStreaming(unittest.TestCase):
+    def setUp(self):
+        from shared.scene_chunks import write_world
+        self.root = tempfile.mkdtemp()
+
+        def obj(obj_id, x, **components):
+            components["Transform"] = {"position": [x, 50], "rotation": 0, "scale": [1, 1]}
+            return {"id": obj_id, "name": obj_id, "active": True, "parent": None, "components": components}
+
+        # One rock per cell (chunk_size 100), each with its own sprite and a static collider
+        self.sprites = {}
+        objects = [obj("cam", 50, Camera={"is_main": True})]
+        for cell in (0, 1, 6, 7):
+            self.sprites[cell] = os.path.join(self.root, f"rock{cell}.png")
+            pygame.image.save(pygame.Surface((4, 4)), self.sprites[cell])
+            objects.append(obj(f"rock{cell}", cell * 100 + 50, SpriteRenderer={"sprite_path": self.sprites[cell]},
+                               BoxCollider={"size": [10, 10], "offset": [0, 0], "is_trigger": False}))
+        source = os.path.join(self.root, "field.scene.json")
+        with open(source, "w") as f:
+            json.dump({"metadata": {"name": "Field"}, "settings": {}, "objects": objects}, f)
+        manifest = write_world(source, os.path.join(self.root, "world"), chunk_size=100)
+        os.remove(os.path.join(self.root, "world", "chunk_7_0.scene.json")) # Unreadable chunk
+
+        self.runtime = GameRuntime(manifest, 64, 64)
+        self.runtime.continue_level_load(None)
+
+    def tearDown(self):
+        self.runtime.assets.shutdown()
+        pygame.quit()
+        shutil.rmtree(self.root)
+
+    def _frames(self, count):
+        for _ in range(count):
+            self.runtime.step(self.runtime.FIXED_DT)
+
+    def test_chunks_follow_the_camera(self):
+        """Chunks near the camera are loaded; far ones lose their objects, bodies and asset references."""
+        world = self.runtime.world
+        self._frames(1)
+        self.assertEqual(sorted(o.id for o in self.runtime.objects), ["cam", "rock0", "rock1"])
+        self.assertEqual(sorted(self.runtime.physics.bodies), ["rock0", "rock1"])
+        self.assertEqual(sorted(world.loaded), [(0, 0), (1, 0)])
+
+        # keep_radius 2: cells 0 and 1 are dropped, cell 6 is loaded; cell 7 cannot be read
+        self.runtime.main_camera().position = [650, 50]
+        self._frames(3)
+        self.assertEqual(sorted(o.id for o in self.runtime.objects), ["cam", "rock6"])
+        self.assertEqual(sorted(self.runtime.physics.bodies), ["rock6"])
+        self.assertEqual(len(self.runtime.physics.space.bodies), 1)
+        self.assertEqual(sorted(world.loaded), [(6, 0)])
+        self.assertIn((7, 0), world.failed)
+        self.assertTrue(self.runtime.assets.unload(self.sprites[0]))
+        self.assertTrue(self.runtime.assets.unload(self.sprites[1]))
+        self.assertFalse(self.runtime.assets.unload(self.sprites[6]))
+
+        # Back home: the dropped chunks stream in again
+        self.runtime.main_camera().position = [50, 50]
+        self._frames(3)
+        self.assertEqual(sorted(o.id for o in self.runtime.objects), ["cam", "rock0", "rock1"])
+        self.assertEqual(sorted(self.runtime.physics.bodies), ["rock0", "rock1"])
+
+if __name__ == "__main__":
+    unittest.main()
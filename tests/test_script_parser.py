@@ -0,0 +1,115 @@
+
+import unittest
+import sys
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from editor.script_parser import ScriptParser
+
+SOURCE = '''
+class CameraFollow(Script):
+    target_name = "Player"
+    smooth_speed: float = 5
+    lives: int = 3
+    enabled: bool
+    _cache = None
+
+    def start(self):
+        self.offset_x = -2.5
+        self.smooth_speed = 8.0
+        self.target = self.find_object(self.target_name)
+'''
+
+class TestScriptParser(unittest.TestCase):
+    def test_class_attributes_hints_and_start_overrides(self):
+        """Class-level attributes and annotations are properties; start() assignments override them in place."""
+        meta = ScriptParser.parse_source(SOURCE)
+        self.assertEqual(meta.properties, {"target_name": "Player", "smooth_speed": 8.0, "lives": 3,
+                                           "enabled": False, "offset_x": -2.5})
+        self.assertEqual(meta.hints, {"smooth_speed": "float", "lives": "int", "enabled": "bool"})
+        self.assertEqual([(name, kind) for name, kind, _ in meta.fields()],
+                         [("target_name", "str"), ("smooth_speed", "float"), ("lives", "int"),
+                          ("enabled", "bool"), ("offset_x", "float")])
+
+    def test_bundled_camera_follow_script(self):
+        meta = ScriptParser.parse_metadata(os.path.join(PROJECT_ROOT, "scripts", "camera_follow.py"))
+        self.assertEqual(meta.properties.get("target_name"), "Player")
+        self.assertEqual(meta.kind("smooth_speed"), "float")
+
+class TestScriptMetadataService(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        from PySide6.QtCore import QCoreApplication
+        from editor.script_metadata import ScriptMetadataService
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "mover.py")
+        self.service = ScriptMetadataService()
+        self.changed = []
+        self.service.metadata_changed.connect(self.changed.append)
+
+    def tearDown(self):
+        import shutil
+        self.service.flush()
+        shutil.rmtree(self.root)
+
+    def _write(self, speed, mtime_ns):
+        with open(self.path, "w") as f:
+            f.write(f"class Mover(Script):\n    speed = {speed}\n")
+        os.utime(self.path, ns=(mtime_ns, mtime_ns)) # Distinct fingerprints on coarse clocks too
+
+    def _settle(self):
+        self.service.flush()
+        self.app.processEvents()
+
+    def test_cached_until_the_file_changes(self):
+        """get() parses in the background once; rewrites are re-parsed and reported only if the metadata differs."""
+        import time
+        self._write(1, 10 ** 18)
+        self.assertIsNone(self.service.get(self.path))
+        self._settle()
+        self.assertEqual(self.changed, [self.path])
+        meta = self.service.get(self.path)
+        self.assertEqual(meta.properties, {"speed": 1})
+
+        # Cached: no new parse, no signal
+        self.assertIs(self.service.get(self.path), meta)
+        self._settle()
+        self.assertEqual(self.changed, [self.path])
+
+        # Touched with the same content: parsed again, nothing to report
+        self._write(1, 10 ** 18 + 10 ** 9)
+        self.service._on_file_changed(self.path)
+        self._settle()
+        self.assertEqual(self.changed, [self.path])
+
+        # Edited on disk: the watcher queues it without anyone calling get()
+        self._write(2, 10 ** 18 + 2 * 10 ** 9)
+        deadline = time.monotonic() + 5
+        while len(self.changed) < 2 and time.monotonic() < deadline:
+            self._settle()
+            time.sleep(0.01)
+        self.assertEqual(self.changed, [self.path, self.path])
+        self.assertEqual(self.service.get(self.path).properties, {"speed": 2})
+
+    def test_superseded_result_is_dropped(self):
+        """A parse finishing after a newer request for the same file does not overwrite its result."""
+        from editor.script_metadata import _fingerprint
+        from editor.script_parser import ScriptMetadata
+        self._write(1, 10 ** 18)
+        self.service.get(self.path)
+        self._write(22, 10 ** 18 + 10 ** 9)
+        self.service._on_file_changed(self.path)
+        self._settle()
+        self.assertEqual(self.service.get(self.path).properties, {"speed": 22})
+
+        # A late result for an older fingerprint is ignored
+        self.service._on_parsed(self.path, (1, 1), ScriptMetadata({"speed": 1}))
+        self.assertEqual(self.service.get(self.path).properties, {"speed": 22})
+        self.assertEqual(self.service._cache[self.path][0], _fingerprint(self.path))
+        self.assertEqual(self.changed, [self.path])
+
+if __name__ == "__main__":
+    unittest.main()
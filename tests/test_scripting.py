@@ -60,5 +60,210 @@ class TestScripting(unittest.TestCase):
         except Exception as e:
             self.fail(f"Raised wrong exception: {e}")
 
+    def _load_script_module(self, script_name, source):
+        # Mirrors GameRuntime.load_script
+        import importlib.util
+        path = os.path.join(self.script_dir, f"{script_name}.py")
+        with open(path, "w") as f:
+            f.write(source)
+        spec = importlib.util.spec_from_file_location(script_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[script_name] = module
+        spec.loader.exec_module(module)
+        return module, path
+
+    def _touch_newer(self, path):
+        # Guarantee a visible mtime change even on coarse filesystem clocks
+        st = os.stat(path)
+        os.utime(path, (st.st_atime, st.st_mtime + 2))
+
+    def test_hot_reload_keeps_state(self):
+        """Edited script swaps class on live instances and keeps their __dict__."""
+        from runtime.hot_reload import ScriptReloader
+        script_name = "HotScript"
+        module, path = self._load_script_module(script_name,
+            "from runtime.api import Script\n"
+            "class HotScript(Script):\n"
+            "    def value(self):\n"
+            "        return 1\n")
+        
+        obj = GameObject("test", "Test", [0,0], 0, [1,1])
+        instance = module.HotScript()
+        instance.game_object = obj
+        instance.counter = 42
+        
+        reloader = ScriptReloader()
+        reloader.track(script_name, path)
+        
+        with open(path, "w") as f:
+            f.write("from runtime.api import Script\n"
+                    "class HotScript(Script):\n"
+                    "    def value(self):\n"
+                    "        return 2\n")
+        self._touch_newer(path)
+        
+        self.assertEqual(reloader.check([instance]), [script_name])
+        self.assertEqual(instance.value(), 2)
+        self.assertEqual(instance.counter, 42)
+        self.assertIs(instance.game_object, obj)
+        sys.modules.pop(script_name, None)
+
+    def test_hot_reload_rollback(self):
+        """A broken edit leaves the previous module and class in place."""
+        from runtime.hot_reload import ScriptReloader
+        script_name = "RollbackScript"
+        module, path = self._load_script_module(script_name,
+            "from runtime.api import Script\n"
+            "class RollbackScript(Script):\n"
+            "    def value(self):\n"
+            "        return 1\n")
+        
+        instance = module.RollbackScript()
+        instance.game_object = GameObject("test", "Test", [0,0], 0, [1,1])
+        
+        reloader = ScriptReloader()
+        reloader.track(script_name, path)
+        
+        with open(path, "w") as f:
+            f.write("class RollbackScript(Script)\n    pass")
+        self._touch_newer(path)
+        
+        self.assertEqual(reloader.check([instance]), [])
+        self.assertIs(sys.modules[script_name], module)
+        self.assertEqual(instance.value(), 1)
+        sys.modules.pop(script_name, None)
+
+        # No previous module and no Script class: nothing is left behind in sys.modules
+        with open(path, "w") as f:
+            f.write("VALUE = 1\n")
+        self.assertFalse(reloader.reload(script_name, path, [instance]))
+        self.assertNotIn(script_name, sys.modules)
+
+class TestScriptProfiler(unittest.TestCase):
+    def test_budget_disable_after_strikes(self):
+        """Over-budget script is flagged for disabling only after N consecutive strikes."""
+        from runtime.profiler import ScriptProfiler
+        profiler = ScriptProfiler(budget_ms=1.0, action="disable", strikes=3)
+        script = Script()
+        script.game_object = GameObject("test", "Slow", [0,0], 0, [1,1])
+        
+        self.assertFalse(profiler.record(script, "update", 0.005))
+        self.assertFalse(profiler.record(script, "update", 0.005))
+        self.assertFalse(profiler.record(script, "update", 0.0001)) # Streak broken
+        self.assertFalse(profiler.record(script, "update", 0.005))
+        self.assertFalse(profiler.record(script, "update", 0.005))
+        self.assertTrue(profiler.record(script, "update", 0.005))
+        
+        stats = profiler.class_totals()["Script"]
+        self.assertEqual(stats.calls, 6)
+        self.assertEqual(stats.over_budget, 5)
+        self.assertAlmostEqual(stats.max, 0.005)
+        self.assertIn("Script on 'Slow'", profiler.report())
+
+class TestBatchSystems(unittest.TestCase):
+    def test_gather_update_scatter(self):
+        """One system instance processes all members through arrays and writes results back."""
+        from runtime.systems import BatchSystem, SystemRegistry
+
+        class Mover(BatchSystem):
+            requires = ("RigidBody",)
+            writes = ("positions",)
+            def fixed_update(self, dt, batch):
+                batch.positions += batch.velocities * dt
+
+        registry = SystemRegistry()
+        objs = []
+        for i in range(3):
+            go = GameObject(f"id{i}", f"Obj{i}", [i, 0], 0, [1, 1])
+            go.components["RigidBody"] = {"velocity": [10.0, 0.0]}
+            objs.append(go)
+            registry.add(Mover, ("mod", "Mover"), go)
+
+        # Missing required component -> not a member
+        registry.add(Mover, ("mod", "Mover"), GameObject("bare", "Bare", [0, 0], 0, [1, 1]))
+        self.assertEqual(len(registry.instances()), 1)
+
+        pos_ref = objs[0].position
+        for system, batch in registry.for_phase("fixed_update"):
+            batch.gather()
+            system.fixed_update(0.5, batch)
+            batch.scatter(system.writes)
+        self.assertEqual([o.position for o in objs], [[5.0, 0], [6.0, 0], [7.0, 0]])
+        self.assertIs(objs[0].position, pos_ref) # Written in place
+
+        registry.remove_objects({"id1"})
+        batches = list(registry.for_phase("fixed_update"))
+        self.assertEqual(len(batches[0][1]), 2)
+        self.assertEqual(list(registry.for_phase("update")), []) # Phase not overridden
+
+class TestFrameLoop(unittest.TestCase):
+    def setUp(self):
+        import json
+        import tempfile
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        from runtime.game_loop import GameRuntime
+        self.root = tempfile.mkdtemp()
+        path = os.path.join(self.root, "empty.scene.json")
+        with open(path, "w") as f:
+            json.dump({"metadata": {"name": "Empty"}, "settings": {}, "objects": []}, f)
+        self.runtime = GameRuntime(path, 64, 64)
+        self.runtime.continue_level_load(None)
+        self.dt = self.runtime.FIXED_DT
+
+    def tearDown(self):
+        import pygame
+        self.runtime.assets.shutdown()
+        pygame.quit()
+        shutil.rmtree(self.root)
+
+    def _attach(self, script_cls):
+        script = script_cls()
+        script.game_object = GameObject("id", "Recorder", [0, 0], 0, [1, 1])
+        script.calls = []
+        self.runtime.active_scripts.append(script)
+        return script
+
+    def test_phase_order_and_fixed_steps(self):
+        """Each frame runs the fixed steps the accumulated time allows, then update, then late_update."""
+        class Recorder(Script):
+            def fixed_update(self, dt):
+                self.calls.append(("fixed", dt))
+            def update(self, dt):
+                self.calls.append(("update", dt))
+            def late_update(self, dt):
+                self.calls.append(("late", dt))
+
+        script = self._attach(Recorder)
+        self.runtime.step(2.5 * self.dt)
+        self.assertEqual(script.calls, [("fixed", self.dt), ("fixed", self.dt),
+                                        ("update", 2.5 * self.dt), ("late", 2.5 * self.dt)])
+
+        # The leftover half step carries over: none at 0.8, one at 1.1
+        script.calls = []
+        self.runtime.step(0.3 * self.dt)
+        self.assertEqual([name for name, _ in script.calls], ["update", "late"])
+        script.calls = []
+        self.runtime.step(0.3 * self.dt)
+        self.assertEqual([name for name, _ in script.calls], ["fixed", "update", "late"])
+
+    def test_update_interval_skips_frames(self):
+        """A throttled update() gets the time accumulated since its last call; other phases are unaffected."""
+        class Throttled(Script):
+            update_interval = 0.1
+            def fixed_update(self, dt):
+                self.calls.append("fixed")
+            def update(self, dt):
+                self.calls.append(round(dt, 6))
+            def late_update(self, dt):
+                self.calls.append("late")
+
+        script = self._attach(Throttled)
+        for _ in range(6):
+            self.runtime.step(0.04)
+        self.assertEqual([c for c in script.calls if not isinstance(c, str)], [0.12, 0.12])
+        self.assertEqual(script.calls.count("late"), 6)
+        self.assertEqual(script.calls.count("fixed"), 28) # 0.24 s at 120 Hz
+
 if __name__ == "__main__":
     unittest.main()
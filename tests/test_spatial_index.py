@@ -0,0 +1,49 @@
+
+import unittest
+import sys
+import os
+import random
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from editor.spatial_index import QuadTree
+
+class TestQuadTree(unittest.TestCase):
+    def test_queries_match_linear_scan(self):
+        """Point and rect queries find the same keys as a brute-force scan, after moves and removals."""
+        rng = random.Random(7)
+        tree = QuadTree(size=64)
+        rects = {}
+        for i in range(2000):
+            x, y = rng.uniform(-5000, 5000), rng.uniform(-5000, 5000)
+            w, h = rng.uniform(0, 300), rng.uniform(0, 300)
+            rects[i] = (x, y, x + w, y + h)
+            tree.insert(i, rects[i])
+        for i in range(0, 2000, 3):
+            x, y = rng.uniform(-20000, 20000), rng.uniform(-20000, 20000)
+            rects[i] = (x, y, x + 50, y + 50)
+            tree.update(i, rects[i]) # Moves far outside the original root
+        for i in range(1, 2000, 7):
+            tree.remove(i)
+            del rects[i]
+        self.assertEqual(len(tree), len(rects))
+
+        for _ in range(200):
+            px, py = rng.uniform(-6000, 6000), rng.uniform(-6000, 6000)
+            expected = {k for k, r in rects.items() if r[0] <= px <= r[2] and r[1] <= py <= r[3]}
+            self.assertEqual(set(tree.query_point(px, py)), expected)
+
+            q = (px, py, px + rng.uniform(0, 2000), py + rng.uniform(0, 2000))
+            expected = {k for k, r in rects.items() if r[0] <= q[2] and q[0] <= r[2] and r[1] <= q[3] and q[1] <= r[3]}
+            self.assertEqual(set(tree.query_rect(q)), expected)
+
+    def test_non_finite_rects_are_kept_but_never_hit(self):
+        tree = QuadTree()
+        tree.insert("nan", (float("nan"), 0.0, float("nan"), 10.0))
+        tree.insert("ok", (0.0, 0.0, 10.0, 10.0))
+        self.assertIn("nan", tree)
+        self.assertEqual(tree.query_point(5, 5), ["ok"])
+
+if __name__ == "__main__":
+    unittest.main()
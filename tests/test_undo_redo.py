@@ -0,0 +1,136 @@
+
+import unittest
+import sys
+import os
+import json
+import random
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from shared.scene_schema import Scene
+from editor.undo_redo import (UndoStack, CreateObjectCommand, DeleteObjectCommand, DeleteObjectsCommand, ChangeComponentCommand,
+                              RenameObjectCommand, AddComponentCommand, RemoveComponentCommand,
+                              ReparentCommand, CompoundCommand, SetScriptPropertyCommand)
+
+def make_obj(obj_id, parent=None):
+    return {"id": obj_id, "name": obj_id, "active": True,
+            "components": {"Transform": {"position": [0.0, 0.0], "rotation": 0.0, "scale": [1.0, 1.0], "parent_id": parent}}}
+
+class TestUndoStack(unittest.TestCase):
+    def test_history_is_trimmed_to_byte_budget(self):
+        """The oldest steps are dropped once the history exceeds max_bytes; the rest still undo."""
+        scene = Scene(objects=[make_obj(f"o{i}") for i in range(50)])
+        stack = UndoStack(max_bytes=5000)
+        for obj in scene.objects:
+            cmd = ChangeComponentCommand(obj, "Transform", "position", [1.0, 2.0])
+            cmd.redo()
+            stack.push(cmd)
+        self.assertLessEqual(stack.history_bytes, 5000)
+        self.assertEqual(stack.history_bytes, sum(cmd.size() for cmd in stack._history))
+        kept = len(stack._history)
+        self.assertLess(kept, 50)
+
+        while stack.can_undo():
+            stack.undo()
+        moved = [obj["id"] for obj in scene.objects if obj["components"]["Transform"]["position"] != [0.0, 0.0]]
+        self.assertEqual(moved, [f"o{i}" for i in range(50 - kept)])
+
+    def test_bulk_delete_takes_subtrees_and_undoes_in_place(self):
+        """Deleting several objects removes their descendants (via Transform.parent_id); undo restores the exact order."""
+        rng = random.Random(7)
+        objs = []
+        for i in range(3000):
+            parent = rng.choice(objs)["id"] if objs and rng.random() < 0.7 else None
+            objs.append(make_obj(f"o{i}", parent))
+        rng.shuffle(objs)
+        scene = Scene(objects=objs)
+        original = list(scene.objects)
+
+        targets = [obj["id"] for obj in rng.sample(objs, 300)]
+        doomed = set(targets)
+        while True:
+            grown = doomed | {obj["id"] for obj in objs if obj["components"]["Transform"]["parent_id"] in doomed}
+            if grown == doomed:
+                break
+            doomed = grown
+
+        cmd = DeleteObjectsCommand(scene, targets)
+        for _ in range(2):
+            cmd.redo()
+            self.assertEqual([obj["id"] for obj in scene.objects], [obj["id"] for obj in original if obj["id"] not in doomed])
+            cmd.undo()
+            self.assertEqual(len(scene.objects), len(original))
+            self.assertTrue(all(a is b for a, b in zip(scene.objects, original)))
+
+    def test_saved_history_undoes_reopened_scene(self):
+        """dumps() then loads() on a copy of the scene (a save and reopen) undoes back to the original."""
+        rng = random.Random(5)
+        scene = Scene(objects=[make_obj(f"o{i}") for i in range(15)])
+        for obj in scene.objects[:5]:
+            obj["components"]["Script"] = {"script_path": "scripts/s.py"}
+        original = json.loads(json.dumps(scene.objects))
+        stack = UndoStack()
+        next_id = 15
+
+        # Older steps on a component that a newer step removes: loads() must not need it on the object
+        for make in (lambda obj: AddComponentCommand(obj, "Foo", {"x": 1}),
+                     lambda obj: ChangeComponentCommand(obj, "Foo", "x", 2),
+                     lambda obj: RemoveComponentCommand(obj, "Foo")):
+            cmd = make(scene.objects[0])
+            cmd.redo()
+            stack.push(cmd)
+        for _ in range(200):
+            objs = scene.objects
+            op = rng.random()
+            if op < 0.1 or not objs:
+                cmd = CreateObjectCommand(scene, make_obj(f"o{next_id}"), rng.randint(0, len(objs)))
+                next_id += 1
+            elif op < 0.2:
+                cmd = DeleteObjectCommand(scene, rng.choice(objs)["id"])
+            elif op < 0.3:
+                cmd = ChangeComponentCommand(rng.choice(objs), "Transform", "position", [rng.random(), rng.random()])
+            elif op < 0.4:
+                obj = rng.choice(objs)
+                if "RigidBody" in obj["components"]:
+                    cmd = ChangeComponentCommand(obj, "RigidBody", "mass", rng.random())
+                elif "Script" in obj["components"]:
+                    cmd = SetScriptPropertyCommand(obj, rng.choice(["speed", "name"]), rng.random())
+                else:
+                    continue
+            elif op < 0.5:
+                cmd = RenameObjectCommand(rng.choice(objs), f"n{rng.random()}")
+            elif op < 0.6:
+                obj = rng.choice(objs)
+                if "RigidBody" in obj["components"]:
+                    cmd = RemoveComponentCommand(obj, "RigidBody")
+                else:
+                    cmd = AddComponentCommand(obj, "RigidBody", {"mass": rng.random()})
+            elif op < 0.7:
+                cmd = CompoundCommand([ChangeComponentCommand(obj, "Transform", "rotation", rng.random())
+                                       for obj in rng.sample(objs, min(3, len(objs)))])
+            elif op < 0.8:
+                cmd = ReparentCommand(scene, rng.choice(objs), rng.choice(objs)["id"])
+            elif op < 0.9:
+                stack.undo()
+                continue
+            else:
+                stack.redo()
+                continue
+            cmd.redo()
+            stack.push(cmd)
+
+        reopened = Scene(objects=json.loads(json.dumps(scene.objects)))
+        restored = UndoStack()
+        self.assertEqual(restored.loads(stack.dumps(), reopened), len(stack._history))
+        while restored.can_undo():
+            restored.undo()
+        self.assertEqual(reopened.objects, original)
+
+        # Redo is exact as well
+        while restored.can_redo():
+            restored.redo()
+        self.assertEqual(reopened.objects, scene.objects)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from shared.validation import SceneValidator, validate_scene, validate_files
+
+def make_obj(obj_id, parent=None, **components):
+    components.setdefault("Transform", {"position": [0.0, 0.0], "rotation": 0.0, "scale": [1.0, 1.0], "parent_id": parent})
+    return {"id": obj_id, "name": obj_id, "active": True, "components": components}
+
+class TestValidation(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "assets", "prefabs"))
+        with open(os.path.join(self.root, "assets", "prefabs", "bad.prefab"), "w") as f:
+            json.dump(make_obj("bad", RigidBody={"mass": -1.0}), f)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_detects_scene_problems(self):
+        """Cycles, unknown components, bad numbers and broken asset references are reported."""
+        scene = {"objects": [
+            make_obj("a", parent="b"),
+            make_obj("b", parent="a"),
+            make_obj("ok", parent="a", RigidBody={"mass": 0.0}), # Static body: valid
+            make_obj("nan", Transform={"position": [float("nan"), 0.0], "scale": [1.0, 1.0]}),
+            make_obj("box", BoxCollider={"size": [-5.0, 10.0]}),
+            make_obj("typo", Rigidbody={}),
+            make_obj("script", Script={"script_path": "scripts/missing.py",
+                                       "properties": {"spawn": "assets/prefabs/bad.prefab"}}),
+        ], "settings": {"preload": ["assets/sprites/none.png"]}}
+
+        errors = "\n".join(validate_scene(scene, self.root))
+        self.assertIn("Hierarchy cycle", errors)
+        self.assertIn("Unknown component 'Rigidbody'", errors)
+        self.assertIn("Non-finite Transform.position", errors)
+        self.assertIn("BoxCollider.size must be positive", errors)
+        self.assertIn("Missing script file: 'scripts/missing.py'", errors)
+        self.assertIn("Negative RigidBody.mass in prefab 'assets/prefabs/bad.prefab'", errors)
+        self.assertIn("Missing preloaded asset", errors)
+        self.assertNotIn("'ok'", errors)
+        self.assertEqual(errors.count("Hierarchy cycle"), 1)
+
+    def test_cached_and_parallel_results_match(self):
+        """A shared validator and the process pool give the same results as fresh validators."""
+        paths = []
+        for i in range(6):
+            path = os.path.join(self.root, f"s{i}.scene.json")
+            objects = [make_obj("x", Script={"script_path": "scripts/missing.py"})] if i % 2 else [make_obj("x")]
+            with open(path, "w") as f:
+                json.dump({"objects": objects}, f)
+            paths.append(path)
+
+        validator = SceneValidator(self.root)
+        expected = [(p, SceneValidator(self.root).validate_file(p)) for p in paths]
+        self.assertEqual([(p, validator.validate_file(p)) for p in paths], expected)
+        self.assertEqual(list(validate_files(paths, self.root, jobs=2)), expected)
+        self.assertEqual(sum(1 for _, errors in expected if errors), 3)
+
+if __name__ == "__main__":
+    unittest.main()